@@ -0,0 +1,214 @@
+"""Opt-in on-disk cache of parsed CodeWalker XML files.
+
+The parsed object graph is stored as a pickle next to its NumPy arrays, which are saved as raw ``.npy`` files and
+memory-mapped when loaded again. Entries are keyed by file path, size and modification time, so they are invalidated
+as soon as the source file changes.
+"""
+import os
+import copyreg
+import hashlib
+import pickle
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar
+
+import numpy as np
+from mathutils import Vector, Quaternion, Matrix, Euler, Color
+
+from .element import ElementTree
+
+T = TypeVar("T")
+
+CACHE_FORMAT_VERSION = 1
+GRAPH_FILE_NAME = "graph.pickle"
+# Arrays smaller than this are kept inside the pickle, not worth having a separate file for them
+MIN_NPY_ARRAY_SIZE = 4096
+
+
+def _set_element_state(obj: ElementTree, state: dict):
+    # ElementTree.__getattribute__ returns None for unknown attributes, which confuses pickle's `__setstate__` lookup,
+    # so the state is set through this function instead
+    obj.__dict__.update(state)
+
+
+class _GraphPickler(pickle.Pickler):
+    def __init__(self, file, arrays_dir: Path):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays_dir = arrays_dir
+        self.array_ids: dict[int, int] = {}
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray and not isinstance(obj, np.memmap):
+            return None
+
+        if obj.dtype.hasobject or obj.nbytes < MIN_NPY_ARRAY_SIZE:
+            return None
+
+        array_id = self.array_ids.get(id(obj), None)
+        if array_id is not None:
+            return array_id
+
+        array_id = len(self.array_ids)
+        self.array_ids[id(obj)] = array_id
+        np.save(self.arrays_dir.joinpath(f"{array_id}.npy"), obj, allow_pickle=False)
+        return array_id
+
+    def reducer_override(self, obj):
+        if isinstance(obj, ElementTree):
+            return copyreg.__newobj__, (type(obj),), dict(vars(obj)), None, None, _set_element_state
+        elif isinstance(obj, Vector):
+            return Vector, (tuple(obj),)
+        elif isinstance(obj, Quaternion):
+            return Quaternion, (tuple(obj),)
+        elif isinstance(obj, Matrix):
+            return Matrix, (tuple(tuple(row) for row in obj),)
+        elif isinstance(obj, Euler):
+            return Euler, (tuple(obj), obj.order)
+        elif isinstance(obj, Color):
+            return Color, (tuple(obj),)
+
+        return NotImplemented
+
+
+class _GraphUnpickler(pickle.Unpickler):
+    def __init__(self, file, arrays_dir: Path):
+        super().__init__(file)
+        self.arrays_dir = arrays_dir
+        self.arrays: dict[int, np.ndarray] = {}
+
+    def persistent_load(self, pid):
+        arr = self.arrays.get(pid, None)
+        if arr is None:
+            # Copy-on-write so importers can still modify the arrays in memory without touching the cache
+            arr = np.load(self.arrays_dir.joinpath(f"{pid}.npy"), mmap_mode="c", allow_pickle=False)
+            self.arrays[pid] = arr
+        return arr
+
+
+def _code_fingerprint() -> str:
+    """Gets a fingerprint of the cwxml modules, so entries are invalidated when the classes they were created from
+    change.
+    """
+    h = hashlib.sha1()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        st = path.stat()
+        h.update(f"{path.name}|{st.st_size}|{st.st_mtime_ns};".encode("utf-8"))
+    return h.hexdigest()
+
+
+class ParsedAssetCache:
+    """Cache of parsed XML files in a directory, limited to ``max_size`` bytes. When the limit is exceeded, the least
+    recently used entries are removed.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.num_hits = 0
+        self.num_misses = 0
+        self._code_fingerprint = _code_fingerprint()
+
+    def entry_key(self, filepath: str, loader_name: str) -> str:
+        st = os.stat(filepath)
+        key = (
+            f"{CACHE_FORMAT_VERSION}|{self._code_fingerprint}|{loader_name}|"
+            f"{os.path.abspath(filepath)}|{st.st_size}|{st.st_mtime_ns}"
+        )
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def load(self, filepath: str, parse: Callable[[str], T], loader_name: str) -> T:
+        """Gets the parsed contents of ``filepath`` from the cache. On a cache miss, ``parse`` is called to parse the
+        file and the result is stored in the cache.
+        """
+        key = self.entry_key(filepath, loader_name)
+        entry_dir = self.directory.joinpath(key)
+
+        obj = self._read_entry(entry_dir)
+        if obj is not None:
+            self.num_hits += 1
+            return obj
+
+        self.num_misses += 1
+        obj = parse(filepath)
+        self._write_entry(entry_dir, obj)
+        self._evict()
+        return obj
+
+    def clear(self):
+        if not self.directory.is_dir():
+            return
+
+        for entry_dir in self._iter_entries():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def _read_entry(self, entry_dir: Path):
+        graph_path = entry_dir.joinpath(GRAPH_FILE_NAME)
+        if not graph_path.is_file():
+            return None
+
+        try:
+            with open(graph_path, "rb") as f:
+                obj = _GraphUnpickler(f, entry_dir).load()
+        except Exception:
+            # Corrupted entry or created by an incompatible version, just parse the file again
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        # Touch the entry to mark it as recently used
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            pass
+
+        return obj
+
+    def _write_entry(self, entry_dir: Path, obj):
+        tmp_dir = entry_dir.with_name(f"{entry_dir.name}.tmp{os.getpid()}")
+        try:
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_dir.joinpath(GRAPH_FILE_NAME), "wb") as f:
+                _GraphPickler(f, tmp_dir).dump(obj)
+            os.replace(tmp_dir, entry_dir)
+        except Exception:
+            # The cache is only an optimization, failing to write an entry should not stop the import
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _iter_entries(self) -> Iterator[Path]:
+        return (p for p in self.directory.iterdir() if p.is_dir() and ".tmp" not in p.name)
+
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for entry_dir in self._iter_entries():
+            size = sum(f.stat().st_size for f in entry_dir.iterdir())
+            entries.append((entry_dir.stat().st_mtime_ns, size, entry_dir))
+            total_size += size
+
+        entries.sort()
+        for _, size, entry_dir in entries:
+            if total_size <= self.max_size:
+                break
+
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            if not entry_dir.exists():
+                total_size -= size
+
+
+_active_cache: Optional[ParsedAssetCache] = None
+
+
+def get_active_cache() -> Optional[ParsedAssetCache]:
+    return _active_cache
+
+
+@contextmanager
+def use_parsed_asset_cache(cache: Optional[ParsedAssetCache]) -> Iterator[Optional[ParsedAssetCache]]:
+    """Makes ``Element.from_xml_file`` go through ``cache`` within the context."""
+    global _active_cache
+    prev_cache = _active_cache
+    _active_cache = cache
+    try:
+        yield cache
+    finally:
+        _active_cache = prev_cache
@@ -1,7 +1,6 @@
 # from .element import *
 from abc import ABC as AbstractClass, abstractmethod
 from enum import Enum
-from mathutils import Vector
 from .element import (
     ElementTree,
     ElementProperty,
@@ -14,7 +13,8 @@ from .element import (
 )
 from xml.etree import ElementTree as ET
 from inspect import isclass
-from math import sqrt
+import numpy as np
+from numpy.typing import NDArray
 
 
 class YCD:
@@ -208,7 +208,10 @@ class ChannelsList(ItemTypeList):
             super().__init__()
             self.type = ValueProperty("Type", "")
 
-        def get_value(self, frame_id, channel_values):
+        def get_values(self, frame_ids: NDArray[np.int64], channel_values: list[NDArray]) -> NDArray[np.float32]:
+            """Gets the values of this channel at each frame in ``frame_ids``. ``channel_values`` are the values of the
+            previous channels in the sequence data.
+            """
             raise NotImplementedError
 
     class StaticQuaternion(Channel):
@@ -219,8 +222,9 @@ class ChannelsList(ItemTypeList):
             self.value = QuaternionProperty("Value")
             self.type = "StaticQuaternion"
 
-        def get_value(self, frame_id, channel_values):
-            return self.value
+        def get_values(self, frame_ids, channel_values):
+            # (w, x, y, z) for each frame
+            return np.tile(np.array(self.value, dtype=np.float32), (len(frame_ids), 1))
 
     class StaticVector3(Channel):
         type = "StaticVector3"
@@ -230,8 +234,8 @@ class ChannelsList(ItemTypeList):
             self.value = VectorProperty("Value")
             self.type = "StaticVector3"
 
-        def get_value(self, frame_id, channel_values):
-            return self.value
+        def get_values(self, frame_ids, channel_values):
+            return np.tile(np.array(self.value, dtype=np.float32), (len(frame_ids), 1))
 
     class StaticFloat(Channel):
         type = "StaticFloat"
@@ -241,8 +245,8 @@ class ChannelsList(ItemTypeList):
             self.value = ValueProperty("Value", 0.0)
             self.type = "StaticFloat"
 
-        def get_value(self, frame_id, channel_values):
-            return self.value
+        def get_values(self, frame_ids, channel_values):
+            return np.full(len(frame_ids), self.value, dtype=np.float32)
 
     class RawFloat(Channel):
         type = "RawFloat"
@@ -252,8 +256,9 @@ class ChannelsList(ItemTypeList):
             self.values = ValuesBuffer()
             self.type = "RawFloat"
 
-        def get_value(self, frame_id, channel_values):
-            return self.values[frame_id % len(self.values)]
+        def get_values(self, frame_ids, channel_values):
+            values = np.array(self.values, dtype=np.float32)
+            return values[frame_ids % len(values)]
 
     class QuantizeFloat(Channel):
         type = "QuantizeFloat"
@@ -265,8 +270,9 @@ class ChannelsList(ItemTypeList):
             self.values = ValuesBuffer()
             self.type = "QuantizeFloat"
 
-        def get_value(self, frame_id, channel_values):
-            return self.values[frame_id % len(self.values)]
+        def get_values(self, frame_ids, channel_values):
+            values = np.array(self.values, dtype=np.float32)
+            return values[frame_ids % len(values)]
 
     class IndirectQuantizeFloat(QuantizeFloat):
         type = "IndirectQuantizeFloat"
@@ -276,8 +282,10 @@ class ChannelsList(ItemTypeList):
             self.frames = FramesBuffer()
             self.type = "IndirectQuantizeFloat"
 
-        def get_value(self, frame_id, channel_values):
-            return self.values[(self.frames[frame_id % len(self.frames)]) % len(self.values)]
+        def get_values(self, frame_ids, channel_values):
+            values = np.array(self.values, dtype=np.float32)
+            frames = np.array(self.frames, dtype=np.int64)
+            return values[frames[frame_ids % len(frames)] % len(values)]
 
     class LinearFloat(QuantizeFloat):
         type = "LinearFloat"
@@ -296,11 +304,10 @@ class ChannelsList(ItemTypeList):
             self.quat_index = ValueProperty("QuatIndex", 0)
             self.type = "CachedQuaternion1"
 
-        def get_value(self, frame_id, channel_values):
-            vec_len = Vector(
-                (channel_values[0], channel_values[1], channel_values[2])).length
-
-            return sqrt(max(1.0 - vec_len * vec_len, 0))
+        def get_values(self, frame_ids, channel_values):
+            vec = np.stack(channel_values[:3], axis=1)
+            vec_len_sq = np.einsum("ij,ij->i", vec, vec)
+            return np.sqrt(np.maximum(1.0 - vec_len_sq, 0.0)).astype(np.float32)
 
     class CachedQuaternion2(CachedQuaternion1):
         type = "CachedQuaternion2"
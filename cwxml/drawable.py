@@ -3,8 +3,8 @@ import os
 from mathutils import Matrix
 import numpy as np
 from numpy.typing import NDArray
-from ..tools.utils import np_arr_to_str
-from typing import Optional
+from ..tools.utils import np_arr_to_str_chunks
+from typing import Iterator, Optional
 from abc import ABC as AbstractClass, abstractmethod
 from xml.etree import ElementTree as ET
 from .element import (
@@ -20,7 +20,9 @@ from .element import (
     ValueProperty,
     VectorProperty,
     Vector4Property,
-    MatrixProperty
+    MatrixProperty,
+    PreformattedTextElement,
+    XmlStreamWriter,
 )
 from .bound import (
     BoundBox,
@@ -451,13 +453,29 @@ class VertexBuffer(ElementTree):
         if self.data is None:
             return element
 
-        data_elem = ET.Element("Data")
+        data_elem = PreformattedTextElement("Data")
         data_elem.text = self._data_to_str()
+        data_elem.multiline = len(self.data) > 1
 
         element.append(data_elem)
 
         return element
 
+    def write_xml_stream(self, writer: XmlStreamWriter, level: int):
+        self.layout = self.data.dtype.names
+        attrib = {child.name: str(child.value) for child in vars(self).values() if isinstance(child, AttributeProperty)}
+        writer.start(self.tag_name, attrib, level)
+        for child in vars(self).values():
+            if isinstance(child, Element):
+                child.write_xml_stream(writer, level + 1)
+
+        if self.data is not None:
+            multiline = len(self.data) > 1
+            line_prefix = writer.line_indent(level + 1) if multiline else ""
+            writer.write_text_element("Data", self._iter_data_str_chunks(line_prefix), multiline, level + 1)
+
+        writer.end()
+
     def _load_data_from_str(self, _str: str):
         layout = self.get_element("layout")
         struct_dtype = np.dtype([self.VERT_ATTR_DTYPES[attr_name] for attr_name in layout.value])
@@ -470,53 +488,53 @@ class VertexBuffer(ElementTree):
             raw_struct_dtype = np.dtype([normal_fmt if attr_name == "Normal" else self.VERT_ATTR_DTYPES[attr_name]
                                          for attr_name in layout.value])
 
-            raw_data = np.loadtxt(io.StringIO(_str), dtype=raw_struct_dtype)
-
-            data = np.empty_like(raw_data, dtype=struct_dtype)
-            for comp in layout.value:
-                if comp == "Normal":
-                    data["Normal"] = raw_data["Normal"][:,:3]
-                else:
-                    data[comp] = raw_data[comp]
-
-            self.data = data
+            raw_data = np.loadtxt(io.StringIO(_str), dtype=raw_struct_dtype, ndmin=1)
+
+            # View the raw data with the final fields, skipping the 4th float of Normal, and pack it with a single
+            # cast instead of copying it field by field
+            view_dtype = np.dtype({
+                "names": struct_dtype.names,
+                "formats": [struct_dtype.fields[name][0] for name in struct_dtype.names],
+                "offsets": [raw_struct_dtype.fields[name][1] for name in struct_dtype.names],
+                "itemsize": raw_struct_dtype.itemsize,
+            })
+            self.data = raw_data.view(view_dtype).astype(struct_dtype)
         else:
-            self.data = np.loadtxt(io.StringIO(_str), dtype=struct_dtype)
+            # NumPy's C `loadtxt` parses the text straight into the structured array. Faster than tokenizing the text
+            # ourselves and splitting the columns
+            self.data = np.loadtxt(io.StringIO(_str), dtype=struct_dtype, ndmin=1)
+
+    def _data_to_str(self) -> str:
+        return "\n".join(self._iter_data_str_chunks())
 
-    def _data_to_str(self):
+    def _iter_data_str_chunks(self, line_prefix: str = "") -> Iterator[str]:
+        """Formats the vertex data as lines of text, one per vertex, in chunks of multiple lines."""
         layout = self.get_element("layout")
         vert_arr = self.data
 
-        if layout.type == "GTAV2":
-            # Add back the 4th float of Normal element required by FVF GTAV2
-            new_struct_dtype = np.dtype([(name, dtype if name != "Normal" else (np.float32, 4))
-                                         for name, (dtype, _) in vert_arr.dtype.fields.items()])
-            new_vert_arr = np.empty_like(vert_arr, dtype=new_struct_dtype)
-            for comp in vert_arr.dtype.fields.keys():
-                if comp == "Normal":
-                    new_vert_arr["Normal"] = np.c_[vert_arr["Normal"], np.zeros(len(vert_arr))]
-                else:
-                    new_vert_arr[comp] = vert_arr[comp]
-
-            vert_arr = new_vert_arr
-
         FLOAT_FMT = "%.7f"
         INT_FMT = "%.0u"
         ATTR_SEP = "   "
 
         formats: list[str] = []
+        columns: list[NDArray] = []
 
         for field_name in vert_arr.dtype.names:
             attr_dtype = vert_arr.dtype[field_name].base
             column = vert_arr[field_name]
 
+            if layout.type == "GTAV2" and field_name == "Normal":
+                # Add back the 4th float of Normal element required by FVF GTAV2
+                column = np.c_[column, np.zeros(len(vert_arr))]
+
             attr_fmt = INT_FMT if attr_dtype == np.uint32 else FLOAT_FMT
             formats.append(" ".join([attr_fmt] * column.shape[1]))
+            columns.append(column)
 
         fmt = ATTR_SEP.join(formats)
-        vert_arr_2d = np.column_stack([vert_arr[name] for name in vert_arr.dtype.names])
+        vert_arr_2d = np.column_stack(columns)
 
-        return np_arr_to_str(vert_arr_2d, fmt)
+        return np_arr_to_str_chunks(vert_arr_2d, fmt, line_prefix)
 
 
 class IndexBuffer(ElementTree):
@@ -544,14 +562,35 @@ class IndexBuffer(ElementTree):
         if self.data is None:
             return element
 
-        data_elem = ET.Element("Data")
+        data_elem = PreformattedTextElement("Data")
         data_elem.text = self._inds_to_str()
+        # Indices are always written on new lines, if any
+        data_elem.multiline = len(self.data) > 0
 
         element.append(data_elem)
 
         return element
 
-    def _inds_to_str(self):
+    def write_xml_stream(self, writer: XmlStreamWriter, level: int):
+        writer.start(self.tag_name, {}, level)
+
+        if self.data is not None:
+            if len(self.data) == 0:
+                writer.write_text_element("Data", iter((self._inds_to_str(),)), False, level + 1)
+            else:
+                line_prefix = writer.line_indent(level + 1)
+                writer.write_text_element("Data", self._iter_inds_str_chunks(line_prefix), True, level + 1)
+
+        writer.end()
+
+    def _inds_to_str(self) -> str:
+        if len(self.data) == 0:
+            return "\n"
+
+        return "\n".join(self._iter_inds_str_chunks())
+
+    def _iter_inds_str_chunks(self, line_prefix: str = "") -> Iterator[str]:
+        """Formats the indices as lines of text with 24 indices each, in chunks of multiple lines."""
         indices_arr = self.data
 
         num_inds = len(indices_arr)
@@ -563,12 +602,12 @@ class IndexBuffer(ElementTree):
         indices_arr_2d = indices_arr[:num_divisble_inds].reshape(
             (num_rows, 24))
 
-        index_buffer_str = np_arr_to_str(indices_arr_2d, fmt="%.0u")
-        # Add the last row
-        last_row_str = np_arr_to_str(
-            indices_arr[num_divisble_inds:], fmt="%.0u")
+        yield from np_arr_to_str_chunks(indices_arr_2d, " ".join(["%.0u"] * 24), line_prefix)
 
-        return f"{index_buffer_str}\n{last_row_str}"
+        # Add the last row
+        if num_divisble_inds < num_inds:
+            last_row = indices_arr[num_divisble_inds:]
+            yield line_prefix + " ".join(["%.0u"] * len(last_row)) % tuple(last_row.tolist())
 
 
 class Geometry(ElementTree):
@@ -696,6 +735,11 @@ class Drawable(ElementTree, AbstractClass):
             self.bounds.tag_name = "Bounds"
         return super().to_xml()
 
+    def write_xml_stream(self, writer: XmlStreamWriter, level: int):
+        if self.bounds:
+            self.bounds.tag_name = "Bounds"
+        self._write_xml_stream_tree(writer, level)
+
 
 class DrawableDictionary(MutableSequence, Element):
     tag_name = "DrawableDictionary"
@@ -749,6 +793,17 @@ class DrawableDictionary(MutableSequence, Element):
 
         return element
 
+    def write_xml_stream(self, writer: XmlStreamWriter, level: int):
+        writer.start(self.tag_name, {}, level)
+        for drawable in self._value:
+            if isinstance(drawable, Drawable):
+                drawable.tag_name = "Item"
+                drawable.write_xml_stream(writer, level + 1)
+            else:
+                raise TypeError(
+                    f"{type(self).__name__}s can only hold '{Drawable.__name__}' objects, not '{type(drawable)}'!")
+        writer.end()
+
 
 class DrawableMatrices(ElementProperty):
     value_types = (list)
@@ -1,10 +1,12 @@
 """Manages reading/writing Codewalker XML files"""
+import os
 from mathutils import Vector, Quaternion, Matrix
 from abc import abstractmethod, ABC as AbstractClass, abstractclassmethod
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Iterator
 from xml.etree import ElementTree as ET
 from numpy import float32
+from ..tools import profiling
 
 
 def indent(elem: ET.Element, level=0):
@@ -24,14 +26,114 @@ def indent(elem: ET.Element, level=0):
         if level and (not elem.tail or not elem.tail.strip()):
             elem.tail = i
 
+        if isinstance(elem, PreformattedTextElement):
+            # Lines are already formatted, just prepend the indentation to each one
+            if elem.multiline and elem.text:
+                line_indent = (level + 1) * amount
+                elem.text = "\n" + line_indent + elem.text.replace("\n", "\n" + line_indent) + i
+
         # Indent innertext of elements on new lines. Used in cases like <VerticesProperty />
-        if elem.text and len(elem.text.strip()) > 0 and elem.text.find("\n") != -1:
+        elif elem.text and len(elem.text.strip()) > 0 and elem.text.find("\n") != -1:
             lines = elem.text.strip().split("\n")
             for index, line in enumerate(lines):
                 lines[index] = ((level + 1) * amount) + line
             elem.text = "\n" + "\n".join(lines) + i
 
 
+class PreformattedTextElement(ET.Element):
+    """XML element with text made of lines that have no leading or trailing whitespace, like the vertex data of a
+    vertex buffer. ``indent`` only prepends the indentation to each line, instead of splitting and stripping the text.
+    """
+
+    # If false, the text is left as is by ``indent``
+    multiline: bool = True
+
+
+class XmlStreamWriter:
+    """Writes indented XML elements one at a time through ``write``. The output is the same as indenting the whole
+    tree with ``indent`` and serializing it with ``ElementTree.write``, but without having the whole tree in memory.
+    """
+    INDENT = "  "
+
+    def __init__(self, write: Callable[[str], Any]):
+        self.write = write
+        # (tag, level, has_children) of the elements started but not ended yet
+        self._open_elements: list[tuple[str, int, bool]] = []
+
+    def line_indent(self, level: int) -> str:
+        """Gets the indentation of the text lines of an element at ``level``."""
+        return (level + 1) * self.INDENT
+
+    def _begin_child(self):
+        if not self._open_elements:
+            return
+
+        tag, level, has_children = self._open_elements[-1]
+        if not has_children:
+            self.write(">")
+            self._open_elements[-1] = (tag, level, True)
+        self.write("\n" + (level + 1) * self.INDENT)
+
+    def start(self, tag: str, attrib: dict[str, str], level: int):
+        """Starts an element. Children written before the matching ``end`` call are added to it."""
+        self._begin_child()
+        # Let ElementTree write the tag and attributes, so they are escaped the same way
+        start_tag = ET.tostring(ET.Element(tag, attrib), encoding="unicode")
+        self.write(start_tag[:-3])  # remove " />"
+        self._open_elements.append((tag, level, False))
+
+    def end(self):
+        tag, level, has_children = self._open_elements.pop()
+        if has_children:
+            self.write("\n" + level * self.INDENT + "</" + tag + ">")
+            if level == 0:
+                self.write("\n")
+        else:
+            self.write(" />")
+
+    def write_element(self, element: ET.Element, level: int):
+        """Writes a complete ``ET.Element``."""
+        self._begin_child()
+        indent(element, level)
+        tail = element.tail
+        element.tail = None  # tails are written by the parent
+        self.write(ET.tostring(element, encoding="unicode"))
+        if level == 0 and tail:
+            self.write(tail)
+
+    def write_text_element(self, tag: str, text_chunks: Iterator[str], multiline: bool, level: int):
+        """Writes an element with text made of lines without leading or trailing whitespace, like a
+        ``PreformattedTextElement``. If ``multiline`` is true, the lines in ``text_chunks`` must already be indented
+        with ``line_indent(level)``. ``text_chunks`` are joined with new lines.
+        """
+        self._begin_child()
+        first_chunk = next(text_chunks, None)
+        if not first_chunk:
+            self.write("<" + tag + " />")
+            return
+
+        self.write("<" + tag + ">")
+        if multiline:
+            self.write("\n")
+        self.write(_escape_text(first_chunk))
+        for chunk in text_chunks:
+            self.write("\n")
+            self.write(_escape_text(chunk))
+        if multiline:
+            self.write("\n" + level * self.INDENT)
+        self.write("</" + tag + ">")
+
+
+def _escape_text(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
 def get_str_type(value: str):
     """Determine if a string is a bool, int, or float"""
     if isinstance(value, str):
@@ -77,17 +179,41 @@ class Element(AbstractClass):
 
     @classmethod
     def from_xml_file(cls, filepath):
-        """Read XML from filepath"""
-        element_tree = ET.ElementTree()
-        element_tree.parse(filepath)
-        return cls.from_xml(element_tree.getroot())
+        """Read XML from filepath. Goes through the parsed asset cache if one is active."""
+        from .asset_cache import get_active_cache
+        cache = get_active_cache()
+        if cache is not None:
+            with profiling.span(f"{cls.__name__}.load_cached"):
+                return cache.load(filepath, cls._parse_xml_file, f"{cls.__module__}.{cls.__qualname__}")
+
+        return cls._parse_xml_file(filepath)
+
+    @classmethod
+    def _parse_xml_file(cls, filepath):
+        with profiling.span(f"{cls.__name__}.parse"):
+            profiling.count("bytes", os.path.getsize(filepath))
+            element_tree = ET.ElementTree()
+            element_tree.parse(filepath)
+            return cls.from_xml(element_tree.getroot())
 
     def write_xml(self, filepath):
-        """Write object as XML to filepath"""
+        """Write object as XML to filepath. Elements are converted and written one at a time, so the whole XML tree
+        is never in memory at once.
+        """
+        # Same file options and declaration used by ElementTree.write
+        with profiling.span(f"{type(self).__name__}.write_xml"), \
+                open(filepath, "w", encoding="UTF-8", errors="xmlcharrefreplace", buffering=1024 * 1024) as f:
+            f.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+            self.write_xml_stream(XmlStreamWriter(f.write), 0)
+            profiling.count("bytes", f.tell())
+
+    def write_xml_stream(self, writer: XmlStreamWriter, level: int):
+        """Write object as indented XML to ``writer``. By default, it converts the object with ``to_xml``; elements
+        that can have large children override it to write their children one at a time.
+        """
         element = self.to_xml()
-        indent(element)
-        elementTree = ET.ElementTree(element)
-        elementTree.write(filepath, encoding="UTF-8", xml_declaration=True)
+        if element is not None:
+            writer.write_element(element, level)
 
 
 class ElementTree(Element):
@@ -124,6 +250,23 @@ class ElementTree(Element):
 
         return root
 
+    def write_xml_stream(self, writer: XmlStreamWriter, level: int):
+        if type(self).to_xml is not ElementTree.to_xml:
+            # Custom conversion, we don't know how its children are written
+            super().write_xml_stream(writer, level)
+            return
+
+        self._write_xml_stream_tree(writer, level)
+
+    def _write_xml_stream_tree(self, writer: XmlStreamWriter, level: int):
+        """Streaming equivalent of ``ElementTree.to_xml``."""
+        attrib = {child.name: str(child.value) for child in vars(self).values() if isinstance(child, AttributeProperty)}
+        writer.start(self.tag_name, attrib, level)
+        for child in vars(self).values():
+            if isinstance(child, Element):
+                child.write_xml_stream(writer, level + 1)
+        writer.end()
+
     def __getattribute__(self, key: str, onlyValue: bool = True):
         obj = None
         # Try and see if key exists
@@ -233,6 +376,33 @@ class ListProperty(ElementProperty, AbstractClass):
 
         return None
 
+    def write_xml_stream(self, writer: XmlStreamWriter, level: int):
+        if type(self).to_xml is not ListProperty.to_xml:
+            super().write_xml_stream(writer, level)
+            return
+
+        self._write_xml_stream_items(writer, level, required=False)
+
+    def _write_xml_stream_items(self, writer: XmlStreamWriter, level: int, required: bool):
+        """Streaming equivalent of ``ListProperty.to_xml``. If ``required``, the element is written even if the list
+        is empty.
+        """
+        has_items = self.value and len(self.value) > 0
+        if not has_items and not required:
+            return
+
+        for item in self.value:
+            if not isinstance(item, self.list_type):
+                raise TypeError(
+                    f"{type(self).__name__} can only hold objects of type '{self.list_type.__name__}', not '{type(item)}'")
+
+        attrib = {child.name: str(child.value) for child in vars(self).values() if isinstance(child, AttributeProperty)}
+        writer.start(self.tag_name, attrib, level)
+        if has_items:
+            for item in self.value:
+                item.write_xml_stream(writer, level + 1)
+        writer.end()
+
 
 class ListPropertyRequired(ListProperty):
     """Same as ListProperty but returns an empty element rather then None in case the passed element's value is empty or None"""
@@ -257,6 +427,13 @@ class ListPropertyRequired(ListProperty):
 
         return element
 
+    def write_xml_stream(self, writer: XmlStreamWriter, level: int):
+        if type(self).to_xml is not ListPropertyRequired.to_xml:
+            Element.write_xml_stream(self, writer, level)
+            return
+
+        self._write_xml_stream_items(writer, level, required=True)
+
 
 class TextProperty(ElementProperty):
     value_types = (str)
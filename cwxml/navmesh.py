@@ -1,4 +1,6 @@
+import numpy as np
 from .element import (
+    ElementProperty,
     ElementTree,
     ListProperty,
     TextProperty,
@@ -6,7 +8,7 @@ from .element import (
     VectorProperty
 )
 from xml.etree import ElementTree as ET
-from mathutils import Vector
+from ..tools.utils import np_arr_to_str_chunks
 
 
 class YNV:
@@ -55,29 +57,32 @@ class NavPortalList(ListProperty):
     tag_name = "Portals"
 
 
-class NavPolygonVertices(ListProperty):
-    list_type = Vector
+class NavPolygonVertices(ElementProperty):
+    """Vertex positions of a polygon, as an array of shape (n, 3)."""
+    value_types = (np.ndarray)
     tag_name = "Vertices"
 
     def __init__(self, tag_name=None, value=None):
-        super().__init__(tag_name=tag_name, value=value)
+        # Value set after, the truth value check of ElementProperty doesn't work with arrays
+        super().__init__(tag_name or type(self).tag_name, None)
+        self.value = value if value is not None else np.empty((0, 3))
 
     @classmethod
     def from_xml(cls, element: ET.Element):
-        new = cls()
-        verts = []
-        if element.text:
-            txts = element.text.strip().split("\n")
-            for txt in txts:
-                txt = txt.strip()
-            for txt in txts:
-                nums = txt.split(", ")
-                v0 = float(nums[0])
-                v1 = float(nums[1])
-                v2 = float(nums[2])
-                verts.append(Vector((v0, v1, v2)))
-        new.value = verts
-        return new
+        if not element.text:
+            return cls(element.tag)
+
+        # One "x, y, z" line per vertex, parsed in C instead of splitting each line in Python
+        verts = np.fromstring(element.text.replace(",", " "), sep=" ", dtype=np.float64)
+        return cls(element.tag, verts.reshape((-1, 3)))
+
+    def to_xml(self):
+        if len(self.value) == 0:
+            return None
+
+        element = ET.Element(self.tag_name)
+        element.text = "\n" + "\n".join(np_arr_to_str_chunks(self.value, "%s, %s, %s")) + "\n"
+        return element
 
 
 class NavPolygon(ElementTree):
@@ -325,23 +325,26 @@ class ShaderManager:
     def load_shaders():
         tree = ET.parse(ShaderManager.shaderxml)
 
-        for node in tree.getroot():
+        filename_elems = [
+            (node, filename_elem)
+            for node in tree.getroot()
+            for filename_elem in node.findall("./FileName//*")
+            if filename_elem.text is not None
+        ]
+        filename_hashes = jenkhash.hash_many([filename_elem.text for _, filename_elem in filename_elems]).tolist()
+
+        # All the file names are hashed at once
+        for (node, filename_elem), filename_hash in zip(filename_elems, filename_hashes):
             base_name = node.find("Name").text
-            for filename_elem in node.findall("./FileName//*"):
-                filename = filename_elem.text
-
-                if filename is None:
-                    continue
-
-                filename_hash = jenkhash.Generate(filename)
-                render_bucket = int(filename_elem.attrib["bucket"])
-
-                shader = ShaderDef.from_xml(node)
-                shader.filename = filename
-                shader.render_bucket = render_bucket
-                ShaderManager._shaders[filename] = shader
-                ShaderManager._shaders_by_hash[filename_hash] = shader
-                ShaderManager._shaders_base_names[shader] = base_name
+            filename = filename_elem.text
+            render_bucket = int(filename_elem.attrib["bucket"])
+
+            shader = ShaderDef.from_xml(node)
+            shader.filename = filename
+            shader.render_bucket = render_bucket
+            ShaderManager._shaders[filename] = shader
+            ShaderManager._shaders_by_hash[filename_hash] = shader
+            ShaderManager._shaders_base_names[shader] = base_name
 
     @staticmethod
     def find_shader(filename: str) -> Optional[ShaderDef]:
@@ -1,5 +1,8 @@
 """LOD Management system."""
+import uuid
+from collections import OrderedDict
 import bpy
+from bpy.app.handlers import persistent
 from bpy.types import (
     Context,
     Mesh,
@@ -29,11 +32,30 @@ from .sollumz_helper import find_sollumz_parent
 from .icons import icon_manager
 
 
+class LazyLODMesh:
+    """Data to build a LOD mesh on demand. The LOD keeps this data instead of a mesh until the LOD is used."""
+
+    def __init__(self, name: str, build: Callable[[Object], Optional[Mesh]]):
+        self.name = name
+        self.build = build
+        # Fingerprint of the mesh built from this data, to know if it was modified before evicting it
+        self.built_fingerprint: Optional[bytes] = None
+
+
+# Lazy LOD meshes data by ``LODLevelProps.lazy_mesh_id``. Only kept during the current session, the pending meshes are
+# built before saving the .blend file.
+_lazy_lod_meshes: dict[str, LazyLODMesh] = {}
+# IDs of the lazy LOD meshes currently built, least recently used first, with the object name and LOD level that use them
+_built_lazy_lod_meshes: OrderedDict[str, tuple[str, LODLevel]] = OrderedDict()
+_is_lazy_lod_mesh_eviction_scheduled = False
+
+
 class LODLevelProps(PropertyGroup):
     def on_lod_level_enter(self):
         """Called when the LOD level switches to this level."""
         obj: Object = self.id_data
 
+        self._build_lazy_mesh()
         if self.has_mesh:
             # Update the object current mesh to this LOD mesh
             obj.data = self.mesh_ref
@@ -49,7 +71,16 @@ class LODLevelProps(PropertyGroup):
         # Store a reference to the mesh
         self.mesh_ref = obj.data if self.has_mesh else None
 
+        if self.lazy_mesh_id in _built_lazy_lod_meshes:
+            # Can be evicted now that it is inactive
+            _schedule_lazy_lod_mesh_eviction()
+
     def _get_mesh_name(self) -> str:
+        if self.is_lazy_mesh_pending:
+            # Don't build the mesh just to show its name
+            lazy_mesh = _lazy_lod_meshes.get(self.lazy_mesh_id, None)
+            return lazy_mesh.name if lazy_mesh is not None else ""
+
         m = self.mesh
         return m.name if m is not None else ""
 
@@ -71,9 +102,23 @@ class LODLevelProps(PropertyGroup):
     # object.data is actually our mesh or not.
     has_mesh: BoolProperty(default=False)  # DO NOT MODIFY DIRECTLY OUTSIDE THIS CLASS, use .mesh or .mesh_name
 
+    # Set when the mesh of this LOD is built on demand, key of its data in ``_lazy_lod_meshes``. While the mesh is not
+    # built, ``has_mesh`` is true and ``mesh_ref`` is empty.
+    lazy_mesh_id: StringProperty()  # DO NOT MODIFY DIRECTLY OUTSIDE THIS CLASS, use .set_lazy_mesh or .mesh
+
+    @property
+    def is_active(self) -> bool:
+        obj: Object = self.id_data
+        return obj.sz_lods.active_lod_level == self.level
+
+    @property
+    def is_lazy_mesh_pending(self) -> bool:
+        """Whether this LOD has a lazy mesh that is not built yet."""
+        return self.has_mesh and self.lazy_mesh_id != "" and self.mesh_ref is None and not self.is_active
+
     @property
     def mesh(self) -> Optional[Mesh]:
-        """Gets the mesh of this LOD level, or ``None`` if there is no mesh."""
+        """Gets the mesh of this LOD level, or ``None`` if there is no mesh. Lazy LOD meshes are built if needed."""
         if not self.has_mesh:
             return None
 
@@ -82,6 +127,7 @@ class LODLevelProps(PropertyGroup):
         if lods.active_lod_level == self.level:
             return obj.data
         else:
+            self.build_lazy_mesh()
             return self.mesh_ref
 
     @mesh.setter
@@ -89,6 +135,8 @@ class LODLevelProps(PropertyGroup):
         """Sets the mesh of this LOD level. Set to ``None`` to remove the mesh."""
         obj: Object = self.id_data
         lods: LODLevels = obj.sz_lods
+        _built_lazy_lod_meshes.pop(self.lazy_mesh_id, None)
+        self.lazy_mesh_id = ""
         self.has_mesh = value is not None
         if lods.active_lod_level == self.level:
             self.mesh_ref = None
@@ -100,6 +148,76 @@ class LODLevelProps(PropertyGroup):
         else:
             self.mesh_ref = value
 
+    def set_lazy_mesh(self, name: str, build: Callable[[Object], Optional[Mesh]]):
+        """Sets the mesh of this LOD level to a mesh that is only built by calling ``build(obj)`` when this LOD level
+        becomes active or its mesh is accessed. ``name`` is the name shown for the mesh until it is built.
+        """
+        self.mesh = None
+        lazy_mesh_id = uuid.uuid4().hex
+        _lazy_lod_meshes[lazy_mesh_id] = LazyLODMesh(name, build)
+        self.lazy_mesh_id = lazy_mesh_id
+        self.has_mesh = True
+
+        if self.is_active:
+            self.on_lod_level_enter()
+
+    def build_lazy_mesh(self):
+        """Builds the mesh of this LOD level if it is a lazy mesh that is not built yet."""
+        if not self.is_active:
+            self._build_lazy_mesh()
+
+    def _build_lazy_mesh(self):
+        # Called for inactive LODs or the LOD being entered, where the mesh is in ``mesh_ref`` and not in Object.data
+        if not self.lazy_mesh_id:
+            return
+
+        if self.lazy_mesh_id in _built_lazy_lod_meshes:
+            _built_lazy_lod_meshes.move_to_end(self.lazy_mesh_id)
+
+        if not self.has_mesh or self.mesh_ref is not None:
+            return
+
+        from .tools.meshhelper import get_mesh_fingerprint
+
+        obj: Object = self.id_data
+        lazy_mesh = _lazy_lod_meshes.get(self.lazy_mesh_id, None)
+        mesh = lazy_mesh.build(obj) if lazy_mesh is not None else None
+        if mesh is None:
+            # Failed to build or the data is no longer available (e.g. the add-on was reloaded)
+            self.lazy_mesh_id = ""
+            self.has_mesh = False
+            return
+
+        self.mesh_ref = mesh
+        lazy_mesh.built_fingerprint = get_mesh_fingerprint(mesh)
+        _built_lazy_lod_meshes[self.lazy_mesh_id] = (obj.name, self.level)
+        _schedule_lazy_lod_mesh_eviction()
+
+    def evict_lazy_mesh(self) -> bool:
+        """Removes the built mesh of this LOD level if it is a lazy mesh that is not in use and was not modified since
+        it was built, so it is built again when needed. Modified meshes stop being lazy.
+
+        Returns whether this LOD no longer has a lazy mesh built.
+        """
+        from .tools.meshhelper import get_mesh_fingerprint
+
+        lazy_mesh = _lazy_lod_meshes.get(self.lazy_mesh_id, None)
+        mesh = self.mesh_ref
+        if lazy_mesh is None or mesh is None or not self.has_mesh:
+            return True
+
+        if self.is_active or mesh.users > 1:
+            return False
+
+        if lazy_mesh.built_fingerprint is None or get_mesh_fingerprint(mesh) != lazy_mesh.built_fingerprint:
+            # Keep the changes, this LOD now owns the mesh like any other LOD
+            self.lazy_mesh_id = ""
+            return True
+
+        self.mesh_ref = None
+        bpy.data.meshes.remove(mesh)
+        return True
+
     @property
     def level(self) -> LODLevel:
         obj: Object = self.id_data
@@ -156,7 +274,7 @@ class LODLevels(PropertyGroup):
     def set_highest_lod_active(self):
         for lod_level in LODLevel:
             lod = self.get_lod(lod_level)
-            if lod.mesh is not None:
+            if lod.has_mesh:
                 self.active_lod_level = lod_level
                 return
 
@@ -285,7 +403,7 @@ class SOLLUMZ_OT_copy_lod(bpy.types.Operator):
             if lod is None:
                 return {"CANCELLED"}
 
-            if lod.mesh is not None:
+            if lod.has_mesh:
                 self.report({"INFO"}, f"{SOLLUMZ_UI_NAMES[lod_level]} already has a mesh!")
                 return {"CANCELLED"}
 
@@ -359,6 +477,84 @@ def set_all_lods(obj: bpy.types.Object, lod_level: LODLevel):
             continue
 
 
+def get_lazy_lod_mesh_cache_size() -> int:
+    from .sollumz_preferences import get_addon_preferences
+    return get_addon_preferences(bpy.context).lazy_lod_cache_size
+
+
+def _find_lod_with_lazy_mesh(lazy_mesh_id: str, obj_name: str, lod_level: LODLevel) -> Optional[LODLevelProps]:
+    obj = bpy.data.objects.get(obj_name, None)
+    if obj is not None and obj.type == "MESH" and obj.sz_lods.get_lod(lod_level).lazy_mesh_id == lazy_mesh_id:
+        return obj.sz_lods.get_lod(lod_level)
+
+    # The object was renamed
+    for obj in bpy.data.objects:
+        if obj.type == "MESH" and obj.sz_lods.get_lod(lod_level).lazy_mesh_id == lazy_mesh_id:
+            return obj.sz_lods.get_lod(lod_level)
+
+    return None
+
+
+def evict_lazy_lod_meshes(max_built: int):
+    """Removes the least recently used lazy LOD meshes until at most ``max_built`` are built. Meshes in use by the
+    active LOD or by other objects are kept.
+    """
+    for lazy_mesh_id, (obj_name, lod_level) in list(_built_lazy_lod_meshes.items()):
+        if len(_built_lazy_lod_meshes) <= max_built:
+            break
+
+        lod = _find_lod_with_lazy_mesh(lazy_mesh_id, obj_name, lod_level)
+        if lod is None or lod.evict_lazy_mesh():
+            del _built_lazy_lod_meshes[lazy_mesh_id]
+
+
+def _evict_lazy_lod_meshes_timer():
+    global _is_lazy_lod_mesh_eviction_scheduled
+    _is_lazy_lod_mesh_eviction_scheduled = False
+    evict_lazy_lod_meshes(get_lazy_lod_mesh_cache_size())
+    return None
+
+
+def _schedule_lazy_lod_mesh_eviction():
+    """Evicts lazy LOD meshes over the cache size later. Not done right away as the caller may still be using the
+    meshes built so far (e.g. during an export).
+    """
+    global _is_lazy_lod_mesh_eviction_scheduled
+    if _is_lazy_lod_mesh_eviction_scheduled or len(_built_lazy_lod_meshes) <= get_lazy_lod_mesh_cache_size():
+        return
+
+    _is_lazy_lod_mesh_eviction_scheduled = True
+    bpy.app.timers.register(_evict_lazy_lod_meshes_timer, first_interval=1.0)
+
+
+def build_all_lazy_lod_meshes():
+    """Builds the lazy LOD meshes of all objects that are not built yet."""
+    for obj in bpy.data.objects:
+        if obj.type != "MESH":
+            continue
+
+        lods = obj.sz_lods
+        for lod_level in LODLevel:
+            lods.get_lod(lod_level).build_lazy_mesh()
+
+
+@persistent
+def on_save_pre(*args):
+    # The lazy LOD meshes data is not saved in the .blend file, so the meshes need to be there
+    if _lazy_lod_meshes:
+        build_all_lazy_lod_meshes()
+
+
+@persistent
+def on_load_post(*args):
+    global _is_lazy_lod_mesh_eviction_scheduled
+    _lazy_lod_meshes.clear()
+    _built_lazy_lod_meshes.clear()
+    if _is_lazy_lod_mesh_eviction_scheduled:
+        bpy.app.timers.unregister(_evict_lazy_lod_meshes_timer)
+        _is_lazy_lod_mesh_eviction_scheduled = False
+
+
 def operates_on_lod_level(func: Callable):
     """Decorator for functions that operate on a particular LOD level of an object.
     Will automatically set the LOD level to ``lod_level`` at the beginning of execution
@@ -386,9 +582,17 @@ def register():
     bpy.types.Scene.sollumz_show_shattermaps = bpy.props.BoolProperty(default=True)
     bpy.types.Scene.sollumz_copy_lod_level = bpy.props.EnumProperty(items=LODLevelEnumItems)
 
+    bpy.app.handlers.save_pre.append(on_save_pre)
+    bpy.app.handlers.load_post.append(on_load_post)
+
 
 def unregister():
     del bpy.types.Object.sz_lods
     del bpy.types.Scene.sollumz_show_collisions
     del bpy.types.Scene.sollumz_show_shattermaps
     del bpy.types.Scene.sollumz_copy_lod_level
+
+    bpy.app.handlers.save_pre.remove(on_save_pre)
+    bpy.app.handlers.load_post.remove(on_load_post)
+    if bpy.app.timers.is_registered(_evict_lazy_lod_meshes_timer):
+        bpy.app.timers.unregister(_evict_lazy_lod_meshes_timer)
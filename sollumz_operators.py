@@ -9,7 +9,7 @@ from bpy_extras.io_utils import ImportHelper
 from mathutils import Matrix, Quaternion
 from .sollumz_helper import SOLLUMZ_OT_base, find_sollumz_parent
 from .sollumz_properties import SollumType, SOLLUMZ_UI_NAMES, BOUND_TYPES, TimeFlags, ArchetypeType, LODLevel
-from .sollumz_preferences import get_export_settings
+from .sollumz_preferences import SollumzExportSettings, get_addon_preferences, get_export_settings
 from .cwxml.drawable import YDR, YDD
 from .cwxml.fragment import YFT
 from .cwxml.bound import YBN
@@ -17,6 +17,7 @@ from .cwxml.navmesh import YNV
 from .cwxml.clipdictionary import YCD
 from .cwxml.ytyp import YTYP
 from .cwxml.ymap import YMAP
+from .cwxml.asset_cache import ParsedAssetCache, use_parsed_asset_cache
 from .ydr.ydrimport import import_ydr
 from .ydr.ydrexport import export_ydr
 from .ydd.yddimport import import_ydd
@@ -32,6 +33,10 @@ from .ymap.ymapimport import import_ymap
 from .ymap.ymapexport import export_ymap
 from .tools.blenderhelper import add_child_of_bone_constraint, get_child_of_pose_bone, get_terrain_texture_brush, remove_number_suffix, create_blender_object, join_objects
 from .tools.ytyphelper import ytyp_from_objects
+from .tools.profiling import Profiler, use_profiler, span
+from .tools.meshcache import use_evaluated_mesh_cache
+from .tools.exportmanifest import ExportManifest, get_addon_version
+from .tools.exportfingerprint import ExportFingerprinter
 from .ybn.properties import BoundFlags
 
 from . import logger
@@ -48,11 +53,42 @@ class TimedOperator:
 
     def execute(self, context: bpy.types.Context):
         self._start = time.time()
-        return self.execute_timed(context)
+        profiler = self.create_profiler(context)
+        with use_profiler(profiler):
+            result = self.execute_timed(context)
+
+        if profiler is not None:
+            self.report_profile(context, profiler)
+
+        return result
 
     def execute_timed(self, context: bpy.types.Context):
         ...
 
+    def create_profiler(self, context: bpy.types.Context) -> Optional[Profiler]:
+        prefs = get_addon_preferences(context)
+        if not prefs.profiling_enabled:
+            return None
+
+        return Profiler(use_cprofile=prefs.profiling_use_cprofile)
+
+    def report_profile(self, context: bpy.types.Context, profiler: Profiler):
+        """Shows the time spent in each stage in the Info log and writes the trace file, if enabled."""
+        self.report({"INFO"}, f"Profile ({profiler.root.total_time:.3f} seconds):")
+        for line in profiler.format_report():
+            self.report({"INFO"}, line)
+
+        if profiler.cprofile is not None:
+            print(profiler.format_cprofile_stats())
+
+        prefs = get_addon_preferences(context)
+        if prefs.profiling_write_trace:
+            directory = prefs.get_profiling_output_directory()
+            os.makedirs(directory, exist_ok=True)
+            filepath = os.path.join(directory, f"{self.bl_idname}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+            profiler.write_trace(filepath)
+            self.report({"INFO"}, f"Profile trace written to '{filepath}'")
+
 
 class SOLLUMZ_OT_import_assets(bpy.types.Operator, ImportHelper, TimedOperator):
     """Import XML files exported by CodeWalker"""
@@ -86,36 +122,48 @@ class SOLLUMZ_OT_import_assets(bpy.types.Operator, ImportHelper, TimedOperator):
 
             filenames = self.dedupe_hi_yft_filenames([f.name for f in self.files])
 
-            for filename in filenames:
-                filepath = os.path.join(self.directory, filename)
-
-                try:
-
-                    if YDR.file_extension in filepath:
-                        import_ydr(filepath)
-                    elif YDD.file_extension in filepath:
-                        import_ydd(filepath)
-                    elif YFT.file_extension in filepath:
-                        import_yft(filepath)
-                    elif YBN.file_extension in filepath:
-                        import_ybn(filepath)
-                    elif YNV.file_extension in filepath:
-                        import_ynv(filepath)
-                    elif YCD.file_extension in filepath:
-                        import_ycd(filepath)
-                    elif YMAP.file_extension in filepath:
-                        import_ymap(filepath)
-                    else:
-                        continue
-
-                    logger.info(f"Successfully imported '{filepath}'")
-                except:
-                    logger.error(f"Error importing: {filepath} \n {traceback.format_exc()}")
-                    return {"CANCELLED"}
+            with use_parsed_asset_cache(self.create_parsed_asset_cache(context)) as cache:
+                for filename in filenames:
+                    filepath = os.path.join(self.directory, filename)
+
+                    try:
+
+                        with span(filename):
+                            if YDR.file_extension in filepath:
+                                import_ydr(filepath)
+                            elif YDD.file_extension in filepath:
+                                import_ydd(filepath)
+                            elif YFT.file_extension in filepath:
+                                import_yft(filepath)
+                            elif YBN.file_extension in filepath:
+                                import_ybn(filepath)
+                            elif YNV.file_extension in filepath:
+                                import_ynv(filepath)
+                            elif YCD.file_extension in filepath:
+                                import_ycd(filepath)
+                            elif YMAP.file_extension in filepath:
+                                import_ymap(filepath)
+                            else:
+                                continue
+
+                        logger.info(f"Successfully imported '{filepath}'")
+                    except:
+                        logger.error(f"Error importing: {filepath} \n {traceback.format_exc()}")
+                        return {"CANCELLED"}
+
+                if cache is not None and cache.num_hits > 0:
+                    logger.info(f"Loaded {cache.num_hits} file(s) from the parsed asset cache")
 
             logger.info(f"Imported in {self.time_elapsed} seconds")
             return {"FINISHED"}
 
+    def create_parsed_asset_cache(self, context) -> Optional[ParsedAssetCache]:
+        prefs = get_addon_preferences(context)
+        if not prefs.parsed_asset_cache_enabled:
+            return None
+
+        return ParsedAssetCache(prefs.get_parsed_asset_cache_directory(), prefs.parsed_asset_cache_max_size * 1024 * 1024)
+
     def invoke(self, context, event):
         if self.directory and len(self.files) > 0 and self.files[0].name != "":
             # Already have a list of files, don't open the import window and do the import directly.
@@ -183,7 +231,8 @@ class SOLLUMZ_OT_export_assets(bpy.types.Operator, TimedOperator):
             return {"RUNNING_MODAL"}
 
     def execute_timed(self, context: bpy.types.Context):
-        with logger.use_operator_logger(self) as op_log:
+        # Evaluated meshes are shared by all the exported assets and freed at the end of the export
+        with logger.use_operator_logger(self) as op_log, use_evaluated_mesh_cache():
             logger.info("Starting export...")
             objs = self.collect_objects(context)
             export_settings = get_export_settings()
@@ -197,34 +246,52 @@ class SOLLUMZ_OT_export_assets(bpy.types.Operator, TimedOperator):
                     logger.info("No Sollumz objects in the scene to export!")
                 return {"CANCELLED"}
 
+            manifest = self.load_export_manifest(export_settings)
+            fingerprinter = ExportFingerprinter() if manifest is not None else None
+            num_skipped = 0
+
             any_warnings_or_errors = False
             for obj in objs:
                 op_log.clear_log_counts()
                 filepath = None
                 try:
                     success = False
-                    if obj.sollum_type == SollumType.DRAWABLE:
-                        filepath = self.get_filepath(obj, YDR.file_extension)
-                        success = export_ydr(obj, filepath)
-                    elif obj.sollum_type == SollumType.DRAWABLE_DICTIONARY:
-                        filepath = self.get_filepath(obj, YDD.file_extension)
-                        success = export_ydd(obj, filepath)
-                    elif obj.sollum_type == SollumType.FRAGMENT:
-                        filepath = self.get_filepath(obj, YFT.file_extension)
-                        success = export_yft(obj, filepath)
-                    elif obj.sollum_type == SollumType.CLIP_DICTIONARY:
-                        filepath = self.get_filepath(obj, YCD.file_extension)
-                        success = export_ycd(obj, filepath)
-                    elif obj.sollum_type in BOUND_TYPES:
-                        filepath = self.get_filepath(obj, YBN.file_extension)
-                        success = export_ybn(obj, filepath)
-                    elif obj.sollum_type == SollumType.YMAP:
-                        filepath = self.get_filepath(obj, YMAP.file_extension)
-                        success = export_ymap(obj, filepath)
-                    else:
-                        continue
+                    with span(obj.name):
+                        if obj.sollum_type == SollumType.DRAWABLE:
+                            file_extension, export_func = YDR.file_extension, export_ydr
+                        elif obj.sollum_type == SollumType.DRAWABLE_DICTIONARY:
+                            file_extension, export_func = YDD.file_extension, export_ydd
+                        elif obj.sollum_type == SollumType.FRAGMENT:
+                            file_extension, export_func = YFT.file_extension, export_yft
+                        elif obj.sollum_type == SollumType.CLIP_DICTIONARY:
+                            file_extension, export_func = YCD.file_extension, export_ycd
+                        elif obj.sollum_type in BOUND_TYPES:
+                            file_extension, export_func = YBN.file_extension, export_ybn
+                        elif obj.sollum_type == SollumType.YMAP:
+                            file_extension, export_func = YMAP.file_extension, export_ymap
+                        else:
+                            continue
+
+                        filepath = self.get_filepath(obj, file_extension)
+                        if manifest is not None:
+                            fingerprint = fingerprinter.get_object_fingerprint(obj)
+                            if manifest.is_up_to_date(filepath, fingerprint):
+                                num_skipped += 1
+                                continue
+
+                            manifest.remove(filepath)
+
+                        success = export_func(obj, filepath)
+                        if manifest is not None:
+                            # Exporting can modify the objects (e.g. the YMAP export renames the entities and stores
+                            # the extents), discard the cached digests taken before it
+                            fingerprinter = ExportFingerprinter()
 
                     if success:
+                        if manifest is not None:
+                            # Fingerprint of the state left by the export, which is what the next export will see
+                            manifest.update(filepath, fingerprinter.get_object_fingerprint(obj))
+
                         if op_log.has_warnings_or_errors:
                             logger.info(f"Exported '{filepath}' with WARNINGS or ERRORS! Please check the Info Log for details.")
                             any_warnings_or_errors = True
@@ -233,8 +300,15 @@ class SOLLUMZ_OT_export_assets(bpy.types.Operator, TimedOperator):
                 except:
                     logger.error(f"Error exporting: {filepath or obj.name} \n {traceback.format_exc()}")
                     any_warnings_or_errors = True
+                    if manifest is not None:
+                        manifest.save()
                     return {"CANCELLED"}
 
+            if manifest is not None:
+                manifest.save()
+                if num_skipped > 0:
+                    logger.info(f"Skipped {num_skipped} unchanged asset(s)")
+
             if export_settings.export_with_ytyp:
                 ytyp = ytyp_from_objects(objs)
                 filepath = os.path.join(
@@ -247,6 +321,17 @@ class SOLLUMZ_OT_export_assets(bpy.types.Operator, TimedOperator):
                 bpy.ops.screen.info_log_show()
             return {"FINISHED"}
 
+    def load_export_manifest(self, export_settings: SollumzExportSettings) -> Optional[ExportManifest]:
+        if not export_settings.skip_unchanged:
+            return None
+
+        settings_fingerprint = ExportFingerprinter().get_settings_fingerprint(
+            export_settings,
+            # Settings that don't change the exported files
+            excluded=frozenset(("limit_to_selected", "skip_unchanged"))
+        )
+        return ExportManifest.load(self.directory, get_addon_version(), settings_fingerprint)
+
     def collect_objects(self, context: bpy.types.Context) -> list[bpy.types.Object]:
         export_settings = get_export_settings()
 
@@ -10,6 +10,7 @@ from bpy.types import (
 from bpy.props import (
     StringProperty,
     IntProperty,
+    FloatProperty,
     BoolProperty,
     EnumProperty,
     CollectionProperty,
@@ -17,12 +18,27 @@ from bpy.props import (
 )
 import os
 import ast
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Iterator
 from configparser import ConfigParser
 from typing import Optional
 
 PREFS_FILE_NAME = "sollumz_prefs.ini"
 
+_preferences_saving_suspended = False
+
+
+@contextmanager
+def suspend_preferences_saving() -> Iterator[None]:
+    """Changes to the preferences made inside this context are not written to the preferences file."""
+    global _preferences_saving_suspended
+    prev_suspended = _preferences_saving_suspended
+    _preferences_saving_suspended = True
+    try:
+        yield
+    finally:
+        _preferences_saving_suspended = prev_suspended
+
 
 def _save_preferences_on_update(self, context):
     _save_preferences()
@@ -36,6 +52,17 @@ class SollumzExportSettings(PropertyGroup):
         update=_save_preferences_on_update
     )
 
+    skip_unchanged: BoolProperty(
+        name="Skip Unchanged",
+        description=(
+            "Skip objects that didn't change since they were last exported to the same directory. Exported objects "
+            "are tracked in a 'sollumz_export_manifest.json' file in the output directory. Changing the export "
+            "settings or updating Sollumz exports everything again"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+
     exclude_skeleton: BoolProperty(
         name="Exclude Skeleton",
         description="Exclude skeleton from export. Usually done with mp ped components",
@@ -78,6 +105,34 @@ class SollumzExportSettings(PropertyGroup):
         update=_save_preferences_on_update
     )
 
+    ymap_partition_entities: BoolProperty(
+        name="Split Entities by Area",
+        description=(
+            "If enabled, entities are split into child ymaps, one for each cell of a grid, with the exported ymap as "
+            "parent. LOD parent entities stay in the exported ymap. Each child ymap only streams in when its area is "
+            "near, instead of all the entities at once"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+
+    ymap_partition_cell_size: FloatProperty(
+        name="Cell Size",
+        description="Size of the grid cells used to split the entities",
+        default=256.0,
+        min=1.0,
+        subtype="DISTANCE",
+        update=_save_preferences_on_update
+    )
+
+    ymap_partition_max_entities: IntProperty(
+        name="Max Entities per Cell",
+        description="Cells with more entities are split further in 4 smaller cells. 0 means no limit",
+        default=500,
+        min=0,
+        update=_save_preferences_on_update
+    )
+
     export_lods: EnumProperty(
         name="Toggle LODs",
         description="Toggle LODs to export",
@@ -121,6 +176,28 @@ class SollumzImportSettings(PropertyGroup):
         update=_save_preferences_on_update
     )
 
+    share_identical_meshes: BoolProperty(
+        name="Share Identical Meshes",
+        description=(
+            "If enabled, models with identical geometry, materials and properties in the same file (e.g. vehicle "
+            "wheels) share a single mesh, which reduces memory usage and import time. Editing one of these meshes "
+            "changes all the models that use it"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+
+    lazy_lod_meshes: BoolProperty(
+        name="Lazy LOD Meshes",
+        description=(
+            "If enabled, only the highest LOD mesh of each model is created on import. The other LOD meshes are kept "
+            "in a compact form and created when the LOD is first shown or exported, which reduces memory usage of "
+            "models with many LODs"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+
     import_ext_skeleton: BoolProperty(
         name="Import External Skeleton",
         description="Imports the first found yft skeleton in the same folder as the selected file",
@@ -170,6 +247,26 @@ class SollumzImportSettings(PropertyGroup):
         update=_save_preferences_on_update
     )
 
+    ymap_instance_collections: BoolProperty(
+        name="Use Collection Instances",
+        description=(
+            "If enabled, instanced entities are empties instancing a collection with the archetype objects, instead "
+            "of copies of all the archetype objects. Much faster and uses less memory on ymaps with many entities"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+
+    ybn_share_poly_meshes: BoolProperty(
+        name="Share Primitive Meshes",
+        description=(
+            "If enabled, bound primitives (boxes, spheres, capsules and cylinders) with the same dimensions and "
+            "material share a single mesh, which reduces memory usage and import time of bounds with many primitives"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+
     ytyp_mlo_instance_entities: BoolProperty(
         name="Instance MLO Entities",
         description=(
@@ -293,6 +390,19 @@ class SOLLUMZ_OT_prefs_shared_textures_directory_move_down(Operator):
         return {"FINISHED"}
 
 
+class SOLLUMZ_OT_prefs_clear_parsed_asset_cache(Operator):
+    bl_idname = "sollumz.prefs_clear_parsed_asset_cache"
+    bl_label = "Clear Cache"
+    bl_description = "Remove all parsed assets from the cache directory"
+
+    def execute(self, context):
+        from .cwxml.asset_cache import ParsedAssetCache
+        prefs = get_addon_preferences(context)
+        cache = ParsedAssetCache(prefs.get_parsed_asset_cache_directory(), prefs.parsed_asset_cache_max_size)
+        cache.clear()
+        return {"FINISHED"}
+
+
 class SzFavoriteEntry(PropertyGroup):
     name: StringProperty(
         name="Name",
@@ -354,9 +464,86 @@ class SollumzAddonPreferences(AddonPreferences):
         type=SzFavoriteEntry,
     )
 
+    parsed_asset_cache_enabled: BoolProperty(
+        name="Cache Parsed Assets",
+        description=(
+            "Store parsed XML files in the cache directory so importing the same unmodified file again skips XML "
+            "parsing"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+    parsed_asset_cache_directory: StringProperty(
+        name="Cache Directory",
+        description="Directory where parsed assets are cached. If empty, a directory in the Blender config folder is used",
+        subtype="DIR_PATH",
+        update=_save_preferences_on_update
+    )
+    parsed_asset_cache_max_size: IntProperty(
+        name="Cache Size Limit (MB)",
+        description="Maximum size of the cache. The least recently used assets are removed when exceeded",
+        default=2048,
+        min=1,
+        update=_save_preferences_on_update
+    )
+
+    lazy_lod_cache_size: IntProperty(
+        name="Lazy LOD Cache Size",
+        description=(
+            "Maximum number of lazy LOD meshes kept after being created. The least recently used unmodified meshes "
+            "of inactive LODs are removed when exceeded, and created again when needed"
+        ),
+        default=64,
+        min=0,
+        update=_save_preferences_on_update
+    )
+
+    profiling_enabled: BoolProperty(
+        name="Profile Import/Export",
+        description="Measure the time spent in each stage of the import and export, and show the breakdown in the Info Log",
+        default=False,
+        update=_save_preferences_on_update
+    )
+    profiling_use_cprofile: BoolProperty(
+        name="Use cProfile",
+        description=(
+            "Also profile every Python function call with cProfile and print the slowest functions to the console. "
+            "Makes the import and export considerably slower"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+    profiling_write_trace: BoolProperty(
+        name="Write Trace File",
+        description=(
+            "Write the profile to a JSON file in the Chrome Trace Event format, which can be opened in Perfetto or "
+            "chrome://tracing. With cProfile, its stats are written next to it as a .prof file"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+    profiling_output_directory: StringProperty(
+        name="Trace Directory",
+        description="Directory where trace files are written. If empty, a directory in the Blender config folder is used",
+        subtype="DIR_PATH",
+        update=_save_preferences_on_update
+    )
+
     export_settings: PointerProperty(type=SollumzExportSettings, name="Export Settings")
     import_settings: PointerProperty(type=SollumzImportSettings, name="Import Settings")
 
+    def get_parsed_asset_cache_directory(self) -> str:
+        if self.parsed_asset_cache_directory:
+            return bpy.path.abspath(self.parsed_asset_cache_directory)
+
+        return os.path.join(get_config_directory_path(), "parsed_asset_cache")
+
+    def get_profiling_output_directory(self) -> str:
+        if self.profiling_output_directory:
+            return bpy.path.abspath(self.profiling_output_directory)
+
+        return os.path.join(get_config_directory_path(), "profiles")
+
     def swap_shared_textures_directories(self, indexA: int, indexB: int):
         a = self.shared_textures_directories[indexA]
         b = self.shared_textures_directories[indexB]
@@ -431,6 +618,27 @@ class SollumzAddonPreferences(AddonPreferences):
         subcol.operator(SOLLUMZ_OT_prefs_shared_textures_directory_move_up.bl_idname, text="", icon="TRIA_UP")
         subcol.operator(SOLLUMZ_OT_prefs_shared_textures_directory_move_down.bl_idname, text="", icon="TRIA_DOWN")
 
+        layout.separator()
+        layout.prop(self, "parsed_asset_cache_enabled")
+        col = layout.column()
+        col.enabled = self.parsed_asset_cache_enabled
+        col.prop(self, "parsed_asset_cache_directory")
+        col.prop(self, "parsed_asset_cache_max_size")
+        col.operator(SOLLUMZ_OT_prefs_clear_parsed_asset_cache.bl_idname)
+
+        layout.separator()
+        layout.prop(self, "lazy_lod_cache_size")
+
+        layout.separator()
+        layout.prop(self, "profiling_enabled")
+        col = layout.column()
+        col.enabled = self.profiling_enabled
+        col.prop(self, "profiling_use_cprofile")
+        col.prop(self, "profiling_write_trace")
+        subcol = col.column()
+        subcol.enabled = self.profiling_write_trace
+        subcol.prop(self, "profiling_output_directory")
+
         # layout.separator()
         # layout.label(text="Experimental:")
         # layout.prop(self, "experimental_shader_expressions")
@@ -452,6 +660,9 @@ def get_export_settings(context: Optional[bpy.types.Context] = None) -> SollumzE
 
 
 def _save_preferences():
+    if _preferences_saving_suspended:
+        return
+
     addon_prefs = get_addon_preferences(bpy.context)
     prefs_path = get_prefs_path()
 
@@ -504,6 +715,9 @@ def _get_bpy_struct_as_dict(struct: bpy_struct) -> dict:
             prop = _get_bpy_collection_as_list(prop)
         elif isinstance(prop, bpy_struct):
             prop = _get_bpy_struct_as_dict(prop)
+        elif isinstance(prop, str):
+            # Quote strings, values are parsed back with `ast.literal_eval` when loading the preferences
+            prop = repr(prop)
 
         return prop
 
@@ -148,9 +148,18 @@ class SOLLUMZ_PT_import_asset(bpy.types.Panel, SollumzImportSettingsPanel):
         layout.prop(settings, "import_as_asset")
 
 
+class SOLLUMZ_PT_import_drawable(bpy.types.Panel, SollumzImportSettingsPanel):
+    bl_label = "Drawable"
+    bl_order = 1
+
+    def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzImportSettings):
+        layout.prop(settings, "share_identical_meshes")
+        layout.prop(settings, "lazy_lod_meshes")
+
+
 class SOLLUMZ_PT_import_fragment(bpy.types.Panel, SollumzImportSettingsPanel):
     bl_label = "Fragment"
-    bl_order = 1
+    bl_order = 2
 
     def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzImportSettings):
         layout.prop(settings, "split_by_group")
@@ -158,7 +167,7 @@ class SOLLUMZ_PT_import_fragment(bpy.types.Panel, SollumzImportSettingsPanel):
 
 class SOLLUMZ_PT_import_ydd(bpy.types.Panel, SollumzImportSettingsPanel):
     bl_label = "Drawable Dictionary"
-    bl_order = 2
+    bl_order = 3
 
     def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzImportSettings):
         layout.prop(settings, "import_ext_skeleton")
@@ -188,17 +197,28 @@ class SOLLUMZ_UL_armature_list(bpy.types.UIList):
 
 class SOLLUMZ_PT_import_ymap(bpy.types.Panel, SollumzImportSettingsPanel):
     bl_label = "Ymap"
-    bl_order = 3
+    bl_order = 4
 
     def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzImportSettings):
         layout.prop(settings, "ymap_skip_missing_entities")
         layout.prop(settings, "ymap_exclude_entities")
         layout.prop(settings, "ymap_instance_entities")
+        row = layout.row()
+        row.enabled = settings.ymap_instance_entities
+        row.prop(settings, "ymap_instance_collections")
         layout.prop(settings, "ymap_box_occluders")
         layout.prop(settings, "ymap_model_occluders")
         layout.prop(settings, "ymap_car_generators")
 
 
+class SOLLUMZ_PT_import_ybn(bpy.types.Panel, SollumzImportSettingsPanel):
+    bl_label = "Bounds"
+    bl_order = 5
+
+    def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzImportSettings):
+        layout.prop(settings, "ybn_share_poly_meshes")
+
+
 class SOLLUMZ_PT_export_include(bpy.types.Panel, SollumzExportSettingsPanel):
     bl_label = "Include"
     bl_order = 0
@@ -206,6 +226,7 @@ class SOLLUMZ_PT_export_include(bpy.types.Panel, SollumzExportSettingsPanel):
     def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzExportSettings):
         row = layout.row(heading="Limit To")
         row.prop(settings, "limit_to_selected", text="Selected Objects")
+        layout.prop(settings, "skip_unchanged")
 
 
 class SOLLUMZ_PT_export_drawable(bpy.types.Panel, SollumzExportSettingsPanel):
@@ -251,6 +272,11 @@ class SOLLUMZ_PT_export_ymap(bpy.types.Panel, SollumzExportSettingsPanel):
         layout.prop(settings, "ymap_box_occluders")
         layout.prop(settings, "ymap_model_occluders")
         layout.prop(settings, "ymap_car_generators")
+        layout.prop(settings, "ymap_partition_entities")
+        col = layout.column()
+        col.enabled = settings.ymap_partition_entities
+        col.prop(settings, "ymap_partition_cell_size")
+        col.prop(settings, "ymap_partition_max_entities")
 
 
 class SOLLUMZ_PT_TOOL_PANEL(bpy.types.Panel):
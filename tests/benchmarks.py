@@ -0,0 +1,614 @@
+"""Performance benchmarks of the import/export pipelines.
+
+Each benchmark generates a large asset procedurally and writes it to a CodeWalker XML file with Sollumz's own
+exporters (or directly with the cwxml classes), then times every stage of the round-trip:
+
+* ``parse``: XML file to cwxml objects.
+* ``build``: cwxml objects to Blender objects.
+* ``gather``: Blender objects back to cwxml objects.
+* ``serialize``: cwxml objects to XML file.
+
+Micro-benchmarks time individual functions instead, each stage being a different function run over the same input.
+
+Must run inside Blender, see ``run_benchmarks.py``. Results are written as JSON so they can be compared between
+commits.
+"""
+import bpy
+import io
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+import numpy as np
+from mathutils import Quaternion, Vector
+from ..cwxml import clipdictionary as ycdxml
+from ..cwxml.bound import YBN, BoundFile
+from ..cwxml.drawable import YDR, YDD, VertexBuffer
+from ..cwxml.ymap import YMAP, CMapData, Entity
+from ..sollumz_properties import SollumType
+from ..sollumz_preferences import get_import_settings, suspend_preferences_saving
+from ..tools.blenderhelper import create_blender_object, create_empty_object
+from ..tools.boundhelper import convert_obj_to_bvh, create_bound_shape
+from ..tools import jenkhash
+from ..tools.drawablehelper import convert_obj_to_model
+from ..ybn.collision_materials import create_collision_material_from_index
+from ..ybn.ybnexport import create_composite_xml, export_ybn
+from ..ybn.ybnimport import create_bound_composite
+from ..ycd.ycdexport import clip_dictionary_from_object
+from ..ycd.ycdimport import clip_dictionary_to_obj
+from ..ydd.yddexport import create_ydd_xml, export_ydd
+from ..ydd.yddimport import create_ydd_obj
+from ..ydr.shader_materials import create_shader
+from ..ydr.ydrexport import create_drawable_xml, export_ydr
+from ..ydr.ydrimport import create_drawable_obj
+from ..ymap.ymapexport import ymap_from_object
+from ..ymap.ymapimport import ymap_to_obj
+from .test_vertex_buffer_text import LAYOUT, create_vertex_buffer, create_vertex_data_str
+
+STAGES = ("parse", "build", "gather", "serialize")
+
+
+class Benchmark(NamedTuple):
+    name: str
+    file_ext: str
+    # Gets the asset parameters for the given scale
+    params: Callable[[float], dict[str, Any]]
+    # Writes the asset to the given path
+    generate: Callable[[Path, dict[str, Any]], None]
+    parse: Callable[[Path], Any]
+    build: Callable[[Any, Path], bpy.types.Object]
+    gather: Callable[[bpy.types.Object], Any]
+    # Called before the stages with the asset parameters, to create objects the asset depends on
+    setup: Optional[Callable[[dict[str, Any]], None]] = None
+    # Import settings to use during the benchmark
+    import_settings: Optional[dict[str, Any]] = None
+
+
+class MicroBenchmark(NamedTuple):
+    name: str
+    # Gets the input parameters for the given scale
+    params: Callable[[float], dict[str, Any]]
+    # Creates the input passed to every stage
+    prepare: Callable[[dict[str, Any]], Any]
+    # Functions timed with the input, by stage name
+    stages: dict[str, Callable[[Any], Any]]
+
+
+def scaled(value: int, scale: float, minimum: int = 1) -> int:
+    return max(minimum, int(round(value * scale)))
+
+
+def create_grid_mesh(name: str, size: float, num_verts_side: int, height_seed: Optional[int] = None) -> bpy.types.Mesh:
+    """Creates a grid mesh of ``num_verts_side`` x ``num_verts_side`` vertices. If ``height_seed`` is set, the vertices
+    get random heights so the faces are not coplanar.
+    """
+    n = num_verts_side
+    xs, ys = np.meshgrid(np.linspace(-size / 2, size / 2, n), np.linspace(-size / 2, size / 2, n))
+    zs = np.zeros_like(xs)
+    if height_seed is not None:
+        zs = np.random.default_rng(height_seed).uniform(0.0, size * 0.01, xs.shape)
+    positions = np.stack((xs.ravel(), ys.ravel(), zs.ravel()), axis=1).astype(np.float32)
+
+    # Quads of the grid as two triangles each
+    quad_starts = (np.arange(n - 1)[:, None] * n + np.arange(n - 1)).ravel()
+    tris = np.concatenate((
+        np.stack((quad_starts, quad_starts + 1, quad_starts + n + 1), axis=1),
+        np.stack((quad_starts, quad_starts + n + 1, quad_starts + n), axis=1),
+    )).astype(np.int32)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", positions.ravel())
+    mesh.loops.add(tris.size)
+    mesh.loops.foreach_set("vertex_index", tris.ravel())
+    mesh.polygons.add(len(tris))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, tris.size, 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+    uv_layer = mesh.uv_layers.new()
+    loop_positions = positions[tris.ravel()]
+    uv_layer.data.foreach_set("uv", (loop_positions[:, :2] / size + 0.5).ravel())
+
+    mesh.validate()
+    return mesh
+
+
+def create_model_obj(name: str, mesh: bpy.types.Mesh, materials: list[bpy.types.Material]) -> bpy.types.Object:
+    for mat in materials:
+        mesh.materials.append(mat)
+
+    if len(materials) > 1:
+        # Spread the materials across the faces, each material becomes a separate geometry
+        material_indices = np.arange(len(mesh.polygons), dtype=np.int32) % len(materials)
+        mesh.polygons.foreach_set("material_index", material_indices)
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(obj)
+    convert_obj_to_model(obj)
+    return obj
+
+
+def generate_skinned_drawable(path: Path, params: dict[str, Any]):
+    name = path.name.replace(YDR.file_extension, "")
+    num_bones = params["num_bones"]
+    size = 10.0
+
+    armature = bpy.data.armatures.new(f"{name}.skel")
+    drawable_obj = create_blender_object(SollumType.DRAWABLE, name, armature)
+    bpy.context.view_layer.objects.active = drawable_obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    bone_xs = np.linspace(-size / 2, size / 2, num_bones)
+    for i, bone_x in enumerate(bone_xs.tolist()):
+        edit_bone = armature.edit_bones.new(f"bone_{i}")
+        edit_bone.head = (bone_x, 0.0, 0.0)
+        edit_bone.tail = (bone_x, 0.05, 0.0)
+        if i > 0:
+            edit_bone.parent = armature.edit_bones[i - 1]
+    bpy.ops.object.mode_set(mode="OBJECT")
+    for i, bone in enumerate(armature.bones):
+        bone.bone_properties.tag = i
+
+    mesh = create_grid_mesh(f"{name}.mesh", size, params["num_verts_side"])
+    model_obj = create_model_obj(f"{name}.model", mesh, [create_shader("default.sps")])
+    model_obj.parent = drawable_obj
+    armature_mod = model_obj.modifiers.new("Armature", "ARMATURE")
+    armature_mod.object = drawable_obj
+
+    # Each vertex weighted to the two closest bones along the X axis
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    bone_pos = np.interp(positions[0::3], bone_xs, np.arange(num_bones))
+    bone0 = np.floor(bone_pos).astype(np.int64)
+    bone1 = np.minimum(bone0 + 1, num_bones - 1)
+    # Quantized weights so vertices can be added to the groups in batches
+    weight1 = np.round((bone_pos - bone0) * 8) / 8
+    vertex_groups = [model_obj.vertex_groups.new(name=f"bone_{i}") for i in range(num_bones)]
+    for bone_inds, weights in ((bone0, 1.0 - weight1), (bone1, weight1)):
+        keys = bone_inds * 16 + np.round(weights * 8).astype(np.int64)
+        for key in np.unique(keys).tolist():
+            bone_ind, weight = divmod(key, 16)
+            if weight == 0:
+                continue
+            vert_inds = np.flatnonzero(keys == key).tolist()
+            vertex_groups[bone_ind].add(vert_inds, weight / 8, "ADD")
+
+    export_ydr(drawable_obj, str(path))
+
+
+def generate_drawable_dictionary(path: Path, params: dict[str, Any]):
+    name = path.name.replace(YDD.file_extension, "")
+    materials = [create_shader("default.sps") for _ in range(params["num_materials"])]
+
+    dict_obj = create_empty_object(SollumType.DRAWABLE_DICTIONARY, name)
+    for drawable_index in range(params["num_drawables"]):
+        drawable_obj = create_empty_object(SollumType.DRAWABLE, f"{name}_{drawable_index}")
+        drawable_obj.parent = dict_obj
+        for model_index in range(params["num_models"]):
+            mesh = create_grid_mesh(f"{drawable_obj.name}_{model_index}.mesh", 2.0, params["num_verts_side"])
+            model_obj = create_model_obj(f"{drawable_obj.name}_{model_index}.model", mesh, materials)
+            model_obj.parent = drawable_obj
+            model_obj.location = (model_index * 2.5, 0.0, 0.0)
+
+    export_ydd(dict_obj, str(path))
+
+
+def generate_bvh_collision(path: Path, params: dict[str, Any]):
+    name = path.name.replace(YBN.file_extension, "")
+    size = 200.0
+
+    collision_mat = create_collision_material_from_index(0)
+    mesh = create_grid_mesh(f"{name}.poly_mesh", size, params["num_verts_side"], height_seed=1234)
+    mesh.materials.append(collision_mat)
+    poly_mesh_obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(poly_mesh_obj)
+    bvh_obj = convert_obj_to_bvh(poly_mesh_obj)
+
+    box_positions = np.random.default_rng(1234).uniform(-size / 2, size / 2, (params["num_boxes"], 3))
+    for position in box_positions.tolist():
+        box_obj = create_bound_shape(SollumType.BOUND_POLY_BOX)
+        box_obj.data.materials.append(collision_mat)
+        box_obj.parent = bvh_obj
+        box_obj.location = position
+
+    composite_obj = create_empty_object(SollumType.BOUND_COMPOSITE, name)
+    bvh_obj.parent = composite_obj
+
+    export_ybn(composite_obj, str(path))
+
+
+def generate_long_clip(path: Path, params: dict[str, Any]):
+    name = path.name.replace(ycdxml.YCD.file_extension, "")
+    num_bones = params["num_bones"]
+    num_frames = params["num_frames"]
+    sequence_frame_limit = params["sequence_frame_limit"]
+    fps = 30.0
+    rng = np.random.default_rng(1234)
+
+    def _quantize_float_channel(values: np.ndarray) -> ycdxml.ChannelsList.QuantizeFloat:
+        channel = ycdxml.ChannelsList.QuantizeFloat()
+        channel.quantum = 0.0001
+        channel.offset = float(values.min())
+        channel.values = values.tolist()
+        return channel
+
+    animation = ycdxml.Animation()
+    animation.hash = f"{name}_anim"
+    animation.frame_count = num_frames
+    animation.sequence_frame_limit = sequence_frame_limit
+    animation.duration = (num_frames - 1) / fps
+    animation.unknown1C = "hash_00000000"
+    for bone_index in range(num_bones):
+        for track, format in ((0, 0), (1, 1)):  # bone translation and rotation
+            bone_id = ycdxml.Animation.BoneIdList.BoneId()
+            bone_id.bone_id = bone_index
+            bone_id.track = track
+            bone_id.format = format
+            animation.bone_ids.append(bone_id)
+
+    # Smooth random curves so the values look like real animation data
+    frames = np.arange(num_frames)[:, None]
+    phases = rng.uniform(0.0, math.tau, (1, num_bones * 6))
+    freqs = rng.uniform(0.01, 0.1, (1, num_bones * 6))
+    curves = np.sin(frames * freqs + phases) * 0.5
+
+    for sequence_start in range(0, num_frames, sequence_frame_limit):
+        sequence_end = min(sequence_start + sequence_frame_limit, num_frames)
+        sequence = ycdxml.Animation.SequenceList.Sequence()
+        sequence.hash = f"hash_{sequence_start:08X}"
+        sequence.frame_count = sequence_end - sequence_start
+        for bone_index in range(num_bones):
+            bone_curves = curves[sequence_start:sequence_end, bone_index * 6:bone_index * 6 + 6]
+
+            translation_data = ycdxml.Animation.SequenceDataList.SequenceData()
+            for i in range(3):
+                translation_data.channels.append(_quantize_float_channel(bone_curves[:, i]))
+            sequence.sequence_data.append(translation_data)
+
+            # Quaternion X, Y and Z, W calculated from them
+            rotation_data = ycdxml.Animation.SequenceDataList.SequenceData()
+            for i in range(3, 6):
+                rotation_data.channels.append(_quantize_float_channel(bone_curves[:, i]))
+            cached_channel = ycdxml.ChannelsList.CachedQuaternion1()
+            cached_channel.quat_index = 3
+            rotation_data.channels.append(cached_channel)
+            sequence.sequence_data.append(rotation_data)
+
+        animation.sequences.append(sequence)
+
+    clip = ycdxml.ClipsList.ClipAnimation()
+    clip.hash = f"{name}_clip"
+    clip.name = f"pack:/{name}_clip.clip"
+    clip.animation_hash = animation.hash
+    clip.start_time = 0.0
+    clip.end_time = animation.duration
+    clip.rate = 1.0
+
+    clip_dictionary = ycdxml.ClipDictionary()
+    clip_dictionary.animations.append(animation)
+    clip_dictionary.clips.append(clip)
+    clip_dictionary.write_xml(str(path))
+
+
+def get_ymap_archetype_name(index: int) -> str:
+    return f"benchmark_prop_{index}"
+
+
+def generate_big_ymap(path: Path, params: dict[str, Any]):
+    rng = np.random.default_rng(1234)
+    num_entities = params["num_entities"]
+    positions = rng.uniform(-2000.0, 2000.0, (num_entities, 3))
+    headings = rng.uniform(0.0, math.tau, num_entities)
+    archetypes = rng.integers(0, params["num_archetypes"], num_entities)
+
+    ymap = CMapData()
+    ymap.name = path.name.replace(YMAP.file_extension, "")
+    for position, heading, archetype in zip(positions.tolist(), headings.tolist(), archetypes.tolist()):
+        entity = Entity()
+        entity.archetype_name = get_ymap_archetype_name(archetype)
+        entity.position = Vector(position)
+        entity.rotation = Quaternion((0.0, 0.0, 1.0), heading)
+        entity.scale_xy = 1.0
+        entity.scale_z = 1.0
+        entity.lod_dist = 100.0
+        entity.child_lod_dist = 0.0
+        entity.lod_level = "LODTYPES_DEPTH_HD"
+        entity.priority_level = "PRI_REQUIRED"
+        ymap.entities.append(entity)
+
+    ymap.write_xml(str(path))
+
+
+def setup_ymap_archetypes(params: dict[str, Any]):
+    """Creates the drawables the YMAP entities are placed from."""
+    for i in range(params["num_archetypes"]):
+        create_empty_object(SollumType.DRAWABLE, get_ymap_archetype_name(i))
+
+
+def gather_bound_file(obj: bpy.types.Object) -> BoundFile:
+    bound_file = BoundFile()
+    bound_file.composite = create_composite_xml(obj)
+    return bound_file
+
+
+BENCHMARKS = (
+    Benchmark(
+        name="ydr_skinned_high_poly",
+        file_ext=YDR.file_extension,
+        params=lambda scale: {"num_verts_side": scaled(400, math.sqrt(scale), 2), "num_bones": 64},
+        generate=generate_skinned_drawable,
+        parse=lambda path: YDR.from_xml_file(str(path)),
+        build=lambda xml, path: create_drawable_obj(xml, str(path), path.name.replace(YDR.file_extension, "")),
+        gather=lambda obj: create_drawable_xml(obj),
+    ),
+    Benchmark(
+        name="ydd_many_geometries",
+        file_ext=YDD.file_extension,
+        params=lambda scale: {
+            "num_drawables": scaled(32, scale), "num_models": 4, "num_materials": 4, "num_verts_side": 32
+        },
+        generate=generate_drawable_dictionary,
+        parse=lambda path: YDD.from_xml_file(str(path)),
+        build=lambda xml, path: create_ydd_obj(xml, str(path)),
+        gather=lambda obj: create_ydd_xml(obj),
+    ),
+    Benchmark(
+        name="ybn_large_bvh",
+        file_ext=YBN.file_extension,
+        params=lambda scale: {"num_verts_side": scaled(500, math.sqrt(scale), 2), "num_boxes": scaled(2000, scale)},
+        generate=generate_bvh_collision,
+        parse=lambda path: YBN.from_xml_file(str(path)),
+        build=lambda xml, path: create_bound_composite(xml.composite, path.name.replace(YBN.file_extension, "")),
+        gather=gather_bound_file,
+    ),
+    Benchmark(
+        name="ycd_long_clip",
+        file_ext=ycdxml.YCD.file_extension,
+        params=lambda scale: {"num_bones": 64, "num_frames": scaled(4000, scale, 2), "sequence_frame_limit": 256},
+        generate=generate_long_clip,
+        parse=lambda path: ycdxml.YCD.from_xml_file(str(path)),
+        build=lambda xml, path: clip_dictionary_to_obj(xml, path.name.replace(ycdxml.YCD.file_extension, "")),
+        gather=clip_dictionary_from_object,
+    ),
+    Benchmark(
+        name="ymap_big",
+        file_ext=YMAP.file_extension,
+        params=lambda scale: {"num_entities": scaled(20000, scale), "num_archetypes": 100},
+        generate=generate_big_ymap,
+        parse=lambda path: YMAP.from_xml_file(str(path)),
+        build=lambda xml, path: ymap_to_obj(xml),
+        gather=ymap_from_object,
+        setup=setup_ymap_archetypes,
+        import_settings={"ymap_instance_entities": True, "ymap_skip_missing_entities": True},
+    ),
+)
+
+
+def create_archetype_names(params: dict[str, Any]) -> list[str]:
+    """Gets archetype names as they appear in a ymap, with each archetype placed many times."""
+    rng = np.random.default_rng(1234)
+    archetypes = rng.integers(0, params["num_archetypes"], params["num_names"])
+    return [get_ymap_archetype_name(archetype) for archetype in archetypes.tolist()]
+
+
+def hash_names_generate(names: list[str]):
+    jenkhash.Generate.cache_clear()
+    for name in names:
+        jenkhash.Generate(name)
+
+
+def create_vertex_buffer_text(params: dict[str, Any]) -> tuple[str, np.dtype, str]:
+    layout_type = params["layout_type"]
+    data_str, raw_dtype = create_vertex_data_str(LAYOUT, layout_type, params["num_verts"])
+    return data_str, raw_dtype, layout_type
+
+
+def load_vertex_buffer_text(data: tuple[str, np.dtype, str]):
+    data_str, _, layout_type = data
+    create_vertex_buffer(LAYOUT, layout_type)._load_data_from_str(data_str)
+
+
+def create_loaded_vertex_buffer(params: dict[str, Any]) -> VertexBuffer:
+    data_str, _ = create_vertex_data_str(LAYOUT, params["layout_type"], params["num_verts"])
+    vertex_buffer = create_vertex_buffer(LAYOUT, params["layout_type"])
+    vertex_buffer._load_data_from_str(data_str)
+    return vertex_buffer
+
+
+MICRO_BENCHMARKS = (
+    *(
+        MicroBenchmark(
+            name=f"vertex_buffer_text_load_{layout_type.lower()}",
+            params=lambda scale, layout_type=layout_type: {
+                "num_verts": scaled(50_000, scale), "layout_type": layout_type
+            },
+            prepare=create_vertex_buffer_text,
+            stages={
+                "loadtxt": lambda data: np.loadtxt(io.StringIO(data[0]), dtype=data[1]),
+                "load_data_from_str": load_vertex_buffer_text,
+            },
+        )
+        for layout_type in ("GTAV1", "GTAV2")
+    ),
+    MicroBenchmark(
+        name="vertex_buffer_text_format",
+        params=lambda scale: {"num_verts": scaled(50_000, scale), "layout_type": "GTAV1"},
+        prepare=create_loaded_vertex_buffer,
+        stages={
+            "data_to_str": lambda vertex_buffer: vertex_buffer._data_to_str(),
+        },
+    ),
+    MicroBenchmark(
+        name="jenkhash_archetype_names",
+        params=lambda scale: {"num_names": scaled(100_000, scale), "num_archetypes": 10_000},
+        prepare=create_archetype_names,
+        stages={
+            "generate_data": lambda names: [jenkhash.GenerateData(name.lower().encode("utf-8")) for name in names],
+            "generate": hash_names_generate,
+            "hash_many": jenkhash.hash_many,
+        },
+    ),
+)
+
+
+def clear_blend_data():
+    """Removes all objects and the data-blocks they used."""
+    bpy.data.batch_remove(list(bpy.data.objects))
+    bpy.data.orphans_purge(do_recursive=True)
+
+
+@contextmanager
+def override_import_settings(values: Optional[dict[str, Any]]):
+    """Temporarily changes the import settings, restoring the previous values afterwards. The changes are not saved
+    to the user preferences file.
+    """
+    import_settings = get_import_settings()
+    prev_values = {name: getattr(import_settings, name) for name in (values or {})}
+    with suspend_preferences_saving():
+        try:
+            for name, value in (values or {}).items():
+                setattr(import_settings, name, value)
+            yield
+        finally:
+            for name, value in prev_values.items():
+                setattr(import_settings, name, value)
+
+
+@contextmanager
+def timed(times: dict[str, list[float]], stage: str):
+    start = time.perf_counter()
+    yield
+    times.setdefault(stage, []).append(time.perf_counter() - start)
+
+
+def run_benchmark(benchmark: Benchmark, scale: float, repeat: int, tmp_dir: Path) -> dict[str, Any]:
+    params = benchmark.params(scale)
+    input_path = tmp_dir.joinpath(f"{benchmark.name}{benchmark.file_ext}")
+    output_path = tmp_dir.joinpath(f"{benchmark.name}_out{benchmark.file_ext}")
+
+    clear_blend_data()
+    start = time.perf_counter()
+    benchmark.generate(input_path, params)
+    generate_time = time.perf_counter() - start
+    clear_blend_data()
+
+    times = {}
+    with override_import_settings(benchmark.import_settings):
+        for _ in range(repeat):
+            if benchmark.setup is not None:
+                benchmark.setup(params)
+
+            with timed(times, "parse"):
+                xml = benchmark.parse(input_path)
+            with timed(times, "build"):
+                obj = benchmark.build(xml, input_path)
+            with timed(times, "gather"):
+                out_xml = benchmark.gather(obj)
+            with timed(times, "serialize"):
+                out_xml.write_xml(str(output_path))
+
+            clear_blend_data()
+
+    return {
+        "name": benchmark.name,
+        "params": params,
+        "input_size": input_path.stat().st_size,
+        "output_size": output_path.stat().st_size,
+        "generate": generate_time,
+        "stages": {
+            stage: {
+                "min": min(times[stage]),
+                "median": statistics.median(times[stage]),
+                "times": times[stage],
+            }
+            for stage in STAGES
+        },
+        "total": sum(min(times[stage]) for stage in STAGES),
+    }
+
+
+def run_micro_benchmark(benchmark: MicroBenchmark, scale: float, repeat: int) -> dict[str, Any]:
+    params = benchmark.params(scale)
+    data = benchmark.prepare(params)
+
+    times = {}
+    for _ in range(repeat):
+        for stage, func in benchmark.stages.items():
+            with timed(times, stage):
+                func(data)
+
+    return {
+        "name": benchmark.name,
+        "params": params,
+        "stages": {
+            stage: {
+                "min": min(times[stage]),
+                "median": statistics.median(times[stage]),
+                "times": times[stage],
+            }
+            for stage in benchmark.stages
+        },
+    }
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(output_path: Path, tmp_dir: Path, scale: float = 1.0, repeat: int = 1,
+                   names: Optional[list[str]] = None) -> dict[str, Any]:
+    """Runs the benchmarks (all of them or the ones which name contains any of ``names``) and writes the results to
+    ``output_path`` as JSON.
+    """
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    results = {
+        "commit": get_git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "blender_version": bpy.app.version_string,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "repeat": repeat,
+        "benchmarks": [],
+    }
+
+    for benchmark in BENCHMARKS:
+        if names and not any(name in benchmark.name for name in names):
+            continue
+
+        print(f"Running benchmark '{benchmark.name}'...", flush=True)
+        result = run_benchmark(benchmark, scale, repeat, tmp_dir)
+        results["benchmarks"].append(result)
+
+        stages_str = ", ".join(f"{stage} {result['stages'][stage]['min']:.3f}s" for stage in STAGES)
+        print(f"  {stages_str} (total {result['total']:.3f}s)", flush=True)
+
+    for benchmark in MICRO_BENCHMARKS:
+        if names and not any(name in benchmark.name for name in names):
+            continue
+
+        print(f"Running micro-benchmark '{benchmark.name}'...", flush=True)
+        result = run_micro_benchmark(benchmark, scale, repeat)
+        results["benchmarks"].append(result)
+
+        stages_str = ", ".join(f"{stage} {times['min']:.3f}s" for stage, times in result["stages"].items())
+        print(f"  {stages_str}", flush=True)
+
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"Benchmark results written to '{output_path}'", file=sys.stderr)
+    return results
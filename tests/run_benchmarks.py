@@ -0,0 +1,65 @@
+"""Runs the import/export benchmarks and micro-benchmarks in ``benchmarks.py``.
+
+Usage:
+
+    blender --background --factory-startup --python tests/run_benchmarks.py -- [options]
+
+Options:
+    --output PATH     JSON file to write the results to (default: benchmark_results.json)
+    --tmp-dir PATH    Directory for the generated and exported assets (default: a new temporary directory)
+    --scale FACTOR    Multiplies the size of the generated assets (default: 1.0)
+    --repeat N        Number of times each benchmark is run, the results include every time (default: 1)
+    --filter NAME     Only run the benchmarks which name contains NAME, can be specified multiple times
+
+The add-on is enabled from this repository if it is not already enabled.
+"""
+import argparse
+import importlib
+import sys
+import tempfile
+from pathlib import Path
+
+import addon_utils
+import bpy
+
+ADDON_DIR = Path(__file__).resolve().parent.parent
+
+
+def get_addon_package_name() -> str:
+    """Gets the package name of the add-on in this repository, enabling it if needed."""
+    # Already enabled, maybe as an extension with a different package name
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if module_file is not None and Path(module_file).resolve() == ADDON_DIR.joinpath("__init__.py"):
+            if hasattr(bpy.types.Object, "sollum_type"):
+                return name
+
+    sys.path.insert(0, str(ADDON_DIR.parent))
+    if addon_utils.enable(ADDON_DIR.name, default_set=True) is None:
+        raise RuntimeError(f"Failed to enable the add-on '{ADDON_DIR.name}' from '{ADDON_DIR}'")
+
+    return ADDON_DIR.name
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="run_benchmarks.py")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--tmp-dir", type=Path, default=None)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--filter", action="append", default=[])
+    return parser.parse_args(argv)
+
+
+def main():
+    # Blender passes the arguments after `--` to the script
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+
+    benchmarks = importlib.import_module(f"{get_addon_package_name()}.tests.benchmarks")
+    tmp_dir = args.tmp_dir or Path(tempfile.mkdtemp(prefix="sollumz_benchmarks_"))
+    benchmarks.run_benchmarks(args.output, tmp_dir, scale=args.scale, repeat=args.repeat, names=args.filter)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import os
+import shutil
+import numpy as np
+from numpy.testing import assert_array_equal
+from pathlib import Path
+from ..cwxml.asset_cache import ParsedAssetCache, GRAPH_FILE_NAME, use_parsed_asset_cache
+from ..cwxml.drawable import YDR
+from .shared import asset_path
+
+
+class CountingParser:
+    """Parses a text file of numbers into an array big enough to be stored as a ``.npy`` file."""
+
+    def __init__(self):
+        self.num_calls = 0
+
+    def __call__(self, filepath: str) -> dict:
+        self.num_calls += 1
+        with open(filepath, "r") as f:
+            values = [float(v) for v in f.read().split()]
+        return {"values": np.repeat(np.array(values, dtype=np.float64), 1000), "name": Path(filepath).name}
+
+
+def write_numbers_file(path: Path, values: list[float]):
+    path.write_text(" ".join(map(str, values)))
+
+
+def get_entry_dirs(cache_dir: Path) -> list[Path]:
+    return [p for p in cache_dir.iterdir() if p.is_dir()]
+
+
+def test_cache_hit_skips_parsing(tmp_path: Path):
+    src = tmp_path.joinpath("a.txt")
+    write_numbers_file(src, [1.0, 2.0, 3.0])
+    cache = ParsedAssetCache(str(tmp_path.joinpath("cache")), 1024 * 1024 * 1024)
+    parse = CountingParser()
+
+    first = cache.load(str(src), parse, "numbers")
+    second = cache.load(str(src), parse, "numbers")
+
+    assert parse.num_calls == 1
+    assert (cache.num_hits, cache.num_misses) == (1, 1)
+    assert second["name"] == "a.txt"
+    assert_array_equal(second["values"], first["values"])
+    assert isinstance(second["values"], np.memmap)
+
+
+def test_cache_hit_from_xml_file(tmp_path: Path):
+    src = str(asset_path("sollumz_cube.ydr.xml"))
+    cache = ParsedAssetCache(str(tmp_path.joinpath("cache")), 1024 * 1024 * 1024)
+
+    with use_parsed_asset_cache(cache):
+        first = YDR.from_xml_file(src)
+        second = YDR.from_xml_file(src)
+
+    assert (cache.num_hits, cache.num_misses) == (1, 1)
+    assert second.name == first.name
+    first_geoms = first.drawable_models_high[0].geometries
+    second_geoms = second.drawable_models_high[0].geometries
+    assert_array_equal(second_geoms[0].vertex_buffer.data, first_geoms[0].vertex_buffer.data)
+    assert_array_equal(second_geoms[0].index_buffer.data, first_geoms[0].index_buffer.data)
+
+
+def test_cache_miss_after_file_is_modified(tmp_path: Path):
+    src = tmp_path.joinpath("a.txt")
+    write_numbers_file(src, [1.0, 2.0, 3.0])
+    cache = ParsedAssetCache(str(tmp_path.joinpath("cache")), 1024 * 1024 * 1024)
+    parse = CountingParser()
+    cache.load(str(src), parse, "numbers")
+
+    write_numbers_file(src, [4.0, 5.0])
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    result = cache.load(str(src), parse, "numbers")
+
+    assert parse.num_calls == 2
+    assert_array_equal(np.unique(result["values"]), [4.0, 5.0])
+
+
+def test_cache_evicts_least_recently_used_over_max_size(tmp_path: Path):
+    cache_dir = tmp_path.joinpath("cache")
+    srcs = [tmp_path.joinpath(f"{i}.txt") for i in range(3)]
+    for i, src in enumerate(srcs):
+        write_numbers_file(src, [float(i)] * 10)
+
+    # Room for two entries of 10 * 1000 float64 values, plus some slack for the pickle
+    cache = ParsedAssetCache(str(cache_dir), 2 * 80_000 + 4096)
+    parse = CountingParser()
+    for i, src in enumerate(srcs[:2]):
+        cache.load(str(src), parse, "numbers")
+        entry_dir = cache_dir.joinpath(cache.entry_key(str(src), "numbers"))
+        os.utime(entry_dir, ns=(i * 1_000_000_000, i * 1_000_000_000))
+
+    # Using the first entry again makes the second one the least recently used
+    cache.load(str(srcs[0]), parse, "numbers")
+    cache.load(str(srcs[2]), parse, "numbers")
+
+    entry_names = {p.name for p in get_entry_dirs(cache_dir)}
+    assert entry_names == {cache.entry_key(str(srcs[0]), "numbers"), cache.entry_key(str(srcs[2]), "numbers")}
+
+
+def test_cache_recovers_from_truncated_entry(tmp_path: Path):
+    src = tmp_path.joinpath("a.txt")
+    write_numbers_file(src, [1.0, 2.0, 3.0])
+    cache_dir = tmp_path.joinpath("cache")
+    cache = ParsedAssetCache(str(cache_dir), 1024 * 1024 * 1024)
+    parse = CountingParser()
+    expected = cache.load(str(src), parse, "numbers")
+
+    graph_path = cache_dir.joinpath(cache.entry_key(str(src), "numbers"), GRAPH_FILE_NAME)
+    graph_path.write_bytes(graph_path.read_bytes()[:10])
+    result = cache.load(str(src), parse, "numbers")
+
+    assert parse.num_calls == 2
+    assert_array_equal(result["values"], expected["values"])
+
+    # The entry is written again and usable
+    assert_array_equal(cache.load(str(src), parse, "numbers")["values"], expected["values"])
+    assert parse.num_calls == 2
+
+
+def test_cache_clear(tmp_path: Path):
+    src = tmp_path.joinpath("a.txt")
+    write_numbers_file(src, [1.0])
+    cache_dir = tmp_path.joinpath("cache")
+    cache = ParsedAssetCache(str(cache_dir), 1024 * 1024 * 1024)
+    cache.load(str(src), CountingParser(), "numbers")
+    assert len(get_entry_dirs(cache_dir)) == 1
+
+    cache.clear()
+
+    assert get_entry_dirs(cache_dir) == []
+    shutil.rmtree(cache_dir)
+    cache.clear()  # no error without the cache directory
@@ -0,0 +1,46 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from ..ybn.ybnimport import get_bound_geom_mesh_data
+
+
+def get_bound_geom_mesh_data_reference(vertices: np.ndarray, tri_inds: np.ndarray):
+    verts = []
+    verts_dict = {}
+    faces = []
+    for tri in tri_inds.tolist():
+        face = []
+        for v in tri:
+            v_tuple = tuple(vertices[v].tolist())
+            if v_tuple not in verts_dict:
+                verts_dict[v_tuple] = len(verts)
+                verts.append(v_tuple)
+            face.append(verts_dict[v_tuple])
+        faces.append(face)
+    return np.array(verts, dtype=np.float32).reshape((-1, 3)), np.array(faces, dtype=np.int32).reshape((-1, 3))
+
+
+def test_get_bound_geom_mesh_data_merges_vertices():
+    rng = np.random.default_rng(1234)
+    # Small grid of positions so many vertices end up at the same position
+    vertices = rng.integers(0, 8, (2000, 3)).astype(np.float32) * 0.5
+    vertices[0] = (-0.0, 0.0, 0.0)
+    vertices[1] = (0.0, 0.0, 0.0)
+    tri_inds = rng.integers(0, len(vertices), (5000, 3)).astype(np.uint32)
+    tri_inds[0] = (0, 1, 2)
+    vertex_colors = rng.integers(0, 256, (len(vertices), 4)).astype(np.uint8)
+
+    verts, faces, colors = get_bound_geom_mesh_data(vertices, tri_inds, vertex_colors)
+
+    expected_verts, expected_faces = get_bound_geom_mesh_data_reference(vertices, tri_inds)
+    assert_array_equal(verts, expected_verts)
+    assert_array_equal(faces, expected_faces)
+    assert_allclose(colors, vertex_colors[tri_inds.ravel()] / 255, rtol=1e-6)
+
+
+def test_get_bound_geom_mesh_data_no_triangles():
+    vertices = np.zeros((4, 3), dtype=np.float32)
+    verts, faces, colors = get_bound_geom_mesh_data(vertices, np.empty((0, 3), dtype=np.uint32), None)
+
+    assert verts.shape == (0, 3)
+    assert faces.shape == (0, 3)
+    assert colors is None
@@ -0,0 +1,46 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from ..cwxml.drawable import VertexBuffer
+from ..ydr.buffer_join import join_ind_arrs, join_vert_arrs
+
+
+def create_vert_arr(num_verts: int, attr_names: list[str], value: int) -> np.ndarray:
+    vert_arr = np.zeros(num_verts, dtype=[VertexBuffer.VERT_ATTR_DTYPES[name] for name in attr_names])
+    for name in attr_names:
+        vert_arr[name] = value
+    return vert_arr
+
+
+def test_join_vert_arrs_with_different_layouts():
+    vert_arrs = [
+        create_vert_arr(3, ["Position", "Normal"], 1),
+        create_vert_arr(2, ["TexCoord0", "Position"], 2),
+        create_vert_arr(4, ["Colour0", "Position", "Normal"], 3),
+    ]
+
+    joined_arr = join_vert_arrs(vert_arrs)
+
+    assert joined_arr.dtype.names == ("Position", "Normal", "Colour0", "TexCoord0")
+    assert_array_equal(joined_arr["Position"][:, 0], [1, 1, 1, 2, 2, 3, 3, 3, 3])
+    assert_array_equal(joined_arr["Normal"][:, 0], [1, 1, 1, 0, 0, 3, 3, 3, 3])
+    assert_array_equal(joined_arr["Colour0"][:, 0], [0, 0, 0, 0, 0, 3, 3, 3, 3])
+    assert_array_equal(joined_arr["TexCoord0"][:, 0], [0, 0, 0, 2, 2, 0, 0, 0, 0])
+
+
+def test_join_ind_arrs_offsets_indices():
+    ind_arrs = [np.array([0, 1, 2], dtype=np.uint32), np.array([1, 0, 2, 2, 1, 3], dtype=np.uint32), np.array([0, 1, 2], dtype=np.uint32)]
+    vert_counts = [3, 4, 3]
+
+    joined_arr = join_ind_arrs(ind_arrs, vert_counts)
+
+    assert joined_arr.dtype == np.uint32
+    assert_array_equal(joined_arr, [0, 1, 2, 4, 3, 5, 5, 4, 6, 7, 8, 9])
+
+
+def test_join_ind_arrs_many_arrays():
+    num_arrs = 500
+    ind_arrs = [np.array([0, 1, 2], dtype=np.uint32)] * num_arrs
+
+    joined_arr = join_ind_arrs(ind_arrs, [3] * num_arrs)
+
+    assert_array_equal(joined_arr, np.arange(num_arrs * 3))
@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+from numpy.testing import assert_array_equal
+from ..ydr.buffer_split import split_vert_buffers, get_triangle_chunks
+
+
+def create_grid_buffers(size: int, shuffle: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """Creates a grid of ``size`` x ``size`` quads. With ``shuffle`` the triangles are in random order."""
+    xs, ys = np.meshgrid(np.arange(size + 1), np.arange(size + 1), indexing="ij")
+    vert_buffer = np.zeros((size + 1) ** 2, dtype=[("Position", np.float32, 3), ("Colour0", np.uint8, 4)])
+    vert_buffer["Position"][:, 0] = xs.reshape(-1)
+    vert_buffer["Position"][:, 1] = ys.reshape(-1)
+    vert_buffer["Colour0"][:, 0] = xs.reshape(-1) % 256
+    vert_buffer["Colour0"][:, 1] = ys.reshape(-1) % 256
+
+    corners = (np.arange(size)[:, None] * (size + 1) + np.arange(size)[None, :]).reshape(-1)
+    quads = np.stack((corners, corners + size + 1, corners + size + 2, corners + 1), axis=1)
+    faces = np.concatenate((quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]))
+    if shuffle:
+        faces = np.random.default_rng(1).permutation(faces)
+    return vert_buffer, faces.reshape(-1).astype(np.uint32)
+
+
+def get_triangles(vert_buffers, ind_buffers) -> set:
+    """Gets the triangles of the buffers as sets of positions, to compare them independently of vertex order."""
+    return {
+        tuple(map(tuple, vert_buffer["Position"][face]))
+        for vert_buffer, ind_buffer in zip(vert_buffers, ind_buffers)
+        for face in ind_buffer.reshape((-1, 3))
+    }
+
+
+def test_split_vert_buffers_returns_small_buffers_as_is():
+    vert_buffer, ind_buffer = create_grid_buffers(4)
+    vert_buffers, ind_buffers = split_vert_buffers(vert_buffer, ind_buffer, max_verts=100)
+
+    assert len(vert_buffers) == 1
+    assert vert_buffers[0] is vert_buffer
+    assert ind_buffers[0] is ind_buffer
+
+
+@pytest.mark.parametrize("spatial", (False, True))
+@pytest.mark.parametrize("shuffle", (False, True))
+def test_split_vert_buffers_keeps_whole_triangles(spatial: bool, shuffle: bool):
+    vert_buffer, ind_buffer = create_grid_buffers(40, shuffle)
+    max_verts = 200
+    vert_buffers, ind_buffers = split_vert_buffers(vert_buffer, ind_buffer, max_verts=max_verts, spatial=spatial)
+
+    assert len(vert_buffers) > 1
+    assert sum(len(i) for i in ind_buffers) == len(ind_buffer)
+    for chunk_verts, chunk_inds in zip(vert_buffers, ind_buffers):
+        assert len(chunk_verts) <= max_verts
+        assert chunk_inds.dtype == np.uint32
+        assert len(chunk_inds) % 3 == 0
+        # Every vertex is used and the vertex data is kept
+        assert_array_equal(np.unique(chunk_inds), np.arange(len(chunk_verts)))
+        assert_array_equal(chunk_verts["Colour0"][:, :2], chunk_verts["Position"][:, :2] % 256)
+
+    assert get_triangles(vert_buffers, ind_buffers) == get_triangles((vert_buffer,), (ind_buffer,))
+
+
+def test_triangle_chunks_are_filled_in_order():
+    vert_buffer, ind_buffer = create_grid_buffers(40)
+    faces = ind_buffer.reshape((-1, 3))
+    max_verts = 200
+    chunks = get_triangle_chunks(faces, len(vert_buffer), max_verts)
+
+    assert_array_equal(np.concatenate(chunks), np.arange(len(faces)))
+    for chunk, next_chunk in zip(chunks, chunks[1:]):
+        # Each chunk is as large as possible
+        assert len(np.unique(faces[chunk])) <= max_verts
+        assert len(np.unique(faces[np.append(chunk, next_chunk[0])])) > max_verts
+
+
+def test_split_vert_buffers_spatial_duplicates_fewer_vertices():
+    vert_buffer, ind_buffer = create_grid_buffers(60, shuffle=True)
+    in_order, _ = split_vert_buffers(vert_buffer, ind_buffer, max_verts=500, spatial=False)
+    spatial, _ = split_vert_buffers(vert_buffer, ind_buffer, max_verts=500, spatial=True)
+
+    assert sum(len(v) for v in spatial) < sum(len(v) for v in in_order) * 0.5
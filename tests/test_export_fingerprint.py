@@ -0,0 +1,62 @@
+import bpy
+import pytest
+from ..shared.shader_nodes import SzShaderNodeParameter
+from ..tools.exportfingerprint import ExportFingerprinter
+from ..ydr.shader_materials import create_shader
+from .benchmarks import clear_blend_data, create_grid_mesh, create_model_obj
+
+
+@pytest.fixture
+def model_obj():
+    clear_blend_data()
+    mesh = create_grid_mesh("fingerprint.grid", 2.0, 4)
+    obj = create_model_obj("fingerprint.model", mesh, [create_shader("default.sps")])
+    yield obj
+    clear_blend_data()
+
+
+def get_fingerprint(obj: bpy.types.Object) -> str:
+    # New fingerprinter each time, it caches the digests of the data-blocks
+    return ExportFingerprinter().get_object_fingerprint(obj)
+
+
+def move_vertex(obj: bpy.types.Object):
+    obj.data.vertices[0].co.z += 0.5
+
+
+def change_material_parameter(obj: bpy.types.Object):
+    node = next(n for n in obj.active_material.node_tree.nodes if isinstance(n, SzShaderNodeParameter))
+    node.set(0, node.get(0) + 1.0)
+
+
+def move_object(obj: bpy.types.Object):
+    obj.location.x += 1.0
+    bpy.context.view_layer.update()
+
+
+def set_custom_property(obj: bpy.types.Object):
+    obj["fingerprint_test"] = 1
+
+
+def test_export_fingerprint_is_stable(model_obj):
+    assert get_fingerprint(model_obj) == get_fingerprint(model_obj)
+
+
+@pytest.mark.parametrize("edit", (move_vertex, change_material_parameter, move_object, set_custom_property))
+def test_export_fingerprint_changes_on_edit(model_obj, edit):
+    fingerprint = get_fingerprint(model_obj)
+
+    edit(model_obj)
+
+    assert get_fingerprint(model_obj) != fingerprint
+
+
+def test_export_fingerprint_ignores_selection(model_obj):
+    fingerprint = get_fingerprint(model_obj)
+
+    model_obj.select_set(not model_obj.select_get())
+    mesh = model_obj.data
+    mesh.vertices.foreach_set("select", [i % 2 == 0 for i in range(len(mesh.vertices))])
+    mesh.polygons[0].select = True
+
+    assert get_fingerprint(model_obj) == fingerprint
@@ -0,0 +1,50 @@
+from ..tools.exportmanifest import ExportManifest, MANIFEST_FILE_NAME
+
+
+def create_exported_file(directory, name: str) -> str:
+    filepath = directory.joinpath(name)
+    filepath.write_text("<xml/>")
+    return str(filepath)
+
+
+def test_export_manifest_roundtrip(tmp_path):
+    filepath = create_exported_file(tmp_path, "prop.ydr.xml")
+    manifest = ExportManifest.load(str(tmp_path), "1.0.0", "settings")
+    assert not manifest.is_up_to_date(filepath, "abc")
+
+    manifest.update(filepath, "abc")
+    manifest.save()
+
+    manifest = ExportManifest.load(str(tmp_path), "1.0.0", "settings")
+    assert manifest.is_up_to_date(filepath, "abc")
+    assert not manifest.is_up_to_date(filepath, "def")
+
+
+def test_export_manifest_requires_exported_file(tmp_path):
+    filepath = create_exported_file(tmp_path, "prop.ydr.xml")
+    manifest = ExportManifest.load(str(tmp_path), "1.0.0", "settings")
+    manifest.update(filepath, "abc")
+
+    tmp_path.joinpath("prop.ydr.xml").unlink()
+
+    assert not manifest.is_up_to_date(filepath, "abc")
+
+
+def test_export_manifest_discarded_on_version_or_settings_change(tmp_path):
+    filepath = create_exported_file(tmp_path, "prop.ydr.xml")
+    manifest = ExportManifest.load(str(tmp_path), "1.0.0", "settings")
+    manifest.update(filepath, "abc")
+    manifest.save()
+
+    assert not ExportManifest.load(str(tmp_path), "1.1.0", "settings").is_up_to_date(filepath, "abc")
+    assert not ExportManifest.load(str(tmp_path), "1.0.0", "other settings").is_up_to_date(filepath, "abc")
+
+
+def test_export_manifest_ignores_invalid_file(tmp_path):
+    filepath = create_exported_file(tmp_path, "prop.ydr.xml")
+    tmp_path.joinpath(MANIFEST_FILE_NAME).write_text("{ not json")
+
+    manifest = ExportManifest.load(str(tmp_path), "1.0.0", "settings")
+
+    assert manifest.fingerprints == {}
+    assert not manifest.is_up_to_date(filepath, "abc")
@@ -0,0 +1,107 @@
+import bpy
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from ..tools.fcurvesampler import (
+    evaluate_keyframes,
+    sample_fcurve,
+    INTERPOLATION_CONSTANT,
+    INTERPOLATION_LINEAR,
+    INTERPOLATION_BEZIER,
+)
+
+
+def create_keyframes(num_keys: int, seed: int = 1234) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gets random keyframes with handles similar to the ones Blender creates (a third of the segment length)."""
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.uniform(1.0, 5.0, num_keys))
+    y = rng.uniform(-3.0, 3.0, num_keys)
+    handle_len = np.diff(x, prepend=x[0] - 3.0, append=x[-1] + 3.0) / 3.0
+    co = np.stack((x, y), axis=1).astype(np.float32)
+    handle_left = np.stack((x - handle_len[:-1], y + rng.uniform(-1.0, 1.0, num_keys)), axis=1).astype(np.float32)
+    handle_right = np.stack((x + handle_len[1:], y + rng.uniform(-1.0, 1.0, num_keys)), axis=1).astype(np.float32)
+    return co, handle_left, handle_right
+
+
+def test_evaluate_keyframes_constant_and_linear():
+    co = np.array([[0.0, 0.0], [10.0, 10.0], [20.0, 0.0]], dtype=np.float32)
+    frames = np.array([-5.0, 0.0, 5.0, 10.0, 15.0, 20.0, 25.0])
+
+    interpolation = np.full(3, INTERPOLATION_CONSTANT, dtype=np.int32)
+    assert_array_equal(evaluate_keyframes(co, co, co, interpolation, frames), [0, 0, 0, 10, 10, 0, 0])
+
+    interpolation = np.full(3, INTERPOLATION_LINEAR, dtype=np.int32)
+    assert_array_equal(evaluate_keyframes(co, co, co, interpolation, frames), [0, 0, 5, 10, 5, 0, 0])
+
+
+def test_evaluate_keyframes_bezier_with_straight_handles_is_linear():
+    co = np.array([[0.0, 0.0], [9.0, 9.0], [18.0, 0.0]], dtype=np.float32)
+    handle_left = np.array([[-3.0, 0.0], [6.0, 6.0], [15.0, 3.0]], dtype=np.float32)
+    handle_right = np.array([[3.0, 3.0], [12.0, 6.0], [21.0, 0.0]], dtype=np.float32)
+    frames = np.linspace(-2.0, 20.0, 100)
+
+    bezier = evaluate_keyframes(co, handle_left, handle_right, np.full(3, INTERPOLATION_BEZIER, np.int32), frames)
+    linear = evaluate_keyframes(co, handle_left, handle_right, np.full(3, INTERPOLATION_LINEAR, np.int32), frames)
+    assert_allclose(bezier, linear, atol=1e-5)
+
+
+def test_evaluate_keyframes_bezier_flat_segment_is_exact():
+    co = np.array([[0.0, 0.1], [10.0, 0.1]], dtype=np.float32)
+    handles = np.array([[-3.0, 0.1], [13.0, 0.1]], dtype=np.float32)
+    values = evaluate_keyframes(co, handles, handles, np.full(2, INTERPOLATION_BEZIER, np.int32), np.linspace(0, 10))
+    assert np.all(values == np.float32(0.1))
+
+
+def test_evaluate_keyframes_bezier_long_handles_are_clamped():
+    co = np.array([[0.0, 0.0], [10.0, 1.0]], dtype=np.float32)
+    interpolation = np.full(2, INTERPOLATION_BEZIER, np.int32)
+    frames = np.linspace(0.0, 10.0, 50)
+
+    # Handles going past the other keyframe are scaled down to end at its frame
+    long_handle_right = np.array([[20.0, 2.0], [0.0, 0.0]], dtype=np.float32)
+    long_handle_left = np.array([[0.0, 0.0], [-10.0, 3.0]], dtype=np.float32)
+    handle_right = np.array([[10.0, 1.0], [0.0, 0.0]], dtype=np.float32)
+    handle_left = np.array([[0.0, 0.0], [0.0, 2.0]], dtype=np.float32)
+
+    expected = evaluate_keyframes(co, handle_left, handle_right, interpolation, frames)
+    assert_allclose(evaluate_keyframes(co, long_handle_left, long_handle_right, interpolation, frames), expected)
+
+
+@pytest.fixture
+def fcurve():
+    action = bpy.data.actions.new("test_fcurve_sampler")
+    yield action.fcurves.new("location", index=0)
+    bpy.data.actions.remove(action)
+
+
+def set_fcurve_keyframes(fcurve: bpy.types.FCurve, num_keys: int, interpolation: str):
+    co, handle_left, handle_right = create_keyframes(num_keys)
+    keyframe_points = fcurve.keyframe_points
+    keyframe_points.add(num_keys)
+    keyframe_points.foreach_set("co", co.ravel())
+    for keyframe_point in keyframe_points:
+        keyframe_point.interpolation = interpolation
+        keyframe_point.handle_left_type = "FREE"
+        keyframe_point.handle_right_type = "FREE"
+    keyframe_points.foreach_set("handle_left", handle_left.ravel())
+    keyframe_points.foreach_set("handle_right", handle_right.ravel())
+
+
+@pytest.mark.parametrize("interpolation", ("CONSTANT", "LINEAR", "BEZIER", "SINE"))
+@pytest.mark.parametrize("num_frames", (50, 2000))
+def test_sample_fcurve_matches_evaluate(fcurve: bpy.types.FCurve, interpolation: str, num_frames: int):
+    set_fcurve_keyframes(fcurve, 50, interpolation)
+    first_frame, last_frame = fcurve.keyframe_points[0].co.x, fcurve.keyframe_points[-1].co.x
+    frames = np.linspace(first_frame - 10.0, last_frame + 10.0, num_frames)
+
+    expected = [fcurve.evaluate(frame) for frame in frames]
+    assert_allclose(sample_fcurve(fcurve, frames), expected, atol=1e-4)
+
+
+def test_sample_fcurve_with_modifiers_matches_evaluate(fcurve: bpy.types.FCurve):
+    set_fcurve_keyframes(fcurve, 10, "BEZIER")
+    fcurve.modifiers.new("NOISE")
+    frames = np.linspace(0.0, 50.0, 200)
+
+    expected = [fcurve.evaluate(frame) for frame in frames]
+    assert_allclose(sample_fcurve(fcurve, frames), expected, atol=1e-4)
@@ -0,0 +1,51 @@
+import pytest
+from ..tools import jenkhash
+
+
+@pytest.mark.parametrize("name, expected", (
+    ("default.sps", 0x18AD1594),
+    ("DEFAULT.sps", 0x18AD1594),
+    ("terrain_cb_4lyr.sps", 0xC8D15397),
+))
+def test_generate(name: str, expected: int):
+    assert jenkhash.Generate(name) == expected
+
+
+@pytest.mark.parametrize("seed", (0, 0x1234ABCD))
+def test_hash_many_matches_generate(seed: int):
+    names = ["default.sps", "", "a", "TERRAIN_cb_4lyr.sps", "prop_bench_01a", "a" * 100]
+    expected = [jenkhash.GenerateData(name.lower().encode("utf-8"), seed) for name in names]
+    assert jenkhash.hash_many(names, seed=seed).tolist() == expected
+
+
+def test_hash_many_empty():
+    assert len(jenkhash.hash_many([])) == 0
+
+
+@pytest.mark.parametrize("name, expected", (
+    ("hash_0BADF00D", 0x0BADF00D),
+    ("default.sps", 0x18AD1594),
+))
+def test_name_to_hash(name: str, expected: int):
+    assert jenkhash.name_to_hash(name) == expected
+
+
+def test_hash_to_name():
+    jenkhash.register_names(["prop_bench_01a", "hash_0000ABCD"])
+    jenkhash.name_to_hash("prop_test_name")
+
+    assert jenkhash.hash_to_name(jenkhash.Generate("prop_bench_01a")) == "prop_bench_01a"
+    assert jenkhash.hash_to_name(jenkhash.Generate("prop_test_name")) == "prop_test_name"
+    assert jenkhash.hash_to_name(0x0000ABCD) == "hash_0000ABCD"
+    assert jenkhash.name_to_hash(jenkhash.hash_to_name(0x12345678)) == 0x12345678
+
+
+def test_hash_to_name_is_bounded(monkeypatch):
+    monkeypatch.setattr(jenkhash, "KNOWN_NAMES_MAX_SIZE", 4)
+    monkeypatch.setattr(jenkhash, "_known_names", jenkhash.OrderedDict())
+    names = [f"name_{i}" for i in range(6)]
+    jenkhash.register_names(names)
+
+    assert len(jenkhash._known_names) == 4
+    assert jenkhash.hash_to_name(jenkhash.Generate("name_0")).startswith("hash_")
+    assert jenkhash.hash_to_name(jenkhash.Generate("name_5")) == "name_5"
@@ -0,0 +1,203 @@
+import copy
+import bpy
+import pytest
+from ..lods import LODLevelProps, evict_lazy_lod_meshes, on_load_post, on_save_pre
+from ..sollumz_preferences import get_import_settings, suspend_preferences_saving
+from ..sollumz_properties import LODLevel, SollumType
+from ..ydr.shader_materials import create_shader
+from ..ydr.ydrexport import create_drawable_xml
+from ..ydr.ydrimport import create_drawable_obj
+from .benchmarks import clear_blend_data, create_grid_mesh, create_model_obj
+from .test_ydr_shared_meshes import create_skinned_drawable_xml, get_model_objs
+
+
+@pytest.fixture
+def clean_blend_data():
+    clear_blend_data()
+    on_load_post()
+    yield
+    clear_blend_data()
+    on_load_post()
+
+
+@pytest.fixture
+def lazy_lod_meshes_import():
+    import_settings = get_import_settings()
+    prev_lazy_lod_meshes = import_settings.lazy_lod_meshes
+    with suspend_preferences_saving():
+        import_settings.lazy_lod_meshes = True
+        yield
+        import_settings.lazy_lod_meshes = prev_lazy_lod_meshes
+
+
+class LazyGridBuilder:
+    """Builds grid meshes for lazy LODs, counting how many times each is built."""
+
+    def __init__(self):
+        self.num_builds = 0
+
+    def __call__(self, obj: bpy.types.Object) -> bpy.types.Mesh:
+        self.num_builds += 1
+        return create_grid_mesh(f"{obj.name}_lazy", 2.0, 4)
+
+
+def create_lazy_model_obj(name: str, lod_level: LODLevel = LODLevel.MEDIUM) -> tuple[bpy.types.Object, LazyGridBuilder]:
+    obj = create_model_obj(name, create_grid_mesh(f"{name}_high", 2.0, 3), [])
+    builder = LazyGridBuilder()
+    obj.sz_lods.get_lod(lod_level).set_lazy_mesh(f"{name}_lazy", builder)
+    return obj, builder
+
+
+def get_medium_lod(obj: bpy.types.Object) -> LODLevelProps:
+    return obj.sz_lods.get_lod(LODLevel.MEDIUM)
+
+
+def test_lazy_lod_mesh_is_built_on_switch(clean_blend_data):
+    obj, builder = create_lazy_model_obj("lazy_switch")
+    lod = get_medium_lod(obj)
+
+    assert lod.is_lazy_mesh_pending
+    assert lod.mesh_name == "lazy_switch_lazy"
+    assert builder.num_builds == 0
+
+    obj.sz_lods.active_lod_level = LODLevel.MEDIUM
+    assert builder.num_builds == 1
+    assert obj.data.name.startswith("lazy_switch_lazy")
+
+    obj.sz_lods.active_lod_level = LODLevel.HIGH
+    assert not lod.is_lazy_mesh_pending
+    assert lod.mesh is not None
+    assert builder.num_builds == 1
+
+
+def test_evict_lazy_lod_meshes_least_recently_used_first(clean_blend_data):
+    objs = [create_lazy_model_obj(f"lazy_lru{i}")[0] for i in range(3)]
+    for obj in (*objs, objs[0]):
+        assert get_medium_lod(obj).mesh is not None
+
+    evict_lazy_lod_meshes(1)
+
+    assert not get_medium_lod(objs[0]).is_lazy_mesh_pending
+    assert get_medium_lod(objs[1]).is_lazy_mesh_pending
+    assert get_medium_lod(objs[2]).is_lazy_mesh_pending
+
+
+def test_evict_lazy_lod_meshes_keeps_active_lod(clean_blend_data):
+    obj, builder = create_lazy_model_obj("lazy_active")
+    obj.sz_lods.active_lod_level = LODLevel.MEDIUM
+    active_mesh = obj.data
+
+    evict_lazy_lod_meshes(0)
+
+    assert obj.data == active_mesh
+    assert active_mesh.name in bpy.data.meshes
+    assert builder.num_builds == 1
+
+
+def test_lazy_lod_mesh_is_rebuilt_after_eviction(clean_blend_data):
+    obj, builder = create_lazy_model_obj("lazy_rebuild")
+    lod = get_medium_lod(obj)
+    built_mesh_name = lod.mesh.name
+
+    evict_lazy_lod_meshes(0)
+
+    assert lod.is_lazy_mesh_pending
+    assert built_mesh_name not in bpy.data.meshes
+    assert builder.num_builds == 1
+
+    obj.sz_lods.active_lod_level = LODLevel.MEDIUM
+    assert builder.num_builds == 2
+    assert len(obj.data.vertices) == 16
+
+
+def test_modified_lazy_lod_mesh_stops_being_lazy(clean_blend_data):
+    obj, builder = create_lazy_model_obj("lazy_modified")
+    lod = get_medium_lod(obj)
+    mesh = lod.mesh
+    mesh.vertices[0].co.z += 1.0
+
+    evict_lazy_lod_meshes(0)
+
+    assert lod.lazy_mesh_id == ""
+    assert lod.mesh == mesh
+    assert builder.num_builds == 1
+
+
+def set_render_mask(obj: bpy.types.Object):
+    obj.data.drawable_model_properties.render_mask = 1
+
+
+def add_vertex_weights(obj: bpy.types.Object):
+    obj.vertex_groups.new(name="bone").add([0, 1], 0.5, "REPLACE")
+
+
+@pytest.mark.parametrize("edit", (set_render_mask, add_vertex_weights))
+def test_edited_lazy_lod_mesh_stops_being_lazy(clean_blend_data, edit):
+    obj, builder = create_lazy_model_obj("lazy_edited")
+    lod = get_medium_lod(obj)
+    obj.sz_lods.active_lod_level = LODLevel.MEDIUM
+    mesh = obj.data
+    edit(obj)
+    obj.sz_lods.active_lod_level = LODLevel.HIGH
+
+    evict_lazy_lod_meshes(0)
+
+    assert lod.lazy_mesh_id == ""
+    assert lod.mesh == mesh
+    assert builder.num_builds == 1
+
+
+def test_selection_change_does_not_stop_lazy_lod_mesh(clean_blend_data):
+    obj, builder = create_lazy_model_obj("lazy_selection")
+    lod = get_medium_lod(obj)
+    mesh = lod.mesh
+    mesh.vertices.foreach_set("select", [i % 2 == 0 for i in range(len(mesh.vertices))])
+    mesh.polygons[0].select = True
+
+    evict_lazy_lod_meshes(0)
+
+    assert lod.lazy_mesh_id != ""
+    assert lod.is_lazy_mesh_pending
+
+
+def test_lazy_lod_meshes_are_built_before_save(clean_blend_data):
+    objs_and_builders = [create_lazy_model_obj(f"lazy_save{i}") for i in range(2)]
+
+    on_save_pre()
+
+    for obj, builder in objs_and_builders:
+        assert not get_medium_lod(obj).is_lazy_mesh_pending
+        assert get_medium_lod(obj).mesh_ref is not None
+        assert builder.num_builds == 1
+
+
+def test_import_switch_export_evict_rebuild_skinned_lods(clean_blend_data, lazy_lod_meshes_import):
+    drawable_xml = create_skinned_drawable_xml()
+    drawable_xml.drawable_models_high = drawable_xml.drawable_models_high[:1]
+    drawable_xml.drawable_models_med = copy.deepcopy(drawable_xml.drawable_models_high)
+    clear_blend_data()
+
+    drawable_obj = create_drawable_obj(drawable_xml, "lazy_skinned.ydr.xml")
+    model_obj = get_model_objs(drawable_obj)[0]
+    lod = get_medium_lod(model_obj)
+    assert lod.is_lazy_mesh_pending
+
+    # Switch, the mesh is built with its vertex weights
+    model_obj.sz_lods.active_lod_level = LODLevel.MEDIUM
+    medium_mesh = model_obj.data
+    assert len(medium_mesh.vertices) == len(model_obj.sz_lods.get_lod(LODLevel.HIGH).mesh.vertices)
+    assert all(len(vertex.groups) > 0 for vertex in medium_mesh.vertices)
+    model_obj.sz_lods.active_lod_level = LODLevel.HIGH
+
+    # Export
+    out_xml = create_drawable_xml(drawable_obj)
+    assert len(out_xml.drawable_models_med) == 1
+    assert out_xml.drawable_models_med[0].has_skin == 1
+
+    # Evict and rebuild
+    evict_lazy_lod_meshes(0)
+    assert lod.is_lazy_mesh_pending
+
+    model_obj.sz_lods.active_lod_level = LODLevel.MEDIUM
+    assert model_obj.data is not None
+    assert all(len(vertex.groups) > 0 for vertex in model_obj.data.vertices)
@@ -0,0 +1,100 @@
+import bpy
+import numpy as np
+import pytest
+from ..sollumz_properties import LODLevel
+from ..tools.meshcache import EvaluatedMeshCache
+from .benchmarks import clear_blend_data, create_grid_mesh, create_model_obj
+
+
+@pytest.fixture
+def clean_blend_data():
+    clear_blend_data()
+    yield
+    clear_blend_data()
+
+
+def get_positions(mesh: bpy.types.Mesh) -> np.ndarray:
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    return positions.reshape((-1, 3))
+
+
+def create_posed_skinned_obj() -> tuple[bpy.types.Object, bpy.types.Object]:
+    """Creates a grid skinned to a single bone, with the bone moved up in pose mode."""
+    armature = bpy.data.armatures.new("mesh_cache.skel")
+    armature_obj = bpy.data.objects.new("mesh_cache.skel", armature)
+    bpy.context.collection.objects.link(armature_obj)
+    bpy.context.view_layer.objects.active = armature_obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    edit_bone = armature.edit_bones.new("bone")
+    edit_bone.head = (0.0, 0.0, 0.0)
+    edit_bone.tail = (0.0, 0.05, 0.0)
+    bpy.ops.object.mode_set(mode="OBJECT")
+    armature_obj.pose.bones["bone"].location = (0.0, 0.0, 1.0)
+
+    mesh = create_grid_mesh("mesh_cache.grid", 2.0, 4)
+    obj = bpy.data.objects.new("mesh_cache.skinned", mesh)
+    bpy.context.collection.objects.link(obj)
+    obj.parent = armature_obj
+    obj.modifiers.new("Armature", "ARMATURE").object = armature_obj
+    obj.vertex_groups.new(name="bone").add(list(range(len(mesh.vertices))), 1.0, "ADD")
+    return obj, armature_obj
+
+
+def test_evaluated_mesh_cache_reuses_mesh(clean_blend_data):
+    obj = create_model_obj("mesh_cache.model", create_grid_mesh("mesh_cache.grid", 2.0, 4), [])
+    cache = EvaluatedMeshCache()
+
+    mesh = cache.get_mesh(obj)
+
+    assert cache.get_mesh(obj) == mesh
+    assert len(mesh.loop_triangles) == len(mesh.polygons)
+    cache.clear()
+
+
+def test_evaluated_mesh_cache_lod_switch_gets_other_mesh(clean_blend_data):
+    obj = create_model_obj("mesh_cache.model", create_grid_mesh("mesh_cache.high", 2.0, 4), [])
+    obj.sz_lods.get_lod(LODLevel.LOW).mesh = create_grid_mesh("mesh_cache.low", 2.0, 2)
+    cache = EvaluatedMeshCache()
+
+    high_mesh = cache.get_mesh(obj)
+    obj.sz_lods.active_lod_level = LODLevel.LOW
+    low_mesh = cache.get_mesh(obj)
+
+    assert low_mesh != high_mesh
+    assert len(high_mesh.vertices) == 16
+    assert len(low_mesh.vertices) == 4
+
+    obj.sz_lods.active_lod_level = LODLevel.HIGH
+    assert cache.get_mesh(obj) == high_mesh
+    cache.clear()
+
+
+def test_evaluated_mesh_cache_pose_position_change_gets_other_mesh(clean_blend_data):
+    obj, armature_obj = create_posed_skinned_obj()
+    cache = EvaluatedMeshCache()
+
+    armature_obj.data.pose_position = "POSE"
+    pose_mesh = cache.get_mesh(obj)
+    armature_obj.data.pose_position = "REST"
+    rest_mesh = cache.get_mesh(obj)
+
+    assert rest_mesh != pose_mesh
+    np.testing.assert_allclose(get_positions(rest_mesh)[:, 2], 0.0, atol=1e-6)
+    np.testing.assert_allclose(get_positions(pose_mesh)[:, 2], 1.0, atol=1e-6)
+    cache.clear()
+
+
+def test_evaluated_mesh_cache_clear_removes_meshes(clean_blend_data):
+    obj = create_model_obj("mesh_cache.model", create_grid_mesh("mesh_cache.grid", 2.0, 4), [])
+    cache = EvaluatedMeshCache()
+    num_meshes = len(bpy.data.meshes)
+    cache.get_mesh(obj)
+    cache.get_mesh(obj, obj.matrix_world.copy())
+    assert len(bpy.data.meshes) == num_meshes + 2
+
+    cache.clear()
+
+    assert len(bpy.data.meshes) == num_meshes
+    assert cache.get_mesh(obj).name in bpy.data.meshes
+    cache.clear()
@@ -0,0 +1,43 @@
+import numpy as np
+from ..ydr.model_data import MeshData, get_mesh_data_hash
+
+
+def create_mesh_data(seed: int = 0) -> MeshData:
+    rng = np.random.default_rng(seed)
+    vert_arr = np.zeros(8, dtype=[("Position", np.float32, 3), ("Colour0", np.uint8, 4)])
+    vert_arr["Position"] = rng.uniform(-1.0, 1.0, (8, 3))
+    vert_arr["Colour0"] = rng.integers(0, 256, (8, 4))
+    ind_arr = rng.integers(0, 8, 12).astype(np.uint32)
+    mat_inds = np.array([0, 0, 1, 1], dtype=np.uint32)
+    return MeshData(vert_arr, ind_arr, mat_inds)
+
+
+def test_mesh_data_hash_equal_for_identical_data():
+    a = create_mesh_data()
+    b = create_mesh_data()
+    assert a.vert_arr is not b.vert_arr
+    assert get_mesh_data_hash(a) == get_mesh_data_hash(b)
+
+
+def test_mesh_data_hash_changes_with_contents():
+    base = get_mesh_data_hash(create_mesh_data())
+
+    m = create_mesh_data()
+    m.vert_arr["Colour0"][3, 1] += 1
+    assert get_mesh_data_hash(m) != base
+
+    m = create_mesh_data()
+    m.ind_arr[5] = (m.ind_arr[5] + 1) % 8
+    assert get_mesh_data_hash(m) != base
+
+    m = create_mesh_data()
+    m.mat_inds[0] = 1
+    assert get_mesh_data_hash(m) != base
+
+
+def test_mesh_data_hash_changes_with_vertex_layout():
+    m = create_mesh_data()
+    vert_arr = np.zeros(8, dtype=[("Position", np.float32, 3), ("Colour1", np.uint8, 4)])
+    vert_arr["Position"] = m.vert_arr["Position"]
+    vert_arr["Colour1"] = m.vert_arr["Colour0"]
+    assert get_mesh_data_hash(MeshData(vert_arr, m.ind_arr, m.mat_inds)) != get_mesh_data_hash(m)
@@ -0,0 +1,50 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from xml.etree import ElementTree as ET
+from ..cwxml.navmesh import NavPolygon
+from ..ynv.polygon_data import get_polygons_mesh_data, weld_vertices
+
+
+def test_nav_polygon_vertices_from_xml():
+    element = ET.fromstring(
+        "<Item><Flags>0 0 0 0 0 0</Flags><Vertices>\n 1.5, -2, 3\n 4, 5, 6.25\n 7, 8, 9\n</Vertices></Item>")
+
+    polygon = NavPolygon.from_xml(element)
+
+    assert_array_equal(polygon.vertices, ((1.5, -2.0, 3.0), (4.0, 5.0, 6.25), (7.0, 8.0, 9.0)))
+    assert_array_equal(NavPolygon.from_xml(polygon.to_xml()).vertices, polygon.vertices)
+
+
+def test_weld_vertices_merges_shared_positions():
+    positions = np.array(((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0002, 0.0, 0.0), (2.0, 0.0, 0.0)))
+
+    welded, inds = weld_vertices(positions)
+
+    assert_array_equal(welded, ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (2.0, 0.0, 0.0)))
+    assert_array_equal(inds, (0, 1, 0, 1, 2))
+
+
+def test_polygons_mesh_data_shares_vertices():
+    quad_a = np.array(((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0), (0.0, 1.0, 0.0)))
+    tri_b = np.array(((1.0, 0.0, 0.0), (2.0, 0.0, 0.0), (1.0, 1.0, 0.0)))
+
+    verts, loop_vert_inds, loop_starts, valid_polys = get_polygons_mesh_data([quad_a, tri_b])
+
+    assert len(verts) == 5
+    assert_array_equal(loop_vert_inds, (0, 1, 2, 3, 1, 4, 2))
+    assert_array_equal(loop_starts, (0, 4))
+    assert valid_polys.all()
+
+
+def test_polygons_mesh_data_skips_degenerate_polygons():
+    tri = np.array(((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)))
+    # Collapses to a line once the duplicated vertices are welded
+    degenerate = np.array(((0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 0.0, 0.0)))
+    # Quad with a duplicated vertex, still a valid triangle
+    quad = np.array(((2.0, 0.0, 0.0), (3.0, 0.0, 0.0), (3.0, 0.0, 0.0), (2.0, 1.0, 0.0)))
+
+    _, loop_vert_inds, loop_starts, valid_polys = get_polygons_mesh_data([tri, degenerate, quad])
+
+    assert_array_equal(valid_polys, (True, False, True))
+    assert_array_equal(loop_starts, (0, 3))
+    assert len(loop_vert_inds) == 6
@@ -0,0 +1,99 @@
+import json
+import time
+from ..tools import profiling
+from ..tools.profiling import Profiler, use_profiler
+
+
+@profiling.profiled("decorated")
+def decorated_function(n: int) -> int:
+    profiling.count("items", n)
+    return n * 2
+
+
+def test_profiler_inactive_is_noop():
+    assert profiling.get_active_profiler() is None
+    with profiling.span("stage"):
+        profiling.count("items", 10)
+    assert decorated_function(3) == 6
+
+
+def test_profiler_records_nested_spans_and_counters():
+    profiler = Profiler()
+    with use_profiler(profiler):
+        assert profiling.get_active_profiler() is profiler
+        with profiling.span("outer"):
+            for _ in range(3):
+                with profiling.span("inner"):
+                    time.sleep(0.001)
+            assert decorated_function(5) == 10
+            assert decorated_function(7) == 14
+            profiling.count("items", 1)
+
+    assert profiling.get_active_profiler() is None
+
+    outer = profiler.root.children["outer"]
+    assert outer.calls == 1
+    assert outer.counters == {"items": 1}
+    assert set(outer.children.keys()) == {"inner", "decorated"}
+
+    inner = outer.children["inner"]
+    assert inner.calls == 3
+    assert inner.total_time >= 0.003
+    assert outer.total_time >= inner.total_time
+    assert outer.self_time <= outer.total_time - inner.total_time + 1e-9
+
+    decorated = outer.children["decorated"]
+    assert decorated.calls == 2
+    assert decorated.counters == {"items": 12}
+
+    report = profiler.format_report(min_percent=0.0)
+    assert report[0].startswith("outer: ")
+    assert any(line.startswith("  decorated: ") and "items=12" in line for line in report)
+
+
+def test_profiler_span_closed_on_exception():
+    profiler = Profiler()
+    with use_profiler(profiler):
+        try:
+            with profiling.span("failing"):
+                raise ValueError()
+        except ValueError:
+            pass
+
+        with profiling.span("after"):
+            pass
+
+    assert set(profiler.root.children.keys()) == {"failing", "after"}
+    assert profiler.root.children["failing"].calls == 1
+
+
+def test_profiler_write_trace(tmp_path):
+    profiler = Profiler()
+    with use_profiler(profiler):
+        with profiling.span("outer"):
+            with profiling.span("inner"):
+                profiling.count("vertices", 100)
+
+    filepath = tmp_path.joinpath("trace.json")
+    profiler.write_trace(str(filepath))
+    trace = json.loads(filepath.read_text())
+
+    events = trace["traceEvents"]
+    assert [e["name"] for e in events] == ["outer", "inner"]
+    assert all(e["ph"] == "X" for e in events)
+    outer, inner = events
+    assert inner["args"] == {"vertices": 100}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert trace["otherData"]["stages"][0]["children"][0]["counters"] == {"vertices": 100}
+    assert not tmp_path.joinpath("trace.prof").exists()
+
+
+def test_profiler_cprofile(tmp_path):
+    profiler = Profiler(use_cprofile=True)
+    with use_profiler(profiler):
+        decorated_function(1)
+
+    assert "decorated_function" in profiler.format_cprofile_stats()
+    profiler.write_trace(str(tmp_path.joinpath("trace.json")))
+    assert tmp_path.joinpath("trace.prof").exists()
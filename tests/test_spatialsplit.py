@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+from numpy.testing import assert_array_equal
+from ..tools.spatialsplit import partition_aabbs, get_parts_aabb_volume, get_ragged_items
+
+
+def create_aabbs(num_items: int, seed: int = 1234) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    mins = rng.uniform(-500.0, 500.0, (num_items, 3))
+    maxs = mins + rng.uniform(0.1, 5.0, (num_items, 3))
+    return mins, maxs
+
+
+@pytest.mark.parametrize("num_parts", (1, 2, 3, 8, 13))
+def test_partition_aabbs_covers_all_items(num_parts: int):
+    mins, maxs = create_aabbs(1000)
+    parts = partition_aabbs(mins, maxs, num_parts=num_parts)
+
+    assert len(parts) == num_parts
+    assert_array_equal(np.sort(np.concatenate(parts)), np.arange(1000))
+    # Parts are balanced
+    assert max(len(p) for p in parts) - min(len(p) for p in parts) <= 1
+
+
+def test_partition_aabbs_is_tighter_than_splitting_in_order():
+    mins, maxs = create_aabbs(1000)
+    parts = partition_aabbs(mins, maxs, num_parts=8)
+    naive_parts = np.array_split(np.arange(1000), 8)
+
+    volume = get_parts_aabb_volume(mins, maxs, parts)
+    naive_volume = get_parts_aabb_volume(mins, maxs, naive_parts)
+    assert volume < naive_volume * 0.5
+
+
+def test_partition_aabbs_max_polys():
+    mins, maxs = create_aabbs(1000)
+    poly_counts = np.random.default_rng(1).integers(1, 20, 1000)
+    parts = partition_aabbs(mins, maxs, num_parts=2, poly_counts=poly_counts, max_polys=500)
+
+    assert_array_equal(np.sort(np.concatenate(parts)), np.arange(1000))
+    assert all(poly_counts[p].sum() <= 500 for p in parts)
+
+
+def test_partition_aabbs_max_verts():
+    mins, maxs = create_aabbs(1000)
+    # Each item uses 3 vertices, neighbouring items share one
+    vert_ids = (np.arange(1000)[:, None] * 2 + np.arange(3)).ravel()
+    vert_offsets = np.arange(1001) * 3
+
+    def _count_verts(inds: np.ndarray) -> int:
+        return len(np.unique(get_ragged_items(vert_ids, vert_offsets, inds)))
+
+    parts = partition_aabbs(mins, maxs, count_verts=_count_verts, max_verts=256)
+
+    assert_array_equal(np.sort(np.concatenate(parts)), np.arange(1000))
+    assert all(_count_verts(p) <= 256 for p in parts)
+
+
+def test_partition_aabbs_empty():
+    assert partition_aabbs(np.empty((0, 3)), np.empty((0, 3)), num_parts=4) == []
+
+
+def test_get_ragged_items():
+    values = np.arange(10)
+    offsets = np.array([0, 3, 3, 7, 10])
+    assert_array_equal(get_ragged_items(values, offsets, np.array([3, 0, 1])), [7, 8, 9, 0, 1, 2])
+    assert len(get_ragged_items(values, offsets, np.array([1]))) == 0
@@ -0,0 +1,109 @@
+import io
+import pytest
+import numpy as np
+from numpy.testing import assert_array_equal
+from xml.etree import ElementTree as ET
+from ..cwxml.drawable import VertexBuffer, IndexBuffer
+from ..cwxml.element import PreformattedTextElement, indent
+
+LAYOUT = ["Position", "BlendWeights", "BlendIndices", "Normal", "Colour0", "TexCoord0", "Tangent"]
+
+
+def create_vertex_buffer(layout: list[str], layout_type: str) -> VertexBuffer:
+    vertex_buffer = VertexBuffer()
+    layout_elem = vertex_buffer.get_element("layout")
+    layout_elem.value = layout
+    layout_elem.type = layout_type
+    return vertex_buffer
+
+
+def create_vertex_data_str(layout: list[str], layout_type: str, num_verts: int) -> tuple[str, np.dtype]:
+    """Gets random vertex data as text, in the same format CodeWalker uses, and the dtype to read it with ``loadtxt``."""
+    rng = np.random.default_rng(1234)
+    raw_dtype = []
+    attr_strs = []
+    for attr_name in layout:
+        _, attr_dtype, num_comps = VertexBuffer.VERT_ATTR_DTYPES[attr_name]
+        if attr_name == "Normal" and layout_type == "GTAV2":
+            num_comps = 4
+
+        if attr_dtype == np.uint32:
+            values = rng.integers(0, 256, (num_verts, num_comps))
+            fmt = " ".join(["%d"] * num_comps)
+        else:
+            values = rng.uniform(-100.0, 100.0, (num_verts, num_comps)).astype(np.float32)
+            if attr_name == "Normal" and layout_type == "GTAV2":
+                values[:, 3] = 0.0  # unused, always exported as 0
+            fmt = " ".join(["%.7f"] * num_comps)
+
+        raw_dtype.append((attr_name, attr_dtype, num_comps))
+        attr_strs.append([fmt % tuple(row) for row in values.tolist()])
+
+    data_str = "\n".join("   ".join(row) for row in zip(*attr_strs))
+    return data_str, np.dtype(raw_dtype)
+
+
+@pytest.mark.parametrize("layout_type", ("GTAV1", "GTAV2"))
+@pytest.mark.parametrize("num_verts", (1, 2, 100))
+def test_vertex_buffer_load_data_from_str(layout_type: str, num_verts: int):
+    data_str, raw_dtype = create_vertex_data_str(LAYOUT, layout_type, num_verts)
+    expected = np.loadtxt(io.StringIO(data_str), dtype=raw_dtype, ndmin=1)
+
+    vertex_buffer = create_vertex_buffer(LAYOUT, layout_type)
+    vertex_buffer._load_data_from_str(data_str)
+
+    assert vertex_buffer.data.dtype == np.dtype([VertexBuffer.VERT_ATTR_DTYPES[a] for a in LAYOUT])
+    assert len(vertex_buffer.data) == num_verts
+    for attr_name in LAYOUT:
+        expected_attr = expected[attr_name][:, :3] if attr_name == "Normal" else expected[attr_name]
+        assert_array_equal(vertex_buffer.data[attr_name], expected_attr)
+
+
+@pytest.mark.parametrize("layout_type", ("GTAV1", "GTAV2"))
+@pytest.mark.parametrize("num_verts", (1, 2, 5000))
+def test_vertex_buffer_data_to_str(layout_type: str, num_verts: int):
+    data_str, _ = create_vertex_data_str(LAYOUT, layout_type, num_verts)
+    vertex_buffer = create_vertex_buffer(LAYOUT, layout_type)
+    vertex_buffer._load_data_from_str(data_str)
+
+    # Data is generated with the same format used on export, so it should be written back exactly the same
+    assert vertex_buffer._data_to_str() == data_str
+
+
+@pytest.mark.parametrize("num_inds, expected", (
+    (0, "\n"),
+    (3, "0 1 2"),
+    (24, " ".join(str(i) for i in range(24))),
+    (27, " ".join(str(i) for i in range(24)) + "\n24 25 26"),
+))
+def test_index_buffer_inds_to_str(num_inds: int, expected: str):
+    index_buffer = IndexBuffer()
+    index_buffer.data = np.arange(num_inds, dtype=np.uint32)
+    assert index_buffer._inds_to_str() == expected
+
+
+@pytest.mark.parametrize("text, multiline", (
+    ("1 2 3", False),
+    ("1 2 3\n4 5 6", True),
+    ("1 2 3", True),
+))
+def test_indent_preformatted_text_element(text: str, multiline: bool):
+    def _create_tree(data_elem):
+        root = ET.Element("VertexBuffer")
+        data_elem.text = text
+        root.append(data_elem)
+        return root
+
+    preformatted_elem = PreformattedTextElement("Data")
+    preformatted_elem.multiline = multiline
+    root = _create_tree(preformatted_elem)
+    indent(root, 4)
+
+    # Compare against the generic indentation of the same text
+    expected_root = _create_tree(ET.Element("Data"))
+    if multiline and "\n" not in text:
+        expected_root[0].text = f"\n{text}"
+    indent(expected_root, 4)
+
+    assert ET.tostring(root) == ET.tostring(expected_root)
+
@@ -1,6 +1,11 @@
+import io
 import pytest
-from ..cwxml.element import get_str_type, ElementTree, ValueProperty
+from xml.etree import ElementTree as ET
+from ..cwxml.element import get_str_type, indent, ElementTree, ValueProperty, XmlStreamWriter
 from ..cwxml.ymap import HexColorProperty
+from ..cwxml.drawable import YDR
+from ..cwxml.clipdictionary import YCD
+from .shared import SOLLUMZ_TEST_ASSETS_DIR
 
 
 @pytest.mark.parametrize("string, expected", (
@@ -52,3 +57,22 @@ def test_argb_hex_to_rgba(argb_hex, expected_rgba):
 ))
 def test_rgba_to_argb_hex(rgba, expected_argb_hex):
     assert HexColorProperty.rgba_to_argb_hex(rgba) == expected_argb_hex
+
+
+@pytest.mark.parametrize("file_name, file_type", (
+    ("sollumz_cube.ydr.xml", YDR),
+    ("roundtrip_anim.ycd.xml", YCD),
+    ("roundtrip_anim_values.ycd.xml", YCD),
+    ("roundtrip_anim_clip_anim_list.ycd.xml", YCD),
+))
+def test_xml_write_stream_matches_indented_tree(file_name: str, file_type):
+    obj = file_type.from_xml_file(SOLLUMZ_TEST_ASSETS_DIR.joinpath(file_name))
+
+    element = obj.to_xml()
+    indent(element)
+    expected = ET.tostring(element, encoding="unicode")
+
+    output = io.StringIO()
+    obj.write_xml_stream(XmlStreamWriter(output.write), 0)
+
+    assert output.getvalue() == expected
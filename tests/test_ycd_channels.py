@@ -0,0 +1,25 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from ..cwxml.clipdictionary import ChannelsList
+
+
+def test_quantize_float_channel_values_wrap_around():
+    channel = ChannelsList.QuantizeFloat()
+    channel.values = [1.0, 2.0, 3.0]
+    assert_array_equal(channel.get_values(np.arange(7), []), [1, 2, 3, 1, 2, 3, 1])
+
+
+def test_indirect_quantize_float_channel_values():
+    channel = ChannelsList.IndirectQuantizeFloat()
+    channel.values = [10.0, 20.0, 30.0]
+    channel.frames = [2, 2, 0, 1, 4]
+    assert_array_equal(channel.get_values(np.arange(6), []), [30, 30, 10, 20, 20, 30])
+
+
+def test_cached_quaternion_channel_values():
+    xyz = np.array([[0.0, 0.0, 0.0], [0.5, 0.5, 0.5], [0.8, 0.8, 0.0]], dtype=np.float32)
+    channel_values = [xyz[:, 0], xyz[:, 1], xyz[:, 2]]
+
+    channel = ChannelsList.CachedQuaternion1()
+    # Last component of a unit quaternion, 0 when the vector is longer than 1
+    assert_allclose(channel.get_values(np.arange(3), channel_values), [1.0, 0.5, 0.0], atol=1e-6)
@@ -0,0 +1,86 @@
+import copy
+import bpy
+import pytest
+from ..sollumz_properties import SollumType
+from ..tools.blenderhelper import create_blender_object, create_empty_object
+from ..ydr.shader_materials import create_shader
+from ..ydr.ydrexport import create_drawable_xml
+from ..ydr.ydrimport import create_drawable_obj, use_shared_meshes
+from .benchmarks import clear_blend_data, create_grid_mesh, create_model_obj
+
+
+@pytest.fixture
+def clean_blend_data():
+    clear_blend_data()
+    yield
+    clear_blend_data()
+
+
+def get_model_objs(drawable_obj: bpy.types.Object) -> list[bpy.types.Object]:
+    return [child for child in drawable_obj.children if child.sollum_type == SollumType.DRAWABLE_MODEL]
+
+
+def create_static_drawable_xml():
+    """Gets the XML of a drawable with two identical models."""
+    material = create_shader("default.sps")
+    drawable_obj = create_empty_object(SollumType.DRAWABLE, "shared_static")
+    for i in range(2):
+        model_obj = create_model_obj(f"shared_static.model{i}", create_grid_mesh(f"grid{i}", 2.0, 4), [material])
+        model_obj.parent = drawable_obj
+
+    return create_drawable_xml(drawable_obj)
+
+
+def create_skinned_drawable_xml():
+    """Gets the XML of a drawable with two identical skinned models."""
+    armature = bpy.data.armatures.new("shared_skinned.skel")
+    drawable_obj = create_blender_object(SollumType.DRAWABLE, "shared_skinned", armature)
+    bpy.context.view_layer.objects.active = drawable_obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    for i in range(2):
+        edit_bone = armature.edit_bones.new(f"bone_{i}")
+        edit_bone.head = (i, 0.0, 0.0)
+        edit_bone.tail = (i, 0.05, 0.0)
+    bpy.ops.object.mode_set(mode="OBJECT")
+    for i, bone in enumerate(armature.bones):
+        bone.bone_properties.tag = i
+
+    mesh = create_grid_mesh("grid", 2.0, 4)
+    model_obj = create_model_obj("shared_skinned.model", mesh, [create_shader("default.sps")])
+    model_obj.parent = drawable_obj
+    model_obj.modifiers.new("Armature", "ARMATURE").object = drawable_obj
+    model_obj.vertex_groups.new(name="bone_0")
+    model_obj.vertex_groups.new(name="bone_1").add(list(range(len(mesh.vertices))), 1.0, "ADD")
+
+    drawable_xml = create_drawable_xml(drawable_obj)
+    # Skinned models are joined on export, duplicate the model to get two identical skinned models
+    drawable_xml.drawable_models_high.append(copy.deepcopy(drawable_xml.drawable_models_high[0]))
+    return drawable_xml
+
+
+@pytest.mark.parametrize("share", (True, False))
+def test_import_shares_identical_meshes(clean_blend_data, share: bool):
+    drawable_xml = create_static_drawable_xml()
+    clear_blend_data()
+
+    with use_shared_meshes(share):
+        drawable_obj = create_drawable_obj(drawable_xml, "shared_static.ydr.xml")
+
+    model_objs = get_model_objs(drawable_obj)
+    assert len(model_objs) == 2
+    assert (model_objs[0].data == model_objs[1].data) == share
+
+
+def test_import_does_not_share_skinned_meshes(clean_blend_data):
+    drawable_xml = create_skinned_drawable_xml()
+    clear_blend_data()
+
+    with use_shared_meshes():
+        drawable_obj = create_drawable_obj(drawable_xml, "shared_skinned.ydr.xml")
+
+    model_objs = get_model_objs(drawable_obj)
+    assert len(model_objs) == 2
+    assert model_objs[0].data != model_objs[1].data
+    for model_obj in model_objs:
+        vertex_groups = model_obj.vertex_groups
+        assert all(vertex_groups[v.groups[0].group].name == "bone_1" for v in model_obj.data.vertices)
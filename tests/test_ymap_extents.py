@@ -0,0 +1,53 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from ..ymap.extents import Extents, get_entities_extents, quaternions_to_matrices
+
+
+def create_entities(num_entities: int, seed: int = 1234):
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-1000.0, 1000.0, (num_entities, 3))
+    quats = rng.normal(size=(num_entities, 4))
+    bb_mins = rng.uniform(-10.0, -0.1, (num_entities, 3))
+    bb_maxs = rng.uniform(0.1, 10.0, (num_entities, 3))
+    lod_dists = rng.uniform(10.0, 200.0, num_entities)
+    return positions, quats, bb_mins, bb_maxs, lod_dists
+
+
+def get_entities_extents_per_entity(positions, orientations, bb_mins, bb_maxs, lod_dists) -> Extents:
+    extents = Extents.empty()
+    for position, orientation, bbmin, bbmax, lod_dist in zip(positions, orientations, bb_mins, bb_maxs, lod_dists):
+        corners = [orientation @ np.array((x[0], y[1], z[2])) for x in (bbmin, bbmax) for y in (bbmin, bbmax) for z in (bbmin, bbmax)]
+        sbmin, sbmax = bbmin - lod_dist, bbmax + lod_dist
+        stream_corners = [orientation @ np.array((x[0], y[1], z[2])) for x in (sbmin, sbmax) for y in (sbmin, sbmax) for z in (sbmin, sbmax)]
+
+        points = np.array([bbmin, bbmax, *(position + c for c in corners)])
+        stream_points = np.array([position + c for c in stream_corners])
+        extents = extents.union(Extents(points.min(axis=0), points.max(axis=0), stream_points.min(axis=0), stream_points.max(axis=0)))
+    return extents
+
+
+def test_quaternions_to_matrices():
+    # 90 degrees around Z and identity
+    quats = np.array([(np.cos(np.pi / 4), 0.0, 0.0, np.sin(np.pi / 4)), (2.0, 0.0, 0.0, 0.0)])
+    matrices = quaternions_to_matrices(quats)
+
+    assert_allclose(matrices[0] @ np.array((1.0, 0.0, 0.0)), (0.0, 1.0, 0.0), atol=1e-12)
+    assert_allclose(matrices[1], np.eye(3), atol=1e-12)
+
+
+def test_entities_extents_matches_per_entity_calculation():
+    positions, quats, bb_mins, bb_maxs, lod_dists = create_entities(200)
+    orientations = quaternions_to_matrices(quats)
+
+    extents = get_entities_extents(positions, orientations, bb_mins, bb_maxs, lod_dists)
+    expected = get_entities_extents_per_entity(positions, orientations, bb_mins, bb_maxs, lod_dists)
+
+    for value, expected_value in zip(extents, expected):
+        assert_allclose(value, expected_value)
+
+
+def test_entities_extents_empty():
+    extents = get_entities_extents(np.empty((0, 3)), np.empty((0, 3, 3)), np.empty((0, 3)), np.empty((0, 3)), np.empty(0))
+
+    assert np.all(extents.entities_min == np.inf)
+    assert np.all(extents.streaming_max == -np.inf)
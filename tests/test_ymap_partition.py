@@ -0,0 +1,137 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from mathutils import Vector
+from ..cwxml.ymap import CMapData, Entity
+from ..ymap.extents import EntityBounds, Extents
+from ..ymap.partition import partition_entities
+from ..ymap.ymapexport import partition_ymap_entities
+
+
+def create_positions(num_entities: int, seed: int = 1234):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1000.0, 1000.0, (num_entities, 3))
+
+
+def test_partition_entities_covers_every_entity_once():
+    positions = create_positions(1000)
+    cells = partition_entities(positions, 250.0)
+
+    assert_array_equal(np.sort(np.concatenate(cells)), np.arange(len(positions)))
+
+
+def test_partition_entities_cells_respect_cell_size():
+    positions = create_positions(1000)
+    cell_size = 250.0
+    cells = partition_entities(positions, cell_size)
+
+    assert len(cells) == 64
+    for cell in cells:
+        cell_coords = np.floor(positions[cell, :2] / cell_size)
+        assert (cell_coords == cell_coords[0]).all()
+
+
+def test_partition_entities_splits_full_cells():
+    positions = create_positions(1000)
+    cells = partition_entities(positions, 2000.0, max_entities=100)
+
+    assert len(cells) > 10
+    assert_array_equal(np.sort(np.concatenate(cells)), np.arange(len(positions)))
+    for cell in cells:
+        assert len(cell) <= 100
+
+
+def test_partition_entities_stops_at_min_cell_size():
+    positions = np.zeros((50, 3))
+    cells = partition_entities(positions, 100.0, max_entities=10, min_cell_size=1.0)
+
+    assert len(cells) == 1
+    assert len(cells[0]) == 50
+
+
+def test_partition_entities_empty():
+    assert partition_entities(np.empty((0, 3)), 100.0) == []
+
+
+def create_ymap_with_lod_parent(
+    num_entities: int, parent_index: int, offset: float = 0.0
+) -> tuple[CMapData, EntityBounds]:
+    """Gets a ymap where the entity at ``parent_index`` is the LOD parent of the entities after it. The entities
+    positions are moved by ``offset`` on every axis.
+    """
+    positions = create_positions(num_entities) + offset
+    ymap = CMapData()
+    ymap.name = "partition_test"
+    for i, position in enumerate(positions):
+        entity = Entity()
+        entity.position = Vector(position)
+        if i == parent_index:
+            entity.num_children = num_entities - parent_index - 1
+        elif i > parent_index:
+            entity.parent_index = parent_index
+        ymap.entities.append(entity)
+
+    entities_bounds = EntityBounds(
+        np.arange(num_entities),
+        positions,
+        np.tile(np.eye(3), (num_entities, 1, 1)),
+        np.full((num_entities, 3), -1.0),
+        np.full((num_entities, 3), 1.0),
+        np.full(num_entities, 10.0),
+    )
+    return ymap, entities_bounds
+
+
+def assert_extents_equal(ymap: CMapData, extents: Extents):
+    assert_allclose(ymap.entities_extents_min, extents.entities_min)
+    assert_allclose(ymap.entities_extents_max, extents.entities_max)
+    assert_allclose(ymap.streaming_extents_min, extents.streaming_min)
+    assert_allclose(ymap.streaming_extents_max, extents.streaming_max)
+
+
+def test_partition_ymap_entities_remaps_parent_index():
+    ymap, entities_bounds = create_ymap_with_lod_parent(200, parent_index=150)
+    parent_entity = ymap.entities[150]
+    child_ymaps, kept_extents = partition_ymap_entities(ymap, entities_bounds, 250.0)
+
+    assert len(child_ymaps) > 1
+    assert ymap.entities == [parent_entity]
+    kept_bounds = entities_bounds.subset(np.array([150]))
+    assert_allclose(kept_extents.entities_min, kept_bounds.get_extents(include_local_bounds=False).entities_min)
+
+    moved_entities = [entity for child_ymap in child_ymaps for entity in child_ymap.entities]
+    assert len(moved_entities) == 199
+    for child_ymap in child_ymaps:
+        assert child_ymap.parent == ymap.name
+    # Children of the LOD parent point to its new index in the parent ymap, other entities have no parent
+    assert sum(entity.parent_index == 0 for entity in moved_entities) == 49
+    assert sum(entity.parent_index == -1 for entity in moved_entities) == 150
+
+
+def test_partition_ymap_entities_child_extents():
+    ymap, entities_bounds = create_ymap_with_lod_parent(200, parent_index=150)
+    entity_indices = {id(entity): i for i, entity in enumerate(ymap.entities)}
+    child_ymaps, _ = partition_ymap_entities(ymap, entities_bounds, 250.0)
+
+    for child_ymap in child_ymaps:
+        inds = np.array([entity_indices[id(entity)] for entity in child_ymap.entities])
+        assert_extents_equal(child_ymap, entities_bounds.subset(inds).get_extents(include_local_bounds=False))
+
+
+def test_partition_ymap_entities_far_away_child_extents():
+    ymap, entities_bounds = create_ymap_with_lod_parent(200, parent_index=150, offset=5000.0)
+    child_ymaps, kept_extents = partition_ymap_entities(ymap, entities_bounds, 250.0)
+
+    assert len(child_ymaps) > 1
+    # Entity bounding boxes are 1 unit around their positions and LOD distances are 10
+    for child_ymap in child_ymaps:
+        cell_positions = np.array([entity.position for entity in child_ymap.entities])
+        cell_min = cell_positions.min(axis=0)
+        cell_max = cell_positions.max(axis=0)
+        assert_allclose(child_ymap.entities_extents_min, cell_min - 1.0)
+        assert_allclose(child_ymap.entities_extents_max, cell_max + 1.0)
+        assert_allclose(child_ymap.streaming_extents_min, cell_min - 11.0)
+        assert_allclose(child_ymap.streaming_extents_max, cell_max + 11.0)
+
+    kept_position = entities_bounds.positions[150]
+    assert_allclose(kept_extents.entities_min, kept_position - 1.0)
+    assert_allclose(kept_extents.entities_max, kept_position + 1.0)
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import bpy
 import math
+import numpy as np
+from numpy.typing import NDArray
 from sys import float_info
 from mathutils import Quaternion, Vector, Euler, Matrix
 from enum import IntFlag, IntEnum
@@ -264,6 +266,74 @@ def calculate_bone_space_transform_matrix(old_pose_bone, new_pose_bone):
     return new_mat.inverted() @ old_mat
 
 
+def get_fcurves_keyframes_co(fcurves) -> NDArray[np.float32]:
+    """Gets the keyframe coordinates of multiple F-curves with the same number of keyframes, as an array of shape
+    (num_fcurves, num_keyframes, 2).
+    """
+    num_keyframes = len(fcurves[0].keyframe_points)
+    co = np.empty((len(fcurves), num_keyframes * 2), dtype=np.float32)
+    for fcurve, fcurve_co in zip(fcurves, co):
+        fcurve.keyframe_points.foreach_get("co", fcurve_co)
+    return co.reshape((len(fcurves), num_keyframes, 2))
+
+
+def set_fcurves_keyframes_co(fcurves, co: NDArray[np.float32]):
+    """Sets the keyframe coordinates of multiple F-curves from an array as returned by ``get_fcurves_keyframes_co``,
+    and updates the F-curves.
+    """
+    for fcurve, fcurve_co in zip(fcurves, co):
+        fcurve.keyframe_points.foreach_set("co", fcurve_co.ravel())
+        fcurve.update()
+
+
+def quaternion_multiply(a: NDArray, b: NDArray) -> NDArray:
+    """Hamilton product of arrays of quaternions in (w, x, y, z) order."""
+    aw, ax, ay, az = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bw, bx, by, bz = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=-1)
+
+
+def rotate_quaternions(quats: NDArray, rotation: NDArray, rotation_first: bool = True) -> NDArray:
+    """Batched ``Quaternion.rotate``: applies ``rotation`` (a unit quaternion) to each quaternion in ``quats``,
+    keeping their length. ``rotation_first`` rotates in the parent space (``rotation @ q``), otherwise in the local
+    space of each quaternion (``q @ rotation``). Like ``Quaternion.rotate``, results have a non-negative W component.
+    """
+    quats = np.asarray(quats, dtype=np.float64)
+    length = np.linalg.norm(quats, axis=-1, keepdims=True)
+    unit_quats = np.divide(quats, length, out=np.tile([1.0, 0.0, 0.0, 0.0], (len(quats), 1)), where=length > 0.0)
+    if rotation_first:
+        result = quaternion_multiply(rotation, unit_quats)
+    else:
+        result = quaternion_multiply(unit_quats, rotation)
+    result[result[:, 0] < 0.0] *= -1.0
+    return result * length
+
+
+def make_quaternions_compatible(quats: NDArray) -> NDArray:
+    """Flips the sign of quaternions so every quaternion is in the same hemisphere as the previous one, that is, the dot
+    product of consecutive quaternions is non-negative.
+    """
+    if len(quats) < 2:
+        return quats
+
+    dots = np.einsum("ij,ij->i", quats[:-1], quats[1:])
+    if np.any(dots == 0.0):
+        # A zero dot product resets the sign, cannot be done with a cumulative product
+        quats = quats.copy()
+        for i in range(1, len(quats)):
+            if np.dot(quats[i - 1], quats[i]) < 0:
+                quats[i] *= -1
+        return quats
+
+    signs = np.cumprod(np.concatenate(([1.0], np.sign(dots))))
+    return quats * signs[:, None].astype(quats.dtype)
+
+
 def transform_bone_location_space(fcurves, old_pose_bone, new_pose_bone):
     """
     Converts the vector3 F-curves from the old pose bone's space to the new pose bone's space.
@@ -278,21 +348,16 @@ def transform_bone_location_space(fcurves, old_pose_bone, new_pose_bone):
 
     assert len(x.keyframe_points) == len(y.keyframe_points) and len(x.keyframe_points) == len(z.keyframe_points), "TODO: Handle different number of keyframes for each axis"
 
-    transform_mat = calculate_bone_space_transform_matrix(old_pose_bone, new_pose_bone)
-
-    for x_kfp, y_kfp, z_kfp in zip(x.keyframe_points, y.keyframe_points, z.keyframe_points):
-        x_co, y_co, z_co = x_kfp.co, y_kfp.co, z_kfp.co
-        assert x_co[0] == y_co[0] and x_co[0] == z_co[0], "TODO: Handle different keyframe times"
+    co = get_fcurves_keyframes_co(fcurves)
+    assert np.all(co[:, :, 0] == co[0, :, 0]), "TODO: Handle different keyframe times"
 
-        old_vec = Vector((x_co[1], y_co[1], z_co[1]))
-        new_vec = transform_mat @ old_vec
-        x_co[1], y_co[1], z_co[1] = new_vec[0], new_vec[1], new_vec[2]
+    transform_mat = np.array(calculate_bone_space_transform_matrix(old_pose_bone, new_pose_bone), dtype=np.float64)
 
-        x_kfp.co, y_kfp.co, z_kfp.co = x_co, y_co, z_co
+    old_vecs = co[:, :, 1].T
+    new_vecs = old_vecs @ transform_mat[:3, :3].T + transform_mat[:3, 3]
+    co[:, :, 1] = new_vecs.T
 
-    x.update()
-    y.update()
-    z.update()
+    set_fcurves_keyframes_co(fcurves, co)
 
 
 def transform_bone_rotation_quaternion_space(fcurves, old_pose_bone, new_pose_bone):
@@ -310,30 +375,19 @@ def transform_bone_rotation_quaternion_space(fcurves, old_pose_bone, new_pose_bo
 
     assert len(x.keyframe_points) == len(y.keyframe_points) and len(x.keyframe_points) == len(z.keyframe_points) and len(x.keyframe_points) == len(w.keyframe_points), "TODO: Handle different number of keyframes for each axis"
 
-    transform_mat = calculate_bone_space_transform_matrix(old_pose_bone, new_pose_bone)
+    co = get_fcurves_keyframes_co(fcurves)
+    assert np.all(co[:, :, 0] == co[0, :, 0]), "TODO: Handle different keyframe times"
 
-    prev_quat = None
-    for w_kfp, x_kfp, y_kfp, z_kfp in zip(w.keyframe_points, x.keyframe_points, y.keyframe_points, z.keyframe_points):
-        w_co, x_co, y_co, z_co = w_kfp.co, x_kfp.co, y_kfp.co, z_kfp.co
-        assert x_co[0] == y_co[0] and x_co[0] == z_co[0] and x_co[0] == w_co[0], "TODO: Handle different keyframe times"
-
-        quat = Quaternion((w_co[1], x_co[1], y_co[1], z_co[1]))
-        quat.rotate(transform_mat)
-        if prev_quat is not None and prev_quat.dot(quat) < 0:
-            # Blender interpolates quaternions linearly and component-wise which can cause flickering
-            # when there is a sign change. See longer rant in ycdexport.py
-            quat *= -1
-
-        w_co[1], x_co[1], y_co[1], z_co[1] = quat[0], quat[1], quat[2], quat[3]
-
-        w_kfp.co, x_kfp.co, y_kfp.co, z_kfp.co = w_co, x_co, y_co, z_co
+    transform_mat = calculate_bone_space_transform_matrix(old_pose_bone, new_pose_bone)
+    rotation = np.array(transform_mat.to_quaternion(), dtype=np.float64)
 
-        prev_quat = quat
+    quats = rotate_quaternions(co[:, :, 1].T, rotation)
+    # Blender interpolates quaternions linearly and component-wise which can cause flickering
+    # when there is a sign change. See longer rant in ycdexport.py
+    quats = make_quaternions_compatible(quats)
+    co[:, :, 1] = quats.T
 
-    w.update()
-    x.update()
-    y.update()
-    z.update()
+    set_fcurves_keyframes_co(fcurves, co)
 
 
 def transform_camera_rotation_quaternion(fcurves, old_camera, new_camera):
@@ -355,33 +409,21 @@ def transform_camera_rotation_quaternion(fcurves, old_camera, new_camera):
 
     assert len(x.keyframe_points) == len(y.keyframe_points) and len(x.keyframe_points) == len(z.keyframe_points) and len(x.keyframe_points) == len(w.keyframe_points), "TODO: Handle different number of keyframes for each axis"
 
+    co = get_fcurves_keyframes_co(fcurves)
+    assert np.all(co[:, :, 0] == co[0, :, 0]), "TODO: Handle different keyframe times"
+
     # if new camera is None, we convert from Blender to RAGE; otherwise from RAGE to Blender
     angle_delta = math.radians(-90.0 if new_camera is None else 90.0)
-    x_axis = Vector((1.0, 0.0, 0.0))
-
-    prev_quat = None
-    for w_kfp, x_kfp, y_kfp, z_kfp in zip(w.keyframe_points, x.keyframe_points, y.keyframe_points, z.keyframe_points):
-        w_co, x_co, y_co, z_co = w_kfp.co, x_kfp.co, y_kfp.co, z_kfp.co
-        assert x_co[0] == y_co[0] and x_co[0] == z_co[0] and x_co[0] == w_co[0], "TODO: Handle different keyframe times"
-
-        quat = Quaternion((w_co[1], x_co[1], y_co[1], z_co[1]))
-        x_axis_local = quat @ x_axis
-        quat.rotate(Quaternion(x_axis_local, angle_delta))
-        if prev_quat is not None and prev_quat.dot(quat) < 0:
-            # Blender interpolates quaternions linearly and component-wise which can cause flickering
-            # when there is a sign change. See longer rant in ycdexport.py
-            quat *= -1
-
-        w_co[1], x_co[1], y_co[1], z_co[1] = quat[0], quat[1], quat[2], quat[3]
+    # Rotating around the local X axis of each quaternion, same as `q.rotate(Quaternion(q @ x_axis, angle_delta))`
+    rotation = np.array(Quaternion((1.0, 0.0, 0.0), angle_delta), dtype=np.float64)
 
-        w_kfp.co, x_kfp.co, y_kfp.co, z_kfp.co = w_co, x_co, y_co, z_co
+    quats = rotate_quaternions(co[:, :, 1].T, rotation, rotation_first=False)
+    # Blender interpolates quaternions linearly and component-wise which can cause flickering
+    # when there is a sign change. See longer rant in ycdexport.py
+    quats = make_quaternions_compatible(quats)
+    co[:, :, 1] = quats.T
 
-        prev_quat = quat
-
-    w.update()
-    x.update()
-    y.update()
-    z.update()
+    set_fcurves_keyframes_co(fcurves, co)
 
 
 def add_driver_variable_obj_prop(fcurve, name, obj, obj_type, prop_data_path):
@@ -652,21 +694,32 @@ def retarget_animation(animation_obj: bpy.types.Object, old_target_id: bpy.types
     bone_rotations_to_transform = {}
     camera_rotations_to_transform = {}
 
+    # data path -> (new data path, bone ID, property path). Each component of a track has its own F-curve with the
+    # same data path, so only parse it once
+    retargeted_data_paths = {}
+
     action = animation_obj.animation_properties.action
     for fcurve in action.fcurves:
         # TODO: can we somehow store the track ID in the F-Curve to avoid parsing the data paths?
-        data_path = fcurve.data_path
+        old_data_path = fcurve.data_path
 
-        canon_data_path = track_data_path_to_canonical_form(data_path, old_target_id, old_bone_name_map)
+        retargeted_data_path = retargeted_data_paths.get(old_data_path, None)
+        if retargeted_data_path is None:
+            canon_data_path = track_data_path_to_canonical_form(old_data_path, old_target_id, old_bone_name_map)
 
-        data_path = track_data_path_to_target_form(canon_data_path, new_target_id, new_bone_map)
+            data_path = track_data_path_to_target_form(canon_data_path, new_target_id, new_bone_map)
 
-        # check if track needs to be transformed
-        data_path_parts = canon_data_path.split('"')
-        bone_id = data_path_parts[1]
-        if bone_id.startswith("#"):
-            bone_id = int(bone_id[1:])
-        prop_path = data_path_parts[2]
+            # check if track needs to be transformed
+            data_path_parts = canon_data_path.split('"')
+            bone_id = data_path_parts[1]
+            if bone_id.startswith("#"):
+                bone_id = int(bone_id[1:])
+            prop_path = data_path_parts[2]
+
+            retargeted_data_path = (data_path, bone_id, prop_path)
+            retargeted_data_paths[old_data_path] = retargeted_data_path
+
+        data_path, bone_id, prop_path = retargeted_data_path
         if prop_path == "].location":
             if bone_id not in bone_locations_to_transform:
                 bone_locations_to_transform[bone_id] = [None, None, None]
@@ -681,7 +734,8 @@ def retarget_animation(animation_obj: bpy.types.Object, old_target_id: bpy.types
             camera_rotations_to_transform[bone_id][fcurve.array_index] = fcurve
 
         # print(f"<{fcurve.data_path}> -> <{data_path}>")
-        fcurve.data_path = data_path
+        if data_path != old_data_path:
+            fcurve.data_path = data_path
 
     # perform required transformations
     for bone_id, fcurves in bone_locations_to_transform.items():
@@ -1,5 +1,8 @@
 import bpy
-from typing import Optional
+import bmesh
+import numpy as np
+from numpy.typing import NDArray
+from typing import NamedTuple, Optional
 from ..sollumz_properties import SollumType, BOUND_TYPES
 from ..tools.meshhelper import (
     create_box,
@@ -10,6 +13,7 @@ from ..tools.meshhelper import (
 )
 from ..ybn.properties import load_flag_presets, flag_presets, BoundFlags
 from .blenderhelper import create_blender_object, create_empty_object, remove_number_suffix
+from .spatialsplit import get_ragged_items
 from mathutils import Vector, Matrix
 
 
@@ -185,3 +189,201 @@ def apply_flag_preset(obj: bpy.types.Object, preset_index: int, reload_presets:
         obj.composite_flags2[flag_name] = flag_name in preset.flags2
 
     return True
+
+
+# Number of vertices each primitive bound polygon uses in the exported geometry
+PRIMITIVE_POLY_NUM_VERTS = {
+    SollumType.BOUND_POLY_BOX: 4,
+    SollumType.BOUND_POLY_SPHERE: 1,
+    SollumType.BOUND_POLY_CAPSULE: 2,
+    SollumType.BOUND_POLY_CYLINDER: 2,
+}
+
+
+class BoundPolySplitItems(NamedTuple):
+    """Items of a set of bound polygon objects to split. Primitive polygons (boxes, spheres...) are a single item each,
+    while each face of a polygon mesh is its own item.
+    """
+    objs: list[bpy.types.Object]
+    # Per item: index of its object in ``objs``, and its face index in the object mesh (-1 for primitives)
+    obj_inds: NDArray[np.int64]
+    face_inds: NDArray[np.int64]
+    # Per item: world-space AABB and number of triangles
+    mins: NDArray[np.float64]
+    maxs: NDArray[np.float64]
+    poly_counts: NDArray[np.int64]
+    # Vertex IDs used by each item, the IDs of item ``i`` are ``vert_ids[vert_offsets[i]:vert_offsets[i+1]]``
+    vert_ids: NDArray[np.int64]
+    vert_offsets: NDArray[np.int64]
+
+    def count_verts(self, inds: NDArray[np.int64]) -> int:
+        return len(np.unique(get_ragged_items(self.vert_ids, self.vert_offsets, inds)))
+
+
+def get_bound_poly_split_items(bound_polys: list[bpy.types.Object]) -> BoundPolySplitItems:
+    obj_inds = []
+    face_inds = []
+    mins = []
+    maxs = []
+    poly_counts = []
+    vert_ids = []
+    vert_counts = []
+    next_vert_id = 0
+    for obj_ind, obj in enumerate(bound_polys):
+        world_mat = np.array(obj.matrix_world, dtype=np.float64)
+
+        if obj.sollum_type == SollumType.BOUND_POLY_TRIANGLE:
+            mesh = obj.data
+            num_faces = len(mesh.polygons)
+            if num_faces == 0:
+                continue
+
+            positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", positions)
+            positions = positions.reshape((-1, 3)) @ world_mat[:3, :3].T + world_mat[:3, 3]
+
+            loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+            mesh.loops.foreach_get("vertex_index", loop_verts)
+            loop_starts = np.empty(num_faces, dtype=np.int64)
+            mesh.polygons.foreach_get("loop_start", loop_starts)
+            loop_totals = np.empty(num_faces, dtype=np.int64)
+            mesh.polygons.foreach_get("loop_total", loop_totals)
+
+            # Face corners sorted by face, so reduceat can get the bounds of each face
+            face_starts = np.cumsum(loop_totals) - loop_totals
+            corner_loops = np.repeat(loop_starts - face_starts, loop_totals) + np.arange(int(loop_totals.sum()))
+            corner_verts = loop_verts[corner_loops]
+            corner_positions = positions[corner_verts]
+
+            obj_inds.append(np.full(num_faces, obj_ind, dtype=np.int64))
+            face_inds.append(np.arange(num_faces, dtype=np.int64))
+            mins.append(np.minimum.reduceat(corner_positions, face_starts, axis=0))
+            maxs.append(np.maximum.reduceat(corner_positions, face_starts, axis=0))
+            poly_counts.append(loop_totals - 2)
+            vert_ids.append(corner_verts + next_vert_id)
+            vert_counts.append(loop_totals)
+            next_vert_id += len(mesh.vertices)
+        elif obj.sollum_type in PRIMITIVE_POLY_NUM_VERTS:
+            corners = np.array(obj.bound_box, dtype=np.float64) @ world_mat[:3, :3].T + world_mat[:3, 3]
+            num_verts = PRIMITIVE_POLY_NUM_VERTS[obj.sollum_type]
+
+            obj_inds.append(np.array([obj_ind], dtype=np.int64))
+            face_inds.append(np.array([-1], dtype=np.int64))
+            mins.append(corners.min(axis=0, keepdims=True))
+            maxs.append(corners.max(axis=0, keepdims=True))
+            poly_counts.append(np.array([1], dtype=np.int64))
+            vert_ids.append(np.arange(next_vert_id, next_vert_id + num_verts, dtype=np.int64))
+            vert_counts.append(np.array([num_verts], dtype=np.int64))
+            next_vert_id += num_verts
+
+    def _concat(arrs: list[NDArray], shape: tuple, dtype) -> NDArray:
+        return np.concatenate(arrs) if arrs else np.empty(shape, dtype=dtype)
+
+    vert_counts = _concat(vert_counts, (0,), np.int64)
+    return BoundPolySplitItems(
+        objs=bound_polys,
+        obj_inds=_concat(obj_inds, (0,), np.int64),
+        face_inds=_concat(face_inds, (0,), np.int64),
+        mins=_concat(mins, (0, 3), np.float64),
+        maxs=_concat(maxs, (0, 3), np.float64),
+        poly_counts=_concat(poly_counts, (0,), np.int64),
+        vert_ids=_concat(vert_ids, (0,), np.int64),
+        vert_offsets=np.concatenate(([0], np.cumsum(vert_counts))).astype(np.int64),
+    )
+
+
+def split_bound_composite(
+    composite_obj: bpy.types.Object,
+    items: BoundPolySplitItems,
+    parts: list[NDArray[np.int64]]
+) -> list[bpy.types.Object]:
+    """Moves the bound polygons of ``composite_obj`` to a new composite for each part. Each new composite has a BVH
+    for each BVH the polygons came from, with the same flags. Polygon meshes with faces in different parts are split
+    in multiple objects. Returns the new composites.
+    """
+    collection = composite_obj.users_collection[0]
+    composite_name = composite_obj.name
+    # Free the name so the new composites can use it
+    composite_obj.name = ""
+
+    def _create_empty(sollum_type: SollumType, name: str, parent: Optional[bpy.types.Object]) -> bpy.types.Object:
+        obj = bpy.data.objects.new(name, None)
+        obj.empty_display_size = 0
+        obj.sollum_type = sollum_type
+        collection.objects.link(obj)
+        obj.parent = parent
+        return obj
+
+    def _set_parent_keep_transform(obj: bpy.types.Object, parent: bpy.types.Object):
+        world_mat = obj.matrix_world.copy()
+        obj.parent = parent
+        obj.matrix_world = world_mat
+
+    obj_num_items = np.bincount(items.obj_inds, minlength=len(items.objs))
+    split_objs = set()
+    new_composites = []
+    for part in parts:
+        new_composite = _create_empty(SollumType.BOUND_COMPOSITE, composite_name, None)
+        new_composite.matrix_world = composite_obj.matrix_world
+        new_composites.append(new_composite)
+
+        # Group the items of this part by object
+        part = part[np.argsort(items.obj_inds[part], kind="stable")]
+        part_obj_inds, part_obj_starts, part_obj_num_items = np.unique(
+            items.obj_inds[part], return_index=True, return_counts=True)
+
+        new_bvhs = {}
+        for obj_ind, start, num_items in zip(part_obj_inds.tolist(), part_obj_starts.tolist(),
+                                             part_obj_num_items.tolist()):
+            obj = items.objs[obj_ind]
+            src_bvh = obj.parent
+
+            new_bvh = new_bvhs.get(src_bvh, None)
+            if new_bvh is None:
+                new_bvh = _create_empty(SollumType.BOUND_GEOMETRYBVH, src_bvh.name, new_composite)
+                new_bvh.matrix_world = src_bvh.matrix_world
+                for flag_name in BoundFlags.__annotations__.keys():
+                    setattr(new_bvh.composite_flags1, flag_name, getattr(src_bvh.composite_flags1, flag_name))
+                    setattr(new_bvh.composite_flags2, flag_name, getattr(src_bvh.composite_flags2, flag_name))
+                new_bvhs[src_bvh] = new_bvh
+
+            if num_items == obj_num_items[obj_ind]:
+                # The whole object is in this part
+                _set_parent_keep_transform(obj, new_bvh)
+                continue
+
+            # Only some faces of this mesh are in this part, copy the mesh with just those faces
+            part_faces = items.face_inds[part[start:start + num_items]]
+            part_obj = obj.copy()
+            part_obj.data = obj.data.copy()
+            remove_mesh_faces(part_obj.data, np.setdiff1d(np.arange(len(obj.data.polygons)), part_faces))
+            collection.objects.link(part_obj)
+            _set_parent_keep_transform(part_obj, new_bvh)
+            split_objs.add(obj)
+
+    for obj in split_objs:
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+    for bvh in [child for child in composite_obj.children if child.sollum_type == SollumType.BOUND_GEOMETRYBVH]:
+        if not bvh.children:
+            bpy.data.objects.remove(bvh)
+
+    if composite_obj.children:
+        composite_obj.name = composite_name
+    else:
+        bpy.data.objects.remove(composite_obj)
+
+    return new_composites
+
+
+def remove_mesh_faces(mesh: bpy.types.Mesh, face_inds: NDArray[np.int64]):
+    """Removes faces from ``mesh``, along with the vertices and edges no longer used by other faces."""
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.faces.ensure_lookup_table()
+    bmesh.ops.delete(bm, geom=[bm.faces[i] for i in face_inds.tolist()], context="FACES")
+    bm.to_mesh(mesh)
+    bm.free()
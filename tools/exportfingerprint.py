@@ -0,0 +1,260 @@
+"""Content fingerprints of the objects exported by Sollumz, to detect which assets changed since the last export.
+
+The fingerprint of an asset covers its object hierarchy: transforms, custom properties, Sollumz properties, modifiers,
+constraints, mesh and armature data, and the materials, images and actions they use. Data-blocks shared between
+assets (meshes, materials...) are only hashed once per export.
+"""
+import os
+import hashlib
+import bpy
+import numpy as np
+from numpy.typing import NDArray
+from typing import Any, Optional
+
+from .meshhelper import get_mesh_fingerprint
+
+# Maximum nesting of non-ID structs hashed through their RNA properties
+_MAX_RNA_DEPTH = 4
+
+
+def _foreach_get(collection, key: str, num_components: int, dtype) -> NDArray:
+    arr = np.empty(len(collection) * num_components, dtype=dtype)
+    collection.foreach_get(key, arr)
+    return arr
+
+
+class _Hasher:
+    def __init__(self, fingerprinter: "ExportFingerprinter"):
+        self.fingerprinter = fingerprinter
+        self.hash = hashlib.blake2b(digest_size=16)
+
+    def hexdigest(self) -> str:
+        return self.hash.hexdigest()
+
+    def update(self, value: Any):
+        if isinstance(value, np.ndarray):
+            self.hash.update(str(value.shape).encode())
+            self.hash.update(np.ascontiguousarray(value).tobytes())
+        else:
+            self.hash.update(repr(value).encode())
+        self.hash.update(b"\0")
+
+    def update_id(self, id_data: Optional[bpy.types.ID]):
+        """Hashes a reference to a data-block. Data-blocks exported as part of the asset are hashed by content,
+        others only by name.
+        """
+        if id_data is None:
+            self.update(None)
+            return
+
+        self.update((type(id_data).__name__, id_data.name, id_data.library.filepath if id_data.library else None))
+        if isinstance(id_data, (bpy.types.Material, bpy.types.Image, bpy.types.Action, bpy.types.Mesh, bpy.types.Armature)):
+            self.update(self.fingerprinter.get_id_digest(id_data))
+
+    def update_rna(
+        self,
+        struct: bpy.types.bpy_struct,
+        runtime_only: bool,
+        depth: int = 0,
+        excluded: frozenset[str] = frozenset(),
+    ):
+        """Hashes the RNA properties of ``struct``. With ``runtime_only`` only the properties registered by
+        add-ons (e.g. Sollumz properties) are included. Properties in ``excluded`` are skipped.
+        """
+        if depth > _MAX_RNA_DEPTH:
+            return
+
+        for prop in struct.bl_rna.properties:
+            identifier = prop.identifier
+            if identifier == "rna_type" or identifier in excluded or (runtime_only and not prop.is_runtime):
+                continue
+
+            try:
+                value = getattr(struct, identifier)
+            except (AttributeError, RuntimeError):
+                continue
+
+            self.update(identifier)
+            if prop.type == "POINTER":
+                if value is None or isinstance(value, bpy.types.ID):
+                    self.update_id(value)
+                else:
+                    self.update_rna(value, runtime_only=False, depth=depth + 1)
+            elif prop.type == "COLLECTION":
+                self.update(len(value))
+                for item in value:
+                    if isinstance(item, bpy.types.ID):
+                        self.update_id(item)
+                    else:
+                        self.update_rna(item, runtime_only=False, depth=depth + 1)
+            elif prop.type == "ENUM" and prop.is_enum_flag:
+                self.update(sorted(value))
+            elif getattr(prop, "array_length", 0) > 0:
+                # Convert to plain values, the repr of RNA arrays is their path instead of their values
+                self.update(np.array(value))
+            else:
+                self.update(value)
+
+    def update_custom_props(self, id_data: bpy.types.bpy_struct):
+        for key in sorted(id_data.keys()):
+            value = id_data[key]
+            if hasattr(value, "to_dict"):
+                value = value.to_dict()
+            elif hasattr(value, "to_list"):
+                value = value.to_list()
+            self.update((key, value))
+
+    def update_object(self, obj: bpy.types.Object):
+        self.update((obj.name, obj.type, obj.parent_type, obj.parent_bone))
+        self.update(np.array(obj.matrix_world, dtype=np.float32))
+        self.update_custom_props(obj)
+        self.update_rna(obj, runtime_only=True)
+
+        for modifier in obj.modifiers:
+            self.update_rna(modifier, runtime_only=False)
+        for constraint in obj.constraints:
+            self.update_rna(constraint, runtime_only=False)
+
+        for slot in obj.material_slots:
+            self.update(slot.link)
+            self.update_id(slot.material)
+
+        self.update_id(obj.data)
+        if obj.type == "MESH" and obj.vertex_groups:
+            self.update([vertex_group.name for vertex_group in obj.vertex_groups])
+            self.update(self.fingerprinter.get_vertex_weights_digest(obj.data))
+
+        if obj.animation_data is not None:
+            self.update_id(obj.animation_data.action)
+
+        if obj.pose is not None:
+            for pose_bone in obj.pose.bones:
+                self.update(pose_bone.name)
+                self.update_rna(pose_bone, runtime_only=True)
+                for constraint in pose_bone.constraints:
+                    self.update_rna(constraint, runtime_only=False)
+
+    def update_mesh(self, mesh: bpy.types.Mesh):
+        self.update_custom_props(mesh)
+        self.update_rna(mesh, runtime_only=True)
+        mesh_fingerprint = get_mesh_fingerprint(mesh)
+        # Meshes with attributes that cannot be read always count as changed
+        self.update(mesh_fingerprint if mesh_fingerprint is not None else os.urandom(16))
+
+        if mesh.shape_keys is not None:
+            for key_block in mesh.shape_keys.key_blocks:
+                self.update((key_block.name, key_block.value, key_block.mute))
+                self.update(_foreach_get(key_block.data, "co", 3, np.float32))
+
+        for material in mesh.materials:
+            self.update_id(material)
+
+    def update_armature(self, armature: bpy.types.Armature):
+        self.update_custom_props(armature)
+        self.update_rna(armature, runtime_only=True)
+        for bone in armature.bones:
+            self.update((bone.name, bone.parent.name if bone.parent else None, bone.use_deform))
+            self.update(np.array(bone.matrix_local, dtype=np.float32))
+            self.update(np.array((bone.head_local, bone.tail_local), dtype=np.float32))
+            self.update_custom_props(bone)
+            self.update_rna(bone, runtime_only=True)
+
+    def update_material(self, material: bpy.types.Material):
+        self.update_custom_props(material)
+        self.update_rna(material, runtime_only=True)
+        if material.node_tree is None:
+            return
+
+        for node in sorted(material.node_tree.nodes, key=lambda n: n.name):
+            self.update((node.bl_idname, node.name))
+            self.update_rna(node, runtime_only=True)
+            if hasattr(node, "image"):
+                self.update_id(node.image)
+            # Shader parameter nodes store their values in the outputs
+            for socket in (*node.inputs, *node.outputs):
+                self.update(socket.identifier)
+                if hasattr(socket, "default_value"):
+                    value = socket.default_value
+                    self.update(np.array(value) if hasattr(value, "__len__") else value)
+
+        for link in material.node_tree.links:
+            self.update((link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier))
+
+    def update_image(self, image: bpy.types.Image):
+        self.update_custom_props(image)
+        self.update((image.source, image.filepath, tuple(image.size), image.is_dirty, image.packed_file is not None))
+        filepath = bpy.path.abspath(image.filepath, library=image.library)
+        if image.packed_file is None and filepath and os.path.isfile(filepath):
+            # Cheaper than reading the file, and enough to notice when it is saved again
+            stat = os.stat(filepath)
+            self.update((stat.st_size, stat.st_mtime_ns))
+
+    def update_action(self, action: bpy.types.Action):
+        self.update_custom_props(action)
+        self.update_rna(action, runtime_only=True)
+        self.update(tuple(action.frame_range))
+        for fcurve in action.fcurves:
+            self.update((fcurve.data_path, fcurve.array_index, fcurve.extrapolation, fcurve.mute))
+            keyframes = fcurve.keyframe_points
+            self.update(_foreach_get(keyframes, "co", 2, np.float32))
+            self.update(_foreach_get(keyframes, "handle_left", 2, np.float32))
+            self.update(_foreach_get(keyframes, "handle_right", 2, np.float32))
+            self.update(_foreach_get(keyframes, "interpolation", 1, np.int32))
+
+
+class ExportFingerprinter:
+    """Computes the fingerprints of the objects of an export. Digests of data-blocks are cached, so keep an instance
+    only for the duration of a single export.
+    """
+
+    def __init__(self):
+        self._id_digests: dict[bpy.types.ID, str] = {}
+        self._vertex_weights_digests: dict[bpy.types.Mesh, str] = {}
+
+    def get_object_fingerprint(self, obj: bpy.types.Object) -> str:
+        """Gets the fingerprint of the asset ``obj`` and all its descendants."""
+        hasher = _Hasher(self)
+        for o in (obj, *sorted(obj.children_recursive, key=lambda o: o.name)):
+            hasher.update_object(o)
+        return hasher.hexdigest()
+
+    def get_settings_fingerprint(self, settings: bpy.types.PropertyGroup, excluded: frozenset[str] = frozenset()) -> str:
+        """Gets the fingerprint of the export settings, except the ones in ``excluded``."""
+        hasher = _Hasher(self)
+        hasher.update_rna(settings, runtime_only=False, excluded=excluded)
+        return hasher.hexdigest()
+
+    def get_id_digest(self, id_data: bpy.types.ID) -> str:
+        digest = self._id_digests.get(id_data, None)
+        if digest is not None:
+            return digest
+
+        # Placeholder in case of reference cycles
+        self._id_digests[id_data] = ""
+        hasher = _Hasher(self)
+        if isinstance(id_data, bpy.types.Mesh):
+            hasher.update_mesh(id_data)
+        elif isinstance(id_data, bpy.types.Armature):
+            hasher.update_armature(id_data)
+        elif isinstance(id_data, bpy.types.Material):
+            hasher.update_material(id_data)
+        elif isinstance(id_data, bpy.types.Image):
+            hasher.update_image(id_data)
+        elif isinstance(id_data, bpy.types.Action):
+            hasher.update_action(id_data)
+
+        digest = hasher.hexdigest()
+        self._id_digests[id_data] = digest
+        return digest
+
+    def get_vertex_weights_digest(self, mesh: bpy.types.Mesh) -> str:
+        digest = self._vertex_weights_digests.get(mesh, None)
+        if digest is not None:
+            return digest
+
+        weights = [(vertex.index, group.group, group.weight) for vertex in mesh.vertices for group in vertex.groups]
+        hasher = _Hasher(self)
+        hasher.update(np.array(weights, dtype=np.float64))
+        digest = hasher.hexdigest()
+        self._vertex_weights_digests[mesh] = digest
+        return digest
@@ -0,0 +1,121 @@
+"""Manifest of the assets exported to a directory, used to skip re-exporting assets that didn't change.
+
+The manifest is a JSON file stored next to the exported files. It maps each exported file to the fingerprint of the
+object it was exported from (see ``exportfingerprint``). The whole manifest is discarded when the add-on version or
+the export settings change, because both affect the output of every asset.
+"""
+import os
+import sys
+import json
+from pathlib import Path
+from typing import Optional
+
+MANIFEST_FILE_NAME = "sollumz_export_manifest.json"
+MANIFEST_FORMAT_VERSION = 1
+
+_addon_version: Optional[str] = None
+
+
+def _get_manifest_version() -> Optional[str]:
+    try:
+        # Only available in Python 3.11+ (Blender 4.1+)
+        import tomllib
+    except ImportError:
+        return None
+
+    manifest_path = Path(__file__).parent.parent.joinpath("blender_manifest.toml")
+    try:
+        with open(manifest_path, "rb") as f:
+            version = tomllib.load(f).get("version", None)
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+
+    return str(version) if version is not None else None
+
+
+def _get_bl_info_version() -> Optional[str]:
+    # Blender removes ``bl_info`` when the add-on is installed as an extension
+    addon_package = sys.modules.get(__package__.rpartition(".")[0], None)
+    bl_info = getattr(addon_package, "bl_info", None)
+    if bl_info is None or "version" not in bl_info:
+        return None
+
+    return ".".join(map(str, bl_info["version"]))
+
+
+def get_addon_version() -> str:
+    """Gets the add-on version from its ``blender_manifest.toml``, or from ``bl_info`` when the manifest cannot be
+    read.
+    """
+    global _addon_version
+    if _addon_version is None:
+        _addon_version = _get_manifest_version() or _get_bl_info_version() or "unknown"
+
+    return _addon_version
+
+
+class ExportManifest:
+    def __init__(self, directory: str, addon_version: str, settings_fingerprint: str):
+        self.directory = directory
+        self.addon_version = addon_version
+        self.settings_fingerprint = settings_fingerprint
+        # Exported file name -> fingerprint of its object
+        self.fingerprints: dict[str, str] = {}
+
+    @property
+    def filepath(self) -> str:
+        return os.path.join(self.directory, MANIFEST_FILE_NAME)
+
+    @classmethod
+    def load(cls, directory: str, addon_version: str, settings_fingerprint: str) -> "ExportManifest":
+        """Loads the manifest from ``directory``. If it doesn't exist, is invalid or was written by a different add-on
+        version or with different export settings, the returned manifest is empty.
+        """
+        manifest = ExportManifest(directory, addon_version, settings_fingerprint)
+        try:
+            with open(manifest.filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+
+        if (
+            not isinstance(data, dict) or
+            data.get("format_version", None) != MANIFEST_FORMAT_VERSION or
+            data.get("addon_version", None) != addon_version or
+            data.get("settings", None) != settings_fingerprint
+        ):
+            return manifest
+
+        fingerprints = data.get("assets", None)
+        if isinstance(fingerprints, dict):
+            manifest.fingerprints = {k: v for k, v in fingerprints.items() if isinstance(v, str)}
+
+        return manifest
+
+    def save(self):
+        data = {
+            "format_version": MANIFEST_FORMAT_VERSION,
+            "addon_version": self.addon_version,
+            "settings": self.settings_fingerprint,
+            "assets": dict(sorted(self.fingerprints.items())),
+        }
+        # Write to a temporary file first so an interrupted export doesn't leave a corrupted manifest behind
+        tmp_filepath = self.filepath + ".tmp"
+        with open(tmp_filepath, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_filepath, self.filepath)
+
+    def _get_key(self, filepath: str) -> str:
+        return os.path.relpath(filepath, self.directory).replace(os.sep, "/")
+
+    def is_up_to_date(self, filepath: str, fingerprint: str) -> bool:
+        """Checks whether ``filepath`` was already exported from an object with the same ``fingerprint`` and still
+        exists.
+        """
+        return self.fingerprints.get(self._get_key(filepath), None) == fingerprint and os.path.isfile(filepath)
+
+    def update(self, filepath: str, fingerprint: str):
+        self.fingerprints[self._get_key(filepath)] = fingerprint
+
+    def remove(self, filepath: str):
+        self.fingerprints.pop(self._get_key(filepath), None)
@@ -0,0 +1,247 @@
+"""Batch evaluation of F-curves with NumPy.
+
+Reproduces Blender's keyframe evaluation (``FCurve.evaluate``) for constant, linear and Bezier segments, so an F-curve
+can be sampled at many frames at once instead of calling ``evaluate`` once per frame. F-curves that use features not
+modelled here (modifiers, drivers, easing interpolation modes...) are evaluated with ``FCurve.evaluate``, as are short
+frame ranges where the NumPy overhead outweighs the per-frame calls.
+"""
+from typing import Optional, TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    import bpy
+
+# Values of the ``Keyframe.interpolation`` enum as read and written with ``foreach_get``/``foreach_set``, the easing
+# modes come after these
+INTERPOLATION_CONSTANT = 0
+INTERPOLATION_LINEAR = 1
+INTERPOLATION_BEZIER = 2
+
+# Below this number of frames, calling ``FCurve.evaluate`` for each frame is faster than the NumPy overhead
+BATCH_MIN_FRAMES = 400
+
+# Frames this close to a keyframe evaluate to the keyframe value, same threshold as Blender's keyframe binary search
+KEYFRAME_FRAME_THRESHOLD = 0.0001
+# The Bezier curve parameter of each frame is refined until all steps are smaller than the tolerance. Most curves
+# converge in a few steps, the maximum is enough for bisection alone to reach float32 precision
+BEZIER_SOLVE_TOLERANCE = 1e-9
+BEZIER_SOLVE_MAX_ITERATIONS = 48
+FLT_EPSILON = np.finfo(np.float32).eps
+
+
+def evaluate_keyframes(
+    co: NDArray[np.float32],
+    handle_left: NDArray[np.float32],
+    handle_right: NDArray[np.float32],
+    interpolation: NDArray[np.int32],
+    frames: NDArray[np.float32],
+) -> Optional[NDArray[np.float32]]:
+    """Evaluates the keyframes at each frame in ``frames``, with constant extrapolation.
+
+    ``co``, ``handle_left`` and ``handle_right`` are arrays of shape (N, 2) and ``interpolation`` an array of shape (N,)
+    with ``INTERPOLATION_*`` values. Keyframes must be sorted by frame. Frames are converted to float32, same as the
+    frames passed to ``FCurve.evaluate``.
+
+    Returns ``None`` if the keyframes cannot be evaluated here, i.e. when a Bezier segment has handles that make the
+    curve go back in time.
+    """
+    num_keys = len(co)
+    assert num_keys > 0, "At least one keyframe is required"
+
+    frames = np.asarray(frames, dtype=np.float32).astype(np.float64)
+    keys_x = co[:, 0].astype(np.float64)
+    keys_y = co[:, 1].astype(np.float64)
+    values = np.empty(len(frames), dtype=np.float64)
+
+    # Constant extrapolation, also handles the single keyframe case
+    before = frames <= keys_x[0]
+    after = frames >= keys_x[-1]
+    values[before] = keys_y[0]
+    values[after] = keys_y[-1]
+
+    inside = ~(before | after)
+    if not np.any(inside):
+        return values.astype(np.float32)
+
+    coefficients = _get_segments_coefficients(co, handle_left, handle_right, interpolation)
+    if coefficients is None:
+        return None
+
+    inside_frames = frames[inside]
+    # Index of the keyframe starting the segment each frame is in
+    seg = np.searchsorted(keys_x, inside_frames, side="right") - 1
+    x0 = keys_x[seg]
+    x1 = keys_x[seg + 1]
+    y0 = keys_y[seg]
+    y1 = keys_y[seg + 1]
+
+    # Find the curve parameter of each frame and evaluate the curve there
+    ax, bx, cx, dx, ay, by, cy, dy = coefficients[:, seg]
+    t = _solve_segments(inside_frames, ax, bx, cx, dx, (inside_frames - x0) / (x1 - x0))
+    inside_values = ((ay * t + by) * t + cy) * t + dy
+
+    # Frames on top of a keyframe get its exact value
+    on_start = np.abs(inside_frames - x0) < KEYFRAME_FRAME_THRESHOLD
+    on_end = np.abs(inside_frames - x1) < KEYFRAME_FRAME_THRESHOLD
+    inside_values[on_end] = y1[on_end]
+    inside_values[on_start] = y0[on_start]
+
+    values[inside] = inside_values
+    return values.astype(np.float32)
+
+
+def _get_segments_coefficients(
+    co: NDArray[np.float32],
+    handle_left: NDArray[np.float32],
+    handle_right: NDArray[np.float32],
+    interpolation: NDArray[np.int32],
+) -> Optional[NDArray[np.float64]]:
+    """Gets the polynomial coefficients of each segment between two keyframes, as an array of shape (8, N - 1) with the
+    coefficients a, b, c, d of x(t) = a*t^3 + b*t^2 + c*t + d followed by the ones of y(t). Constant and linear
+    segments are expressed as polynomials too, so all segments are evaluated the same way.
+    """
+    v1 = co[:-1].astype(np.float64)
+    v2 = handle_right[:-1].astype(np.float64)
+    v3 = handle_left[1:].astype(np.float64)
+    v4 = co[1:].astype(np.float64)
+    seg_interp = interpolation[:-1]
+
+    # Same handle correction as Blender does (BKE_fcurve_correct_bezpart), handles cannot go past the other keyframe
+    h1 = v1 - v2
+    h2 = v4 - v3
+    seg_len = v4[:, 0] - v1[:, 0]
+    len1 = np.abs(h1[:, 0])
+    len2 = np.abs(h2[:, 0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fac1 = np.where(len1 > seg_len, seg_len / len1, 1.0)[:, None]
+        fac2 = np.where(len2 > seg_len, seg_len / len2, 1.0)[:, None]
+    v2 = v1 - fac1 * h1
+    v3 = v4 - fac2 * h2
+
+    # Non-Bezier segments are straight lines, handles at a third of the segment keep x(t) linear
+    is_bezier = seg_interp == INTERPOLATION_BEZIER
+    straight_v2 = (2.0 * v1 + v4) / 3.0
+    straight_v3 = (v1 + 2.0 * v4) / 3.0
+    v2 = np.where(is_bezier[:, None], v2, straight_v2)
+    v3 = np.where(is_bezier[:, None], v3, straight_v3)
+
+    # Segments with all points at the same value are flat
+    is_flat = (
+        (np.abs(v1[:, 1] - v4[:, 1]) < FLT_EPSILON) &
+        (np.abs(v2[:, 1] - v3[:, 1]) < FLT_EPSILON) &
+        (np.abs(v3[:, 1] - v4[:, 1]) < FLT_EPSILON)
+    )
+
+    # x(t) must be monotonic to have a single solution for each frame. The derivative is a quadratic Bernstein
+    # polynomial with coefficients a, b, c, with a and c non-negative after the correction above, it is non-negative on
+    # [0, 1] when b >= -sqrt(a * c)
+    a = v2[:, 0] - v1[:, 0]
+    b = v3[:, 0] - v2[:, 0]
+    c = v4[:, 0] - v3[:, 0]
+    is_monotonic = is_flat | (b >= -np.sqrt(np.maximum(a * c, 0.0)) - 1e-9)
+    if not np.all(is_monotonic):
+        return None
+
+    coefficients = np.empty((8, len(v1)), dtype=np.float64)
+    for i in range(2):
+        p0, p1, p2, p3 = v1[:, i], v2[:, i], v3[:, i], v4[:, i]
+        coefficients[i * 4 + 0] = p3 - p0 + 3.0 * (p1 - p2)
+        coefficients[i * 4 + 1] = 3.0 * (p0 - 2.0 * p1 + p2)
+        coefficients[i * 4 + 2] = 3.0 * (p1 - p0)
+        coefficients[i * 4 + 3] = p0
+
+    # Constant and flat segments keep the value of the first keyframe
+    is_constant = (seg_interp == INTERPOLATION_CONSTANT) | (is_bezier & is_flat)
+    coefficients[4:7, is_constant] = 0.0
+    return coefficients
+
+
+def _solve_segments(
+    frames: NDArray[np.float64],
+    a: NDArray[np.float64],
+    b: NDArray[np.float64],
+    c: NDArray[np.float64],
+    d: NDArray[np.float64],
+    t: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Finds the parameter t in [0, 1] where x(t) = a*t^3 + b*t^2 + c*t + d is each frame, starting from the estimate
+    ``t``. Uses Newton's method, falling back to bisection when a step leaves the interval known to contain the
+    solution, so it always converges because x(t) is monotonic.
+    """
+    t_lo = np.zeros(len(frames), dtype=np.float64)
+    t_hi = np.ones(len(frames), dtype=np.float64)
+    for _ in range(BEZIER_SOLVE_MAX_ITERATIONS):
+        x = ((a * t + b) * t + c) * t + d - frames
+        dx = (3.0 * a * t + 2.0 * b) * t + c
+        below = x < 0.0
+        t_lo = np.where(below, t, t_lo)
+        t_hi = np.where(below, t_hi, t)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new_t = t - x / dx
+        new_t = np.where((new_t >= t_lo) & (new_t <= t_hi), new_t, (t_lo + t_hi) * 0.5)
+        converged = np.all(np.abs(new_t - t) < BEZIER_SOLVE_TOLERANCE)
+        t = new_t
+        if converged:
+            break
+
+    return t
+
+
+def can_sample_fcurve(fcurve: "bpy.types.FCurve") -> bool:
+    """Gets whether ``fcurve`` only uses features supported by ``sample_fcurve``'s batch evaluation."""
+    return (
+        len(fcurve.keyframe_points) > 0 and
+        len(fcurve.modifiers) == 0 and
+        fcurve.driver is None and
+        len(fcurve.sampled_points) == 0
+    )
+
+
+def sample_fcurve(fcurve: "bpy.types.FCurve", frames: NDArray[np.float32]) -> NDArray[np.float32]:
+    """Evaluates ``fcurve`` at each frame in ``frames``. Same results as calling ``fcurve.evaluate(frame)`` for each
+    frame (up to float32 precision), but with enough frames the keyframes are only read once and evaluated for all
+    frames at once.
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+
+    values = None
+    if len(frames) >= BATCH_MIN_FRAMES and can_sample_fcurve(fcurve):
+        values = _sample_keyframes(fcurve, frames)
+
+    if values is None:
+        values = np.fromiter((fcurve.evaluate(frame) for frame in frames), dtype=np.float32, count=len(frames))
+
+    return values
+
+
+def _sample_keyframes(fcurve: "bpy.types.FCurve", frames: NDArray[np.float32]) -> Optional[NDArray[np.float32]]:
+    keyframe_points = fcurve.keyframe_points
+    num_keys = len(keyframe_points)
+
+    interpolation = np.empty(num_keys, dtype=np.int32)
+    keyframe_points.foreach_get("interpolation", interpolation)
+    if np.any(interpolation[:-1] > INTERPOLATION_BEZIER):
+        # Easing modes (sine, bounce, elastic, etc.), the last keyframe interpolation is never used
+        return None
+
+    co = np.empty(num_keys * 2, dtype=np.float32)
+    handle_left = np.empty(num_keys * 2, dtype=np.float32)
+    handle_right = np.empty(num_keys * 2, dtype=np.float32)
+    keyframe_points.foreach_get("co", co)
+    keyframe_points.foreach_get("handle_left", handle_left)
+    keyframe_points.foreach_get("handle_right", handle_right)
+    co = co.reshape((num_keys, 2))
+    handle_left = handle_left.reshape((num_keys, 2))
+    handle_right = handle_right.reshape((num_keys, 2))
+
+    if fcurve.extrapolation != "CONSTANT" and np.any((frames < co[0, 0]) | (frames > co[-1, 0])):
+        # Linear extrapolation depends on the handles of the end keyframes, rarely used for exported frames
+        return None
+
+    if num_keys > 1 and np.any(np.diff(co[:, 0]) <= 0.0):
+        # Unsorted or overlapping keyframes, let Blender deal with them
+        return None
+
+    return evaluate_keyframes(co, handle_left, handle_right, interpolation, frames)
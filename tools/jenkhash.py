@@ -1,3 +1,16 @@
+import functools
+from collections import OrderedDict
+from typing import Iterable, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Maximum number of names kept to map hashes back to readable names, least recently used are discarded first
+KNOWN_NAMES_MAX_SIZE = 65536
+
+# Known names by their hash, least recently used first
+_known_names: OrderedDict[int, str] = OrderedDict()
+
 
 def GenerateData(bts: bytes, seed=0):
     h = seed
@@ -20,17 +33,97 @@ def GenerateData(bts: bytes, seed=0):
     return h
 
 
+@functools.lru_cache(maxsize=65536)
 def Generate(text, encoding="utf-8", seed=0):
     bts = text.lower().encode(encoding)
     return GenerateData(bts, seed)
 
 
+def hash_many(names: Sequence[str], encoding="utf-8", seed=0, register: bool = False) -> NDArray[np.uint32]:
+    """Calculates the JOAAT hash of many strings at once. Returns an array with the hash of each string, in the
+    same order as ``names``.
+
+    All strings are processed together one byte position at a time, so the cost of the Python loop depends on the
+    length of the longest string instead of the number of strings. If ``register`` is true, the names are added to the
+    reverse-lookup table used by ``hash_to_name``.
+    """
+    num_names = len(names)
+    if num_names == 0:
+        return np.empty(0, dtype=np.uint32)
+
+    encoded = [name.lower().encode(encoding) for name in names]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=num_names)
+
+    # Sort from longest to shortest, so the strings still being processed at a given byte position are always a prefix
+    order = np.argsort(-lengths, kind="stable")
+    sorted_lengths = lengths[order]
+    data = np.frombuffer(b"".join(encoded[i] for i in order), dtype=np.uint8)
+    offsets = np.zeros(num_names, dtype=np.int64)
+    np.cumsum(sorted_lengths[:-1], out=offsets[1:])
+
+    max_len = int(sorted_lengths[0])
+    # Number of strings longer than each byte position
+    num_active = num_names - np.searchsorted(sorted_lengths[::-1], np.arange(max_len), side="right")
+
+    h = np.full(num_names, seed, dtype=np.uint32)
+    for i in range(max_len):
+        n = num_active[i]
+        hv = h[:n]
+        hv += data[offsets[:n] + i]
+        hv += hv << np.uint32(10)
+        hv ^= hv >> np.uint32(6)
+
+    h += h << np.uint32(3)
+    h ^= h >> np.uint32(11)
+    h += h << np.uint32(15)
+
+    result = np.empty_like(h)
+    result[order] = h
+
+    if register and seed == 0:
+        for name_hash, name in zip(result.tolist(), names):
+            _register_name(name_hash, name)
+
+    return result
+
+
+def _register_name(h: int, name: str):
+    if name.startswith("hash_"):
+        return
+
+    _known_names[h] = name
+    _known_names.move_to_end(h)
+    if len(_known_names) > KNOWN_NAMES_MAX_SIZE:
+        _known_names.popitem(last=False)
+
+
+def register_names(names: Iterable[str]):
+    """Adds the given names to the reverse-lookup table used by ``hash_to_name``."""
+    if not isinstance(names, Sequence):
+        names = list(names)
+    hash_many(names, register=True)
+
+
+def hash_to_name(h: int) -> str:
+    """Gets the name of a hash if it is known, otherwise, gets the hash in `hash_` form. The result can be converted
+    back to the same hash with ``name_to_hash``.
+    """
+    name = _known_names.get(h, None)
+    if name is None:
+        return f"hash_{h:08X}"
+
+    _known_names.move_to_end(h)
+    return name
+
+
 def name_to_hash(name: str) -> int:
     """Gets a hash from a string. If it starts with `hash_`, it parses the hexadecimal number afterwards;
-    otherwise, it calculates the JOAAT hash of the string.
+    otherwise, it calculates the JOAAT hash of the string. Hashed names are remembered by ``hash_to_name``.
     """
 
     if name.startswith("hash_"):
         return int(name[5:], 16) & 0xFFFFFFFF
     else:
-        return Generate(name)
+        h = Generate(name)
+        _register_name(h, name)
+        return h
@@ -0,0 +1,108 @@
+"""Evaluated and triangulated meshes shared by all the exporters during an export session.
+
+The same object can be needed by several exporters (e.g. a drawable model that is also the source of a collision, or
+the glass windows of a fragment), each evaluating its modifiers and triangulating it again. While a cache is active
+(see ``use_evaluated_mesh_cache``), the mesh of each object is created once and reused.
+"""
+import bmesh
+import bpy
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from mathutils import Matrix
+
+from .blenderhelper import get_evaluated_obj
+
+
+def triangulate_mesh(mesh: bpy.types.Mesh):
+    temp_mesh = bmesh.new()
+    temp_mesh.from_mesh(mesh)
+
+    bmesh.ops.triangulate(temp_mesh, faces=temp_mesh.faces)
+
+    temp_mesh.to_mesh(mesh)
+    temp_mesh.free()
+
+    return mesh
+
+
+class EvaluatedMeshCache:
+    """Evaluated meshes of the objects, with all the modifiers applied and triangulated. The meshes are owned by the
+    cache and removed on ``clear``, they must not be modified by the exporters.
+
+    Meshes are keyed by the object, its active mesh data (which changes with the active LOD level), the pose position
+    of its armature and the transforms applied, so switching LOD levels or the armature to rest pose doesn't return a
+    stale mesh. Objects are identified by their ``session_uid``, so the objects created and deleted during the export
+    (e.g. the copies of the hi fragment) are never confused.
+    """
+
+    def __init__(self):
+        self._meshes: dict[tuple, bpy.types.Mesh] = {}
+
+    def _get_key(self, obj: bpy.types.Object, transforms: Optional[Matrix]) -> tuple:
+        armature_obj = obj.find_armature()
+        return (
+            obj.session_uid,
+            obj.data.session_uid if obj.data is not None else None,
+            armature_obj.data.pose_position if armature_obj is not None else None,
+            tuple(v for row in transforms for v in row) if transforms is not None else None,
+        )
+
+    def get_mesh(self, obj: bpy.types.Object, transforms: Optional[Matrix] = None) -> bpy.types.Mesh:
+        """Gets the evaluated and triangulated mesh of ``obj``, with ``transforms`` applied to it. Loop triangles are
+        already calculated.
+        """
+        key = self._get_key(obj, transforms)
+        mesh = self._meshes.get(key, None)
+        if mesh is not None:
+            return mesh
+
+        if transforms is not None:
+            mesh = self.get_mesh(obj).copy()
+            mesh.transform(transforms)
+        else:
+            obj_eval = get_evaluated_obj(obj)
+            mesh = bpy.data.meshes.new_from_object(obj_eval)
+            triangulate_mesh(mesh)
+
+        if bpy.app.version < (4, 1, 0):
+            mesh.calc_normals_split()
+        mesh.calc_loop_triangles()
+
+        self._meshes[key] = mesh
+        return mesh
+
+    def clear(self):
+        for mesh in self._meshes.values():
+            bpy.data.meshes.remove(mesh)
+        self._meshes.clear()
+
+
+_active_evaluated_mesh_cache: Optional[EvaluatedMeshCache] = None
+
+
+@contextmanager
+def use_evaluated_mesh_cache() -> Iterator[EvaluatedMeshCache]:
+    """Shares the evaluated meshes between all the exporters used inside this context. If a cache is already active,
+    it is reused. Otherwise, a new cache is created and its meshes are removed when exiting the context.
+    """
+    global _active_evaluated_mesh_cache
+    if _active_evaluated_mesh_cache is not None:
+        yield _active_evaluated_mesh_cache
+        return
+
+    cache = EvaluatedMeshCache()
+    _active_evaluated_mesh_cache = cache
+    try:
+        yield cache
+    finally:
+        _active_evaluated_mesh_cache = None
+        cache.clear()
+
+
+@contextmanager
+def evaluated_mesh(obj: bpy.types.Object, transforms: Optional[Matrix] = None) -> Iterator[bpy.types.Mesh]:
+    """Gets the evaluated and triangulated mesh of ``obj`` from the active cache. Without an active cache, the mesh is
+    only valid inside this context.
+    """
+    with use_evaluated_mesh_cache() as cache:
+        yield cache.get_mesh(obj, transforms)
@@ -1,3 +1,4 @@
+import hashlib
 import bpy
 import bmesh
 import numpy as np
@@ -403,3 +404,91 @@ def flip_uv(uv):
     v = (uv[1] - 1.0) * -1
 
     return [u, v]
+
+
+# Property used to read each attribute data type with ``foreach_get`` and its number of components
+ATTRIBUTE_DATA_TYPE_KEYS = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int32),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "FLOAT2": ("vector", 2, np.float32),
+    "INT32_2D": ("value", 2, np.int32),
+    "QUATERNION": ("value", 4, np.float32),
+    "FLOAT4X4": ("value", 16, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+}
+
+
+def _update_hash_runtime_props(h: hashlib.blake2b, struct: bpy.types.bpy_struct):
+    """Hashes the properties registered by add-ons on ``struct`` (e.g. ``Mesh.drawable_model_properties``)."""
+    for prop in struct.bl_rna.properties:
+        if prop.identifier == "rna_type" or not prop.is_runtime:
+            continue
+
+        value = getattr(struct, prop.identifier, None)
+        h.update(prop.identifier.encode())
+        if prop.type == "POINTER":
+            if value is None or isinstance(value, bpy.types.ID):
+                h.update(repr(value.name if value is not None else None).encode())
+            else:
+                _update_hash_runtime_props(h, value)
+        elif prop.type == "COLLECTION":
+            for item in value:
+                _update_hash_runtime_props(h, item)
+        elif getattr(prop, "array_length", 0) > 0:
+            h.update(repr(tuple(value)).encode())
+        else:
+            h.update(repr(value).encode())
+
+
+def get_mesh_fingerprint(mesh: bpy.types.Mesh) -> Optional[bytes]:
+    """Get a hash of the geometry, attributes, normals, vertex weights, materials and Sollumz properties of ``mesh``,
+    to detect whether it was modified. Returns ``None`` if the mesh has attributes that cannot be read.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.array((len(mesh.vertices), len(mesh.edges), len(mesh.loops), len(mesh.polygons)), dtype=np.int64))
+
+    for collection, prop, size, dtype in (
+        (mesh.vertices, "co", 3, np.float32),
+        (mesh.edges, "vertices", 2, np.int32),
+        (mesh.loops, "vertex_index", 1, np.int32),
+        (mesh.polygons, "loop_start", 1, np.int32),
+    ):
+        values = np.empty(len(collection) * size, dtype=dtype)
+        collection.foreach_get(prop, values)
+        h.update(values)
+
+    for attr in sorted(mesh.attributes, key=lambda a: a.name):
+        if attr.name.startswith("."):
+            # Internal attributes, like the edit mode selection, or topology already hashed above
+            continue
+
+        key = ATTRIBUTE_DATA_TYPE_KEYS.get(attr.data_type, None)
+        if key is None:
+            return None
+
+        prop, num_components, dtype = key
+        values = np.empty(len(attr.data) * num_components, dtype=dtype)
+        attr.data.foreach_get(prop, values)
+        h.update(f"{attr.name}:{attr.data_type}:{attr.domain}".encode())
+        h.update(values)
+
+    # Custom normals are not exposed as an attribute
+    normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+    if bpy.app.version >= (4, 1, 0):
+        mesh.corner_normals.foreach_get("vector", normals)
+    else:
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get("normal", normals)
+    h.update(normals)
+
+    # Vertex group weights are not exposed as attributes either
+    weights = [(vertex.index, group.group, group.weight) for vertex in mesh.vertices for group in vertex.groups]
+    h.update(np.array(weights, dtype=np.float64))
+
+    h.update(repr([m.name if m is not None else None for m in mesh.materials]).encode())
+    _update_hash_runtime_props(h, mesh)
+    return h.digest()
@@ -0,0 +1,243 @@
+"""Lightweight instrumentation of the import/export stages.
+
+Code marks its stages with ``span`` (or the ``profiled`` decorator) and adds to counters with ``count``. These do
+nothing unless a ``Profiler`` is active (see ``use_profiler``), which records the nested spans, aggregates them into a
+breakdown per stage and can optionally run ``cProfile`` at the same time.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class SpanStats:
+    """Aggregated timings of all the spans with the same name under the same parent stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.counters: dict[str, int] = {}
+        self.children: dict[str, SpanStats] = {}
+
+    @property
+    def self_time(self) -> float:
+        """Time spent in this stage outside of its child stages."""
+        return max(self.total_time - sum(c.total_time for c in self.children.values()), 0.0)
+
+    def get_child(self, name: str) -> "SpanStats":
+        child = self.children.get(name, None)
+        if child is None:
+            child = self.children[name] = SpanStats(name)
+        return child
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "self_time": self.self_time,
+            "counters": dict(self.counters),
+            "children": [c.to_dict() for c in self.children.values()],
+        }
+
+
+class Profiler:
+    """Records the spans and counters reported while it is active."""
+
+    def __init__(self, use_cprofile: bool = False):
+        self.root = SpanStats("")
+        self._stack: list[SpanStats] = [self.root]
+        # (name, start, duration, counters) of each finished span, for the trace file
+        self._events: list[tuple[str, float, float, dict[str, int]]] = []
+        self._event_counters: list[dict[str, int]] = [{}]
+        self._start_time = 0.0
+        self._thread_id = threading.get_ident()
+        self.cprofile = cProfile.Profile() if use_cprofile else None
+
+    def start(self):
+        self._start_time = time.perf_counter()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+    def stop(self):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        self.root.calls = 1
+        self.root.total_time = time.perf_counter() - self._start_time
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        if threading.get_ident() != self._thread_id:
+            # Stages running in worker threads would break the nesting, they are part of the caller stage
+            yield
+            return
+
+        stats = self._stack[-1].get_child(name)
+        counters = {}
+        self._stack.append(stats)
+        self._event_counters.append(counters)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self._stack.pop()
+            self._event_counters.pop()
+            stats.calls += 1
+            stats.total_time += duration
+            self._events.append((name, start, duration, counters))
+
+    def count(self, name: str, amount: int = 1):
+        """Adds ``amount`` to the counter ``name`` of the current stage."""
+        if threading.get_ident() != self._thread_id:
+            return
+
+        counters = self._stack[-1].counters
+        counters[name] = counters.get(name, 0) + amount
+        event_counters = self._event_counters[-1]
+        event_counters[name] = event_counters.get(name, 0) + amount
+
+    def format_report(self, min_percent: float = 0.5) -> list[str]:
+        """Gets the breakdown of the time spent in each stage as lines of text. Stages under ``min_percent`` of the
+        total time are omitted.
+        """
+        total_time = self.root.total_time or sum(c.total_time for c in self.root.children.values())
+        lines = []
+
+        def _format_counters(counters: dict[str, int]) -> str:
+            return ", ".join(f"{name}={value:,}" for name, value in counters.items())
+
+        def _add_lines(stats: SpanStats, depth: int):
+            percent = stats.total_time / total_time * 100.0 if total_time > 0.0 else 0.0
+            if percent < min_percent:
+                return
+
+            line = (
+                f"{'  ' * depth}{stats.name}: {stats.total_time:.3f}s ({percent:.1f}%), "
+                f"self {stats.self_time:.3f}s, {stats.calls} call{'s' if stats.calls != 1 else ''}"
+            )
+            if stats.counters:
+                line += f" [{_format_counters(stats.counters)}]"
+            lines.append(line)
+            for child in sorted(stats.children.values(), key=lambda c: c.total_time, reverse=True):
+                _add_lines(child, depth + 1)
+
+        for child in sorted(self.root.children.values(), key=lambda c: c.total_time, reverse=True):
+            _add_lines(child, 0)
+
+        if self.root.counters:
+            lines.append(_format_counters(self.root.counters))
+
+        return lines
+
+    def format_cprofile_stats(self, limit: int = 30) -> str:
+        """Gets the functions with the highest cumulative time recorded by cProfile."""
+        if self.cprofile is None:
+            return ""
+
+        out = io.StringIO()
+        pstats.Stats(self.cprofile, stream=out).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return out.getvalue()
+
+    def to_trace(self) -> dict:
+        """Gets the recorded spans in the Chrome Trace Event format, which can be opened in ``chrome://tracing`` or
+        Perfetto. The aggregated breakdown is included in ``otherData``.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._start_time) * 1_000_000,
+                "dur": duration * 1_000_000,
+                "pid": pid,
+                "tid": 0,
+                "args": counters,
+            }
+            for name, start, duration, counters in self._events
+        ]
+        # Parents before children when they start at the same time
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "total_time": self.root.total_time,
+                "counters": dict(self.root.counters),
+                "stages": [c.to_dict() for c in self.root.children.values()],
+            },
+        }
+
+    def write_trace(self, filepath: str):
+        """Writes the trace JSON to ``filepath``. If cProfile is used, its stats are written next to it as a
+        ``.prof`` file.
+        """
+        with open(filepath, "w") as f:
+            json.dump(self.to_trace(), f)
+
+        if self.cprofile is not None:
+            self.cprofile.dump_stats(f"{os.path.splitext(filepath)[0]}.prof")
+
+
+_active_profiler: Optional[Profiler] = None
+
+
+def get_active_profiler() -> Optional[Profiler]:
+    return _active_profiler
+
+
+@contextmanager
+def use_profiler(profiler: Optional[Profiler]) -> Iterator[Optional[Profiler]]:
+    """Sets the profiler that records the spans while inside this context. ``None`` disables profiling."""
+    global _active_profiler
+    prev_profiler = _active_profiler
+    _active_profiler = profiler
+    if profiler is not None:
+        profiler.start()
+    try:
+        yield profiler
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        _active_profiler = prev_profiler
+
+
+def span(name: str):
+    """Context manager that records the time spent inside it as the stage ``name``, nested in the current stage."""
+    if _active_profiler is None:
+        return nullcontext()
+
+    return _active_profiler.span(name)
+
+
+def count(name: str, amount: int = 1):
+    """Adds ``amount`` to the counter ``name`` of the current stage."""
+    if _active_profiler is not None:
+        _active_profiler.count(name, amount)
+
+
+def profiled(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator that records each call to the function as a stage. ``name`` defaults to the function name."""
+    def _decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def _wrapper(*args, **kwargs):
+            if _active_profiler is None:
+                return func(*args, **kwargs)
+
+            with _active_profiler.span(span_name):
+                return func(*args, **kwargs)
+
+        return _wrapper
+
+    return _decorator
@@ -0,0 +1,108 @@
+"""Spatial partitioning of primitives by their axis-aligned bounding boxes."""
+from math import ceil
+from typing import Callable, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def get_aabb_volume(mins: NDArray[np.float32], maxs: NDArray[np.float32]) -> float:
+    """Gets the volume of the AABB enclosing all the given AABBs (arrays of shape (n, 3))."""
+    if len(mins) == 0:
+        return 0.0
+
+    extents = maxs.max(axis=0) - mins.min(axis=0)
+    return float(np.prod(extents, dtype=np.float64))
+
+
+def get_parts_aabb_volume(mins: NDArray[np.float32], maxs: NDArray[np.float32], parts: list[NDArray[np.int64]]) -> float:
+    """Gets the sum of the volumes of the AABBs enclosing each part."""
+    return sum(get_aabb_volume(mins[part], maxs[part]) for part in parts)
+
+
+def get_ragged_items(values: NDArray, offsets: NDArray[np.int64], inds: NDArray[np.int64]) -> NDArray:
+    """Gets the values of the items ``inds``, where the values of item ``i`` are ``values[offsets[i]:offsets[i+1]]``."""
+    starts = offsets[inds]
+    lengths = offsets[inds + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return values[:0]
+
+    # Index of each gathered value: start of its item plus its position within the item
+    item_starts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return values[item_starts + np.arange(total)]
+
+
+def partition_aabbs(
+    mins: NDArray[np.float32],
+    maxs: NDArray[np.float32],
+    num_parts: int = 1,
+    poly_counts: Optional[NDArray[np.int64]] = None,
+    max_polys: int = 0,
+    count_verts: Optional[Callable[[NDArray[np.int64]], int]] = None,
+    max_verts: int = 0,
+) -> list[NDArray[np.int64]]:
+    """Splits the items with the given AABBs (arrays of shape (n, 3)) into spatially coherent parts.
+
+    Builds a k-d tree over the AABB centers, each node is split along its longest axis at the median (weighted by
+    ``poly_counts``), until there are at least ``num_parts`` parts and every part has at most ``max_polys`` polygons and
+    ``count_verts(part) <= max_verts``. A limit of 0 means no limit.
+
+    Returns the indices of the items in each part.
+    """
+    num_items = len(mins)
+    if num_items == 0:
+        return []
+
+    if poly_counts is None:
+        poly_counts = np.ones(num_items, dtype=np.int64)
+
+    if max_polys > 0:
+        num_parts = max(num_parts, ceil(int(poly_counts.sum()) / max_polys))
+    num_parts = max(1, min(num_parts, num_items))
+
+    centers = (mins + maxs) * 0.5
+
+    def _exceeds_limits(inds: NDArray[np.int64]) -> bool:
+        if max_polys > 0 and poly_counts[inds].sum() > max_polys:
+            return True
+        if max_verts > 0 and count_verts is not None and count_verts(inds) > max_verts:
+            return True
+        return False
+
+    parts = []
+    stack = [(np.arange(num_items), num_parts)]
+    while stack:
+        inds, part_count = stack.pop()
+        if part_count <= 1:
+            if len(inds) <= 1 or not _exceeds_limits(inds):
+                parts.append(inds)
+                continue
+
+            part_count = 2
+
+        num_left_parts = part_count // 2
+        left, right = _split_at_weighted_median(centers, poly_counts, inds, num_left_parts / part_count)
+        # Right pushed first so parts are output in order along the split axes
+        stack.append((right, part_count - num_left_parts))
+        stack.append((left, num_left_parts))
+
+    return parts
+
+
+def _split_at_weighted_median(
+    centers: NDArray[np.float32],
+    weights: NDArray[np.int64],
+    inds: NDArray[np.int64],
+    fraction: float,
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """Splits ``inds`` along the longest axis of their centers, so the left side has ``fraction`` of the total weight."""
+    node_centers = centers[inds]
+    axis = int(np.argmax(np.ptp(node_centers, axis=0)))
+    order = np.argsort(node_centers[:, axis], kind="stable")
+    sorted_inds = inds[order]
+
+    cum_weights = np.cumsum(weights[sorted_inds])
+    split = int(np.searchsorted(cum_weights, cum_weights[-1] * fraction, side="left")) + 1
+    split = min(max(split, 1), len(sorted_inds) - 1)
+    return sorted_inds[:split], sorted_inds[split:]
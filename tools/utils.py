@@ -1,7 +1,7 @@
 import os
 from numpy.typing import NDArray
 from math import sqrt
-from typing import Tuple
+from typing import Iterator, Tuple
 from mathutils import Vector, Quaternion, Matrix
 
 
@@ -176,6 +176,24 @@ def np_arr_to_str(arr: NDArray, fmt: str):
     return fmt % tuple(arr.ravel())
 
 
+def np_arr_to_str_chunks(arr: NDArray, row_fmt: str, line_prefix: str = "", chunk_size: int = 4096) -> Iterator[str]:
+    """Convert rows of a 2D numpy array to formatted lines, ``chunk_size`` rows at a time. Each chunk has its lines
+    prefixed by ``line_prefix`` and separated by new lines, without a trailing new line. Faster than ``np_arr_to_str``
+    and doesn't need a format string for the whole array.
+    """
+    row_fmt = line_prefix + row_fmt
+    chunk_fmt = None
+    chunk_fmt_rows = 0
+    for start in range(0, len(arr), chunk_size):
+        chunk = arr[start:start + chunk_size]
+        if len(chunk) != chunk_fmt_rows:
+            chunk_fmt = "\n".join([row_fmt] * len(chunk))
+            chunk_fmt_rows = len(chunk)
+
+        # tolist() gets Python scalars, which are formatted a lot faster than numpy scalars
+        yield chunk_fmt % tuple(chunk.ravel().tolist())
+
+
 def get_matrix_without_scale(matrix: Matrix) -> Matrix:
     """Apply scale to transformation matrix"""
     scale = matrix.to_scale()
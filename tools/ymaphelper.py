@@ -1,9 +1,14 @@
 import bpy
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+import numpy as np
+from numpy.typing import NDArray
 from mathutils import Vector
 from ..sollumz_properties import SOLLUMZ_UI_NAMES, SollumType
 from ..tools.blenderhelper import find_bsdf_and_material_output, remove_number_suffix
 from ..shared.obj_reader import obj_read_from_file
+from ..ymap.extents import EntityBounds, Extents, quaternions_to_matrices
 from ..tools.meshhelper import get_combined_bound_box, get_sphere_radius
 
 # TODO: This is not a real flag calculation, definitely need to do better
@@ -92,6 +97,100 @@ def get_cargen_mesh() -> bpy.types.Mesh:
 
     return mesh
 
+class ArchetypeObjectIndex:
+    """Index of objects by name, to find the objects of many entities by their archetype name without searching all
+    the objects for each entity.
+    """
+
+    def __init__(self, objs: Iterable[bpy.types.Object], scene: Optional[bpy.types.Scene] = None):
+        self.objs_by_name: dict[str, bpy.types.Object] = {}
+        for obj in objs:
+            # Keep the first one, same as ``bpy.data.objects.get`` (local objects before linked library objects)
+            self.objs_by_name.setdefault(obj.name, obj)
+
+        self.scene_obj_names: set[str] = {obj.name for obj in scene.objects} if scene is not None else set()
+
+    def get(self, archetype_name: str) -> Optional[bpy.types.Object]:
+        return self.objs_by_name.get(archetype_name, None)
+
+    def is_in_scene(self, obj: bpy.types.Object) -> bool:
+        """Whether ``obj`` was in the scene given to the index when it was created."""
+        return obj.name in self.scene_obj_names
+
+    @staticmethod
+    def from_blend_data(scene: Optional[bpy.types.Scene] = None) -> "ArchetypeObjectIndex":
+        """Index all the objects of the .blend (i.e. current scene, other scenes, asset browser)."""
+        return ArchetypeObjectIndex(bpy.data.objects, scene or bpy.context.scene)
+
+    @staticmethod
+    def from_view_layer(collection: bpy.types.Collection, view_layer: bpy.types.ViewLayer) -> "ArchetypeObjectIndex":
+        """Index the objects of ``collection`` that are in ``view_layer``."""
+        view_layer_obj_names = {obj.name for obj in view_layer.objects}
+        return ArchetypeObjectIndex(obj for obj in collection.all_objects if obj.name in view_layer_obj_names)
+
+
+_active_archetype_object_index: Optional[ArchetypeObjectIndex] = None
+
+
+@contextmanager
+def use_archetype_object_index(index: Optional[ArchetypeObjectIndex] = None) -> Iterator[ArchetypeObjectIndex]:
+    """Sets the index returned by ``get_archetype_object_index`` while inside this context, so it is shared by all the
+    entities of an import. Defaults to an index of all the objects of the .blend.
+    """
+    global _active_archetype_object_index
+    prev_index = _active_archetype_object_index
+    _active_archetype_object_index = index if index is not None else ArchetypeObjectIndex.from_blend_data()
+    try:
+        yield _active_archetype_object_index
+    finally:
+        _active_archetype_object_index = prev_index
+
+
+def get_archetype_object_index() -> ArchetypeObjectIndex:
+    """Gets the active index of all the objects of the .blend, or a new one if there is no active index."""
+    if _active_archetype_object_index is not None:
+        return _active_archetype_object_index
+
+    return ArchetypeObjectIndex.from_blend_data()
+
+
+ARCHETYPE_COLLECTION_SUFFIX = " (archetype)"
+
+
+def get_archetype_collection(archetype_obj: bpy.types.Object) -> bpy.types.Collection:
+    """Get the collection with the hierarchy of ``archetype_obj``, to place entities as instances of it. Created if it
+    doesn't exist yet. The objects stay in their current collections too.
+    """
+    collection_name = archetype_obj.name + ARCHETYPE_COLLECTION_SUFFIX
+    collection = bpy.data.collections.get(collection_name, None)
+    if collection is not None and collection.objects.get(archetype_obj.name, None) == archetype_obj:
+        return collection
+
+    collection = bpy.data.collections.new(collection_name)
+    for obj in [archetype_obj, *archetype_obj.children_recursive]:
+        collection.objects.link(obj)
+
+    # Instances are placed relative to the archetype origin
+    collection.instance_offset = archetype_obj.matrix_world.translation
+    return collection
+
+
+def get_instanced_archetype_obj(entity_obj: bpy.types.Object) -> Optional[bpy.types.Object]:
+    """Get the archetype object instanced by ``entity_obj``, or ``None`` if it is not a collection instance."""
+    collection = entity_obj.instance_collection if entity_obj.instance_type == "COLLECTION" else None
+    if collection is None:
+        return None
+
+    # The root of the archetype hierarchy
+    return next((o for o in collection.objects if o.parent is None or o.parent.name not in collection.objects), None)
+
+
+def get_entity_archetype_name(entity_obj: bpy.types.Object) -> str:
+    archetype_obj = get_instanced_archetype_obj(entity_obj)
+    name = archetype_obj.name if archetype_obj is not None else entity_obj.name
+    return remove_number_suffix(name)
+
+
 class ExtentsData:
     def __init__(self, lod_dist, bb_min, bb_max, bs_radius, scale):
         self.lod_dist = lod_dist
@@ -99,8 +198,17 @@ class ExtentsData:
         self.bb_max = bb_max
         self.bs_radius = bs_radius
         self.scale = scale
-def get_extents_data(obj, entity_extents_data):
-    archetype_name = remove_number_suffix(obj.name)
+def get_ytyp_archetypes_by_name() -> dict:
+    """Get the archetypes of all ytyps in the scene by name. The first one is kept if several have the same name."""
+    archetypes = {}
+    for ytyp in bpy.context.scene.ytyps:
+        for archetype in ytyp.archetypes:
+            archetypes.setdefault(archetype.name, archetype)
+    return archetypes
+
+
+def get_extents_data(obj, entity_extents_data, ytyp_archetypes: Optional[dict] = None):
+    archetype_name = get_entity_archetype_name(obj)
 
     if archetype_name in entity_extents_data:
         return entity_extents_data[archetype_name]
@@ -115,81 +223,98 @@ def get_extents_data(obj, entity_extents_data):
         )
 
     # Search in all ytyps
-    for ytyp in bpy.context.scene.ytyps:
-        if ytyp.archetypes:
-            for archetype in ytyp.archetypes:
-                if archetype.name == archetype_name:
-                    entity_extents_data[archetype_name] = create_extents_data_from_archetype(archetype)
-                    return entity_extents_data[archetype_name]
+    if ytyp_archetypes is None:
+        ytyp_archetypes = get_ytyp_archetypes_by_name()
+    archetype = ytyp_archetypes.get(archetype_name, None)
+    if archetype is not None:
+        entity_extents_data[archetype_name] = create_extents_data_from_archetype(archetype)
+        return entity_extents_data[archetype_name]
 
     # No ytyp so we calculate bb
-    bbmin, bbmax = get_combined_bound_box(obj, use_world=True)
+    archetype_obj = get_instanced_archetype_obj(obj)
+    if archetype_obj is not None:
+        # Collection instance, the bb of the archetype relative to the instance origin
+        offset = obj.instance_collection.instance_offset
+        bbmin, bbmax = get_combined_bound_box(archetype_obj, use_world=True)
+        bbmin, bbmax = bbmin - offset, bbmax - offset
+    else:
+        bbmin, bbmax = get_combined_bound_box(obj, use_world=True)
     bs_radius = get_sphere_radius(bbmin, bbmax)
     entity_extents_data[archetype_name] = ExtentsData(lod_dist=60, bb_min=bbmin, bb_max=bbmax, bs_radius=bs_radius, scale=Vector((1, 1, 1)))
 
     return entity_extents_data[archetype_name]
 
-def generate_ymap_extents(selected_ymap=None):
+class EntityObjsData(NamedTuple):
+    """Transforms of entity objects gathered in arrays."""
+    objs: list[bpy.types.Object]
+    positions: NDArray[np.float64]
+    # Quaternions in WXYZ order
+    rotations: NDArray[np.float64]
+    scales: NDArray[np.float64]
+
+
+def gather_entity_objs_data(entity_objs: Iterable[bpy.types.Object]) -> EntityObjsData:
+    """Read the transforms of all ``entity_objs`` in a single pass."""
+    objs = list(entity_objs)
+    num_objs = len(objs)
+    positions = np.empty((num_objs, 3), dtype=np.float64)
+    rotations = np.empty((num_objs, 4), dtype=np.float64)
+    scales = np.empty((num_objs, 3), dtype=np.float64)
+    for i, obj in enumerate(objs):
+        positions[i] = obj.location
+        rotations[i] = obj.rotation_euler.to_quaternion()
+        scales[i] = obj.scale
+
+    return EntityObjsData(objs, positions, rotations, scales)
+
+
+def get_entity_objs_bounds(data: EntityObjsData, entity_extents_data: dict, ytyp_archetypes: Optional[dict] = None) -> EntityBounds:
+    """Get the bounds of the drawable and fragment entity objects in ``data``, the ones included in the ymap extents.
+    Indices are relative to ``data.objs``.
+    """
+    if ytyp_archetypes is None:
+        ytyp_archetypes = get_ytyp_archetypes_by_name()
+
+    mask = np.array([
+        obj.sollum_type == SollumType.DRAWABLE or obj.sollum_type == SollumType.FRAGMENT for obj in data.objs
+    ], dtype=bool)
+    objs = [obj for obj, is_entity in zip(data.objs, mask) if is_entity]
+
+    num_objs = len(objs)
+    bb_mins = np.empty((num_objs, 3), dtype=np.float64)
+    bb_maxs = np.empty((num_objs, 3), dtype=np.float64)
+    lod_dists = np.empty(num_objs, dtype=np.float64)
+    for i, obj in enumerate(objs):
+        extents_data = get_extents_data(obj, entity_extents_data, ytyp_archetypes)
+        lod_dist = obj.entity_properties.lod_dist
+        lod_dists[i] = lod_dist if lod_dist > -1.0 else extents_data.lod_dist
+        bb_mins[i] = extents_data.bb_min * extents_data.scale
+        bb_maxs[i] = extents_data.bb_max * extents_data.scale
+
+    orientations = quaternions_to_matrices(data.rotations[mask]) if num_objs > 0 else np.empty((0, 3, 3))
+    return EntityBounds(np.flatnonzero(mask), data.positions[mask], orientations, bb_mins, bb_maxs, lod_dists)
+
+
+def generate_ymap_extents(selected_ymap=None, entities_extents: Optional[Extents] = None):
+    """Calculates the extents of ``selected_ymap``. ``entities_extents`` are the extents of its entities, if already
+    calculated by the caller (see ``get_entity_objs_bounds``).
+    """
     emin = Vector((float('inf'), float('inf'), float('inf')))
     emax = Vector((float('-inf'), float('-inf'), float('-inf')))
     smin = Vector((float('inf'), float('inf'), float('inf')))
     smax = Vector((float('-inf'), float('-inf'), float('-inf')))
 
     entity_extents_data = {}
+    ytyp_archetypes = get_ytyp_archetypes_by_name()
+    group_entities_extents = Extents.empty()
 
     # Clone of CodeWalker's ymap extents calculations
     for child in selected_ymap.children:
         if child.sollum_type == SollumType.YMAP_ENTITY_GROUP:
-            for entity_obj in child.children:
-                if entity_obj.sollum_type == SollumType.DRAWABLE or entity_obj.sollum_type == SollumType.FRAGMENT:
-                    position = entity_obj.location
-                    orientation = entity_obj.rotation_euler.to_matrix()
-
-                    extents_data = get_extents_data(entity_obj, entity_extents_data)
-                    lod_dist = (entity_obj.entity_properties.lod_dist
-                                if entity_obj.entity_properties.lod_dist > -1.0
-                                else extents_data.lod_dist)
-
-                    bbmin = extents_data.bb_min * extents_data.scale
-                    bbmax = extents_data.bb_max * extents_data.scale
-
-                    corners = [
-                        orientation @ Vector((bbmin.x, bbmin.y, bbmin.z)),
-                        orientation @ Vector((bbmin.x, bbmin.y, bbmax.z)),
-                        orientation @ Vector((bbmin.x, bbmax.y, bbmin.z)),
-                        orientation @ Vector((bbmin.x, bbmax.y, bbmax.z)),
-                        orientation @ Vector((bbmax.x, bbmin.y, bbmin.z)),
-                        orientation @ Vector((bbmax.x, bbmin.y, bbmax.z)),
-                        orientation @ Vector((bbmax.x, bbmax.y, bbmin.z)),
-                        orientation @ Vector((bbmax.x, bbmax.y, bbmax.z))
-                    ]
-
-                    emin = Vector(min(emin[i], bbmin[i]) for i in range(3))
-                    emax = Vector(max(emax[i], bbmax[i]) for i in range(3))
-
-                    stream_bbmin = bbmin - Vector((lod_dist, lod_dist, lod_dist))
-                    stream_bbmax = bbmax + Vector((lod_dist, lod_dist, lod_dist))
-
-                    stream_corners = [
-                        orientation @ Vector((stream_bbmin.x, stream_bbmin.y, stream_bbmin.z)),
-                        orientation @ Vector((stream_bbmin.x, stream_bbmin.y, stream_bbmax.z)),
-                        orientation @ Vector((stream_bbmin.x, stream_bbmax.y, stream_bbmin.z)),
-                        orientation @ Vector((stream_bbmin.x, stream_bbmax.y, stream_bbmax.z)),
-                        orientation @ Vector((stream_bbmax.x, stream_bbmin.y, stream_bbmin.z)),
-                        orientation @ Vector((stream_bbmax.x, stream_bbmin.y, stream_bbmax.z)),
-                        orientation @ Vector((stream_bbmax.x, stream_bbmax.y, stream_bbmin.z)),
-                        orientation @ Vector((stream_bbmax.x, stream_bbmax.y, stream_bbmax.z))
-                    ]
-
-                    for corner in corners:
-                        corner_world = position + corner
-                        emin = Vector(min(emin[i], corner_world[i]) for i in range(3))
-                        emax = Vector(max(emax[i], corner_world[i]) for i in range(3))
-
-                    for stream_corner in stream_corners:
-                        stream_corner_world = position + stream_corner
-                        smin = Vector(min(smin[i], stream_corner_world[i]) for i in range(3))
-                        smax = Vector(max(smax[i], stream_corner_world[i]) for i in range(3))
+            if entities_extents is None:
+                group_bounds = get_entity_objs_bounds(
+                    gather_entity_objs_data(child.children), entity_extents_data, ytyp_archetypes)
+                group_entities_extents = group_entities_extents.union(group_bounds.get_extents())
 
         elif child.sollum_type == SollumType.YMAP_BOX_OCCLUDER_GROUP:
             for box_obj in child.children:
@@ -243,6 +368,13 @@ def generate_ymap_extents(selected_ymap=None):
 
         # TODO: distant lod lights
 
+    if entities_extents is None:
+        entities_extents = group_entities_extents
+    emin = Vector(np.minimum(emin, entities_extents.entities_min))
+    emax = Vector(np.maximum(emax, entities_extents.entities_max))
+    smin = Vector(np.minimum(smin, entities_extents.streaming_min))
+    smax = Vector(np.maximum(smax, entities_extents.streaming_max))
+
     selected_ymap.ymap_properties.entities_extents_min = emin
     selected_ymap.ymap_properties.entities_extents_max = emax
     selected_ymap.ymap_properties.streaming_extents_min = smin
@@ -1,15 +1,24 @@
-from math import ceil
 from ..tools.obb import get_obb, get_obb_extents
 import traceback
 from ..cwxml.flag_preset import FlagPreset
 from ..ybn.properties import BoundFlags, load_flag_presets, flag_presets, get_flag_presets_path
 from ..ybn.collision_materials import create_collision_material_from_index
-from ..tools.boundhelper import create_bound_shape, convert_objs_to_composites, convert_objs_to_single_composite, center_composite_to_children, apply_flag_preset
+from ..tools.boundhelper import (
+    create_bound_shape,
+    convert_objs_to_composites,
+    convert_objs_to_single_composite,
+    center_composite_to_children,
+    apply_flag_preset,
+    get_bound_poly_split_items,
+    split_bound_composite,
+)
+from ..tools.spatialsplit import partition_aabbs, get_parts_aabb_volume
 from ..tools.meshhelper import create_box_from_extents
 from ..sollumz_properties import SollumType, SOLLUMZ_UI_NAMES, BOUND_TYPES, MaterialType, BOUND_POLYGON_TYPES
 from ..sollumz_helper import SOLLUMZ_OT_base
 from ..tools.blenderhelper import get_selected_vertices, get_children_recursive, create_blender_object, create_empty_object, tag_redraw
 import bpy
+import numpy as np
 from mathutils import Vector
 
 
@@ -246,7 +255,8 @@ class SOLLUMZ_OT_convert_to_collision_material(SOLLUMZ_OT_base, bpy.types.Operat
 
 
 class SOLLUMZ_OT_split_collision(SOLLUMZ_OT_base, bpy.types.Operator):
-    """Split a collision into many parts. Sorted based on location"""
+    """Split a collision into many parts. Bound polygons (and the faces of polygon meshes) are grouped by location,
+    minimizing the volume of the bounding boxes of the parts"""
     bl_idname = "sollumz.splitcollision"
     bl_label = "Split Collision"
     bl_action = f"{bl_label}"
@@ -259,7 +269,6 @@ class SOLLUMZ_OT_split_collision(SOLLUMZ_OT_base, bpy.types.Operator):
 
         # Gather all selected collision objects and store as hierarchy
         selected_composites = {}
-        num_bound_polys_selected = 0
         for composite in selected:
             if composite.sollum_type != SollumType.BOUND_COMPOSITE:
                 self.message(
@@ -273,70 +282,38 @@ class SOLLUMZ_OT_split_collision(SOLLUMZ_OT_base, bpy.types.Operator):
                 if bvh.sollum_type == SollumType.BOUND_GEOMETRYBVH:
                     for bound_poly in bvh.children:
                         if bound_poly.sollum_type in BOUND_POLYGON_TYPES:
-                            selected_composites[composite].append(
-                                bound_poly)
-                            num_bound_polys_selected += 1
+                            selected_composites[composite].append(bound_poly)
 
+        scene = context.scene
         # Split objects
         for composite, bound_polys in selected_composites.items():
             composite_name = composite.name
-            composite.name = ""
-
-            parts_per_col = ceil(
-                num_bound_polys_selected / context.scene.split_collision_count)
-
-            if num_bound_polys_selected < parts_per_col:
-                self.message(
-                    f"Can't divide by a value less than the number of Bound Polygon(s) ({num_bound_polys_selected} selected).")
-                return False
-
-            new_composite = None
-
-            for i, bound_poly in enumerate(bound_polys):
-                if i % parts_per_col == 0:
-                    new_composite = create_empty_object(
-                        SollumType.BOUND_COMPOSITE)
-                    # new_composite = create_bound(
-                    #     SollumType.BOUND_COMPOSITE, do_link=False)
-
-                    bound_poly.users_collection[0].objects.link(
-                        new_composite)
-
-                    new_composite.name = composite_name
-                    new_composite.matrix_world = composite.matrix_world
-
-                if new_composite is None:
-                    continue
-
-                if bound_poly is None:
-                    continue
-
-                bound_polys[i] = None
-
-                # new_bvh = create_bound(
-                #     SollumType.BOUND_GEOMETRYBVH, do_link=False)
-                new_bvh = create_empty_object(SollumType.BOUND_GEOMETRYBVH)
-
-                # Link the new empties to the object's collection (not always the active collection)
-                bound_poly.users_collection[0].objects.link(new_bvh)
-
-                bound_poly_mat = bound_poly.matrix_world.copy()
-
-                new_bvh.parent = new_composite
-
-                new_bvh.matrix_world = bound_poly.parent.matrix_world
-                new_bvh.matrix_world.translation = bound_poly.matrix_world.translation
+            items = get_bound_poly_split_items(bound_polys)
+            num_items = len(items.obj_inds)
+            if num_items == 0:
+                self.message(f"{composite_name} has no Bound Polygons, skipping...")
+                continue
 
-                bound_poly.parent = new_bvh
+            parts = partition_aabbs(
+                items.mins, items.maxs,
+                num_parts=scene.split_collision_count,
+                poly_counts=items.poly_counts,
+                max_polys=scene.split_collision_max_polys,
+                count_verts=items.count_verts,
+                max_verts=scene.split_collision_max_verts,
+            )
 
-                bound_poly.matrix_world = bound_poly_mat
-                bound_poly.location = Vector()
+            # Compare against splitting the polygons in the order they are stored
+            naive_parts = np.array_split(np.arange(num_items), len(parts))
+            volume = get_parts_aabb_volume(items.mins, items.maxs, parts)
+            naive_volume = get_parts_aabb_volume(items.mins, items.maxs, naive_parts)
+            improvement = (1.0 - volume / naive_volume) * 100.0 if naive_volume > 0.0 else 0.0
 
-            for child in composite.children:
-                if child.sollum_type == SollumType.BOUND_GEOMETRYBVH:
-                    bpy.data.objects.remove(child)
+            split_bound_composite(composite, items, parts)
 
-            bpy.data.objects.remove(composite)
+            self.message(
+                f"Split {composite_name} ({int(items.poly_counts.sum())} polygons) into {len(parts)} parts. "
+                f"Total bounds volume {volume:.2f} ({improvement:.1f}% less than splitting in order).")
 
         return True
 
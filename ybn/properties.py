@@ -120,6 +120,15 @@ class BoundFlags(bpy.types.PropertyGroup):
     map_deep_surface: bpy.props.BoolProperty(name="MAP DEEP SURFACE", default=False)
 
 
+def make_shape_mesh_single_user(obj: bpy.types.Object):
+    """Gives ``obj`` its own copy of its mesh if it is shared with other objects, so changing the shape of one bound
+    doesn't change the others. Bound primitives can share meshes when imported with the "Share Primitive Meshes"
+    import setting.
+    """
+    if obj.data.users > 1:
+        obj.data = obj.data.copy()
+
+
 class BoundShapeProps(bpy.types.PropertyGroup):
     """Provides properties to modify a bound shape mesh. These properties are calculated from the object bounding box,
     instead of storing the values. By doing so, if the user modifies the mesh by scaling it, the properties don't end
@@ -135,6 +144,7 @@ class BoundShapeProps(bpy.types.PropertyGroup):
 
     def box_extents_setter(self, value: Vector):
         obj = self.id_data
+        make_shape_mesh_single_user(obj)
         create_box(obj.data, 1, Matrix.Diagonal(value))
         tag_redraw(bpy.context, space_type="VIEW_3D", region_type="WINDOW")
 
@@ -160,6 +170,7 @@ class BoundShapeProps(bpy.types.PropertyGroup):
 
     def sphere_radius_setter(self, value: float):
         obj = self.id_data
+        make_shape_mesh_single_user(obj)
         create_sphere(obj.data, value)
         tag_redraw(bpy.context, space_type="VIEW_3D", region_type="WINDOW")
 
@@ -209,6 +220,7 @@ class BoundShapeProps(bpy.types.PropertyGroup):
 
     def capsule_update(self, radius: float, length: float):
         obj = self.id_data
+        make_shape_mesh_single_user(obj)
         create_capsule(obj.data, radius=radius, length=length, axis=self.capsule_axis())
         tag_redraw(bpy.context, space_type="VIEW_3D", region_type="WINDOW")
 
@@ -273,6 +285,7 @@ class BoundShapeProps(bpy.types.PropertyGroup):
 
     def cylinder_update(self, radius: float, length: float):
         obj = self.id_data
+        make_shape_mesh_single_user(obj)
         create_cylinder(obj.data, radius=radius, length=length, axis=self.cylinder_axis())
         tag_redraw(bpy.context, space_type="VIEW_3D", region_type="WINDOW")
 
@@ -448,6 +461,10 @@ def register():
 
     bpy.types.Scene.split_collision_count = bpy.props.IntProperty(
         name="Divide By", description=f"Amount to split {SOLLUMZ_UI_NAMES[SollumType.BOUND_GEOMETRYBVH]}s or {SOLLUMZ_UI_NAMES[SollumType.BOUND_COMPOSITE]}s by", default=2, min=2)
+    bpy.types.Scene.split_collision_max_polys = bpy.props.IntProperty(
+        name="Max Polygons", description="Maximum number of polygons in each part, more parts are created if needed. 0 for no limit", default=0, min=0)
+    bpy.types.Scene.split_collision_max_verts = bpy.props.IntProperty(
+        name="Max Vertices", description="Maximum number of vertices in each part, more parts are created if needed. 0 for no limit", default=0, min=0)
 
     bpy.types.Scene.center_composite_to_selection = bpy.props.BoolProperty(
         name="Center to Selection", description="Center the Bound Composite to all selected objects", default=True)
@@ -474,6 +491,8 @@ def unregister():
     del bpy.types.Scene.create_bound_type
     del bpy.types.Scene.bound_child_type
     del bpy.types.Scene.split_collision_count
+    del bpy.types.Scene.split_collision_max_polys
+    del bpy.types.Scene.split_collision_max_verts
     del bpy.types.Scene.center_composite_to_selection
     del bpy.types.WindowManager.sz_create_bound_box_parent
 
@@ -278,6 +278,9 @@ class SOLLUMZ_PT_COLLISION_SPLIT_TOOL_PANEL(CollisionToolChildPanel, bpy.types.P
         row = layout.row(align=True)
         row.operator(ybn_ops.SOLLUMZ_OT_split_collision.bl_idname, icon="SCULPTMODE_HLT")
         row.prop(context.scene, "split_collision_count")
+        row = layout.row(align=True)
+        row.prop(context.scene, "split_collision_max_polys")
+        row.prop(context.scene, "split_collision_max_verts")
 
 
 class SOLLUMZ_PT_CREATE_BOUND_PANEL(CollisionToolChildPanel, bpy.types.Panel):
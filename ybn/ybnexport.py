@@ -33,6 +33,8 @@ from ..tools.meshhelper import (
     get_color_attr_name,
 )
 from ..sollumz_properties import MaterialType, SOLLUMZ_UI_NAMES, SollumType, BOUND_POLYGON_TYPES
+from ..tools import profiling
+from ..tools.meshcache import evaluated_mesh
 from .. import logger
 from .properties import CollisionMatFlags, get_collision_mat_raw_flags, BoundFlags
 
@@ -103,12 +105,15 @@ def create_composite_xml(
     return composite_xml
 
 
+@profiling.profiled()
 def create_bound_xml(obj: bpy.types.Object, is_root: bool = False) -> BoundChild:
     """Create a ``Bound`` instance based on `obj.sollum_type``."""
     if (obj.type == "MESH" and not has_col_mats(obj)) or (obj.type == "EMPTY" and not bound_geom_has_mats(obj)):
         logger.warning(f"'{obj.name}' has no collision materials! Skipping...")
         return
 
+    profiling.count("bounds")
+
     from ..shared.geometry import (
         get_centroid_of_box, get_mass_properties_of_box,
         get_centroid_of_disc, get_mass_properties_of_disc,
@@ -416,21 +421,19 @@ def create_bound_xml_polys(geom_xml: BoundGeometry | BoundGeometryBVH, obj: bpy.
 
 def create_bound_geom_xml_triangles(obj: bpy.types.Object, geom_xml: BoundGeometry, get_vert_index: Callable[[Vector], int], get_mat_index: Callable[[bpy.types.Material], int]):
     """Create all bound poly triangles and vertices for a ``BoundGeometry`` object."""
-    mesh = create_export_mesh(obj)
-
     transforms = get_bound_poly_transforms_to_apply(obj, geom_xml.composite_transform)
-    triangles = create_poly_xml_triangles(mesh, transforms, get_vert_index, get_mat_index)
+    with evaluated_mesh(obj) as mesh:
+        triangles = create_poly_xml_triangles(mesh, transforms, get_vert_index, get_mat_index)
     geom_xml.polygons = triangles
 
 
 def create_bound_xml_poly_shape(obj: bpy.types.Object, geom_xml: BoundGeometryBVH, get_vert_index: Callable[[Vector], int], get_mat_index: Callable[[bpy.types.Material], int]):
-    mesh = create_export_mesh(obj)
-
     transforms = get_bound_poly_transforms_to_apply(obj, geom_xml.composite_transform)
 
     match obj.sollum_type:
         case SollumType.BOUND_POLY_TRIANGLE:
-            triangles = create_poly_xml_triangles(mesh, transforms, get_vert_index, get_mat_index)
+            with evaluated_mesh(obj) as mesh:
+                triangles = create_poly_xml_triangles(mesh, transforms, get_vert_index, get_mat_index)
             geom_xml.polygons.extend(triangles)
         case SollumType.BOUND_POLY_BOX:
             box_xml = create_poly_box_xml(obj, transforms, get_vert_index, get_mat_index)
@@ -466,17 +469,6 @@ def get_scale_to_apply_to_bound(bound_obj: bpy.types.Object) -> Vector:
     return scale
 
 
-def create_export_mesh(obj: bpy.types.Object):
-    """Get an evaluated mesh from ``obj`` with normals and loop triangles calculated.
-    Original mesh is not affected."""
-    mesh = obj.to_mesh()
-    if bpy.app.version < (4, 1, 0):
-        mesh.calc_normals_split()
-    mesh.calc_loop_triangles()
-
-    return mesh
-
-
 def create_poly_xml_triangles(mesh: bpy.types.Mesh, transforms: Matrix, get_vert_index: Callable[[Vector], int], get_mat_index: Callable[[bpy.types.Material], int]):
     """Create all bound polygon triangle XML objects for this BoundGeometry/BVH."""
     triangles: list[PolyTriangle] = []
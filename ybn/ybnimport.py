@@ -1,6 +1,8 @@
 import os
 import bpy
-from typing import Optional
+from itertools import chain
+from operator import attrgetter
+from typing import Callable, Optional
 import numpy as np
 from numpy.typing import NDArray
 from .properties import CollisionMatFlags, set_collision_mat_raw_flags
@@ -21,6 +23,7 @@ from ..cwxml.bound import (
     Material as ColMaterial
 )
 from ..sollumz_properties import SollumType, SOLLUMZ_UI_NAMES
+from ..sollumz_preferences import get_import_settings
 from .collision_materials import create_collision_material_from_index
 from ..tools.meshhelper import (
     create_box,
@@ -32,6 +35,7 @@ from ..tools.meshhelper import (
 )
 from ..tools.utils import get_direction_of_vectors, get_distance_of_vectors, abs_vector
 from ..tools.blenderhelper import create_blender_object, create_empty_object
+from ..tools import profiling
 from mathutils import Matrix, Vector
 
 
@@ -40,6 +44,7 @@ def import_ybn(filepath):
     return create_bound_composite(ybn_xml.composite, os.path.basename(filepath.replace(YBN.file_extension, "")))
 
 
+@profiling.profiled()
 def create_bound_composite(composite_xml: BoundComposite, name: Optional[str] = None):
     obj = create_empty_object(SollumType.BOUND_COMPOSITE, name)
 
@@ -54,8 +59,10 @@ def create_bound_composite(composite_xml: BoundComposite, name: Optional[str] =
     return obj
 
 
+@profiling.profiled()
 def create_bound_object(bound_xml: BoundChild | Bound):
     """Create a bound object based on ``bound_xml.type``"""
+    profiling.count("bounds")
     if bound_xml.type == "Box":
         return create_bound_box(bound_xml)
 
@@ -216,22 +223,48 @@ def set_bound_col_material_properties(bound_xml: Bound, mat: bpy.types.Material)
 
 
 def create_bvh_polys(bvh: BoundGeometryBVH, materials: list[bpy.types.Material], bvh_obj: bpy.types.Object):
+    # Poly shapes with the same dimensions and material can use the same mesh
+    shared_meshes = {} if get_import_settings().ybn_share_poly_meshes else None
+
+    poly_objs = []
     for poly in bvh.polygons:
         if type(poly) is PolyTriangle:
             continue
 
-        poly_obj = poly_to_obj(poly, materials, bvh.vertices)
+        poly_obj = poly_to_obj(poly, materials, bvh.vertices, shared_meshes)
 
-        bpy.context.collection.objects.link(poly_obj)
         poly_obj.location += bvh.geometry_center
         poly_obj.parent = bvh_obj
+        poly_objs.append(poly_obj)
+
+    collection_objects = bpy.context.collection.objects
+    for poly_obj in poly_objs:
+        collection_objects.link(poly_obj)
+
+
+def init_poly_obj(
+    poly,
+    sollum_type,
+    materials,
+    create_shape: Callable[[bpy.types.Mesh], None],
+    shape_key: tuple = (),
+    shared_meshes: Optional[dict[tuple, bpy.types.Mesh]] = None,
+):
+    """Create a poly shape object. The mesh is built by ``create_shape``, unless ``shared_meshes`` already contains a
+    mesh for this shape type, ``shape_key`` (the shape dimensions) and material.
+    """
+    name = SOLLUMZ_UI_NAMES[sollum_type]
 
+    mesh_key = (sollum_type, poly.material_index, *shape_key)
+    mesh = shared_meshes.get(mesh_key, None) if shared_meshes is not None else None
+    if mesh is None:
+        mesh = bpy.data.meshes.new(name)
+        if poly.material_index < len(materials):
+            mesh.materials.append(materials[poly.material_index])
+        create_shape(mesh)
 
-def init_poly_obj(poly, sollum_type, materials):
-    name = SOLLUMZ_UI_NAMES[sollum_type]
-    mesh = bpy.data.meshes.new(name)
-    if poly.material_index < len(materials):
-        mesh.materials.append(materials[poly.material_index])
+        if shared_meshes is not None:
+            shared_meshes[mesh_key] = mesh
 
     obj = bpy.data.objects.new(name, mesh)
     obj.sollum_type = sollum_type.value
@@ -239,8 +272,9 @@ def init_poly_obj(poly, sollum_type, materials):
     return obj
 
 
-def create_poly_box(poly, materials, vertices):
-    obj = init_poly_obj(poly, SollumType.BOUND_POLY_BOX, materials)
+def create_poly_box(poly, materials, vertices, shared_meshes=None):
+    obj = init_poly_obj(poly, SollumType.BOUND_POLY_BOX, materials,
+                        lambda mesh: create_box(mesh, size=1), shared_meshes=shared_meshes)
 
     v1 = vertices[poly.v1]
     v2 = vertices[poly.v2]
@@ -306,33 +340,34 @@ def create_poly_box(poly, materials, vertices):
     mat[1] = edge1.y, edge2.y, edge3.y, center.y
     mat[2] = edge1.z, edge2.z, edge3.z, center.z
 
-    create_box(obj.data, size=1)
     obj.matrix_basis = mat
 
     return obj
 
 
-def create_poly_sphere(poly, materials, vertices):
-    sphere = init_poly_obj(poly, SollumType.BOUND_POLY_SPHERE, materials)
-    create_sphere(sphere.data, poly.radius)
+def create_poly_sphere(poly, materials, vertices, shared_meshes=None):
+    radius = poly.radius
+    sphere = init_poly_obj(poly, SollumType.BOUND_POLY_SPHERE, materials,
+                           lambda mesh: create_sphere(mesh, radius), (radius,), shared_meshes)
     sphere.location = vertices[poly.v]
     return sphere
 
-def create_poly_capsule(poly, materials, vertices):
-    capsule = init_poly_obj(poly, SollumType.BOUND_POLY_CAPSULE, materials)
+def create_poly_capsule(poly, materials, vertices, shared_meshes=None):
     v1 = vertices[poly.v1]
     v2 = vertices[poly.v2]
     rot = get_direction_of_vectors(v1, v2)
+    radius = poly.radius
     length = (v1 - v2).length
-    create_capsule(capsule.data, radius=poly.radius, length=length, axis="Z")
+    capsule = init_poly_obj(poly, SollumType.BOUND_POLY_CAPSULE, materials,
+                            lambda mesh: create_capsule(mesh, radius=radius, length=length, axis="Z"),
+                            (radius, length), shared_meshes)
 
     capsule.location = (v1 + v2) / 2
     capsule.rotation_euler = rot
 
     return capsule
 
-def create_poly_cylinder(poly, materials, vertices):
-    cylinder = init_poly_obj(poly, SollumType.BOUND_POLY_CYLINDER, materials)
+def create_poly_cylinder(poly, materials, vertices, shared_meshes=None):
     v1 = vertices[poly.v1]
     v2 = vertices[poly.v2]
 
@@ -340,7 +375,9 @@ def create_poly_cylinder(poly, materials, vertices):
 
     radius = poly.radius
     length = get_distance_of_vectors(v1, v2)
-    create_cylinder(cylinder.data, radius=radius, length=length, axis="Z")
+    cylinder = init_poly_obj(poly, SollumType.BOUND_POLY_CYLINDER, materials,
+                             lambda mesh: create_cylinder(mesh, radius=radius, length=length, axis="Z"),
+                             (radius, length), shared_meshes)
 
     cylinder.matrix_world = Matrix()
 
@@ -356,71 +393,133 @@ POLY_TO_OBJ_MAP = {
     PolyCylinder: create_poly_cylinder,
 }
 
-def poly_to_obj(poly, materials, vertices) -> bpy.types.Object:
-    return POLY_TO_OBJ_MAP[type(poly)](poly, materials, vertices)
+def poly_to_obj(poly, materials, vertices, shared_meshes=None) -> bpy.types.Object:
+    return POLY_TO_OBJ_MAP[type(poly)](poly, materials, vertices, shared_meshes)
 
 
 def get_poly_triangles(polys: list[Polygon]):
     return [poly for poly in polys if isinstance(poly, PolyTriangle)]
 
 
+def get_poly_triangles_arrays(triangles: list[PolyTriangle]) -> tuple[NDArray[np.uint32], NDArray[np.uint32]]:
+    """Gets the vertex indices (array of shape (n, 3)) and material indices (array of shape (n,)) of the triangles."""
+    get_tri_data = attrgetter("v1", "v2", "v3", "material_index")
+    tri_data = np.fromiter(
+        chain.from_iterable(map(get_tri_data, triangles)), dtype=np.uint32, count=len(triangles) * 4
+    ).reshape((len(triangles), 4))
+    return tri_data[:, :3], tri_data[:, 3]
+
+
+def get_bound_vertices_array(vertices: list[Vector]) -> NDArray[np.float32]:
+    return np.fromiter(chain.from_iterable(vertices), dtype=np.float32, count=len(vertices) * 3).reshape((-1, 3))
+
+
+def get_bound_vertex_colors_array(vertex_colors: list[tuple[int, int, int, int]]) -> NDArray[np.uint8]:
+    return np.fromiter(chain.from_iterable(vertex_colors), dtype=np.uint8, count=len(vertex_colors) * 4).reshape((-1, 4))
+
+
 def create_bound_mesh_data(
     vertices: list[Vector],
     triangles: list[PolyTriangle],
     vertex_colors: Optional[list[tuple[int, int, int, int]]],
     materials: list[bpy.types.Material]
 ) -> bpy.types.Mesh:
+    tri_inds, tri_mat_inds = get_poly_triangles_arrays(triangles)
+    return create_bound_mesh_data_from_arrays(
+        get_bound_vertices_array(vertices),
+        tri_inds,
+        tri_mat_inds,
+        get_bound_vertex_colors_array(vertex_colors) if vertex_colors else None,
+        materials
+    )
+
+
+def create_bound_mesh_data_from_arrays(
+    vertices: NDArray[np.float32],
+    tri_inds: NDArray[np.uint32],
+    tri_mat_inds: NDArray[np.uint32],
+    vertex_colors: Optional[NDArray[np.uint8]],
+    materials: list[bpy.types.Material]
+) -> bpy.types.Mesh:
+    """Creates the mesh of a bound geometry from the bound vertices (array of shape (v, 3)), the triangle vertex
+    indices (array of shape (n, 3)), the triangle material indices (array of shape (n,)) and optionally the vertex
+    colors (array of shape (v, 4)).
+    """
     mesh = bpy.data.meshes.new(SOLLUMZ_UI_NAMES[SollumType.BOUND_GEOMETRY])
 
-    verts, faces, colors = get_bound_geom_mesh_data(vertices, triangles, vertex_colors)
+    verts, faces, colors = get_bound_geom_mesh_data(vertices, tri_inds, vertex_colors)
 
-    mesh.from_pydata(verts, [], faces)
+    num_verts = len(verts)
+    num_faces = len(faces)
+    mesh.vertices.add(num_verts)
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(num_faces * 3)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(num_faces)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, num_faces * 3, 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
 
     if colors is not None:
         create_color_attr(mesh, 0, initial_values=colors)
 
-    apply_bound_geom_materials(mesh, triangles, materials)
+    apply_bound_geom_materials(mesh, tri_mat_inds, materials)
 
     mesh.validate()
 
     return mesh
 
 
-def apply_bound_geom_materials(mesh: bpy.types.Mesh, triangles: list[PolyTriangle], materials: list[bpy.types.Material]):
+def apply_bound_geom_materials(mesh: bpy.types.Mesh, tri_mat_inds: NDArray[np.uint32], materials: list[bpy.types.Material]):
     for mat in materials:
         mesh.materials.append(mat)
 
-    for i, poly_xml in enumerate(triangles):
-        mesh.polygons[i].material_index = poly_xml.material_index
+    if len(tri_mat_inds) > 0:
+        mesh.polygons.foreach_set("material_index", tri_mat_inds.astype(np.int32))
 
 
 def get_bound_geom_mesh_data(
-    vertices: list[Vector],
-    triangles: list[PolyTriangle],
-    vertex_colors: Optional[list[tuple[int, int, int, int]]]
-) -> tuple[list, list, Optional[NDArray]]:
-    def _color_to_float(color_int: tuple[int, int, int, int]):
-        return (color_int[0] / 255, color_int[1] / 255, color_int[2] / 255, color_int[3] / 255)
-
-    verts = []
-    verts_dict = {}
-    faces = []
-    colors = [] if vertex_colors else None
-
-    for poly in triangles:
-        face = []
-        for v in [vertices[poly.v1], vertices[poly.v2], vertices[poly.v3]]:
-            v_tuple = tuple(v)
-            if v_tuple not in verts_dict:
-                verts_dict[v_tuple] = len(verts)
-                verts.append(v)
-            face.append(verts_dict[v_tuple])
-        faces.append(face)
-
-        if colors is not None:
-            colors.extend(_color_to_float(vertex_colors[v]) for v in [poly.v1, poly.v2, poly.v3])
-
-    return verts, faces, np.array(colors, dtype=np.float64) if colors is not None else None
+    vertices: NDArray[np.float32],
+    tri_inds: NDArray[np.uint32],
+    vertex_colors: Optional[NDArray[np.uint8]]
+) -> tuple[NDArray[np.float32], NDArray[np.int32], Optional[NDArray[np.float32]]]:
+    """Gets the vertex positions and faces of the mesh, with vertices at the same position merged, and the face corner
+    colors. Only vertices referenced by the triangles are included, in the order they are first referenced.
+    """
+    flat_tri_inds = tri_inds.ravel()
+    if len(flat_tri_inds) > 0:
+        # Vertices referenced by the triangles and the first corner each one appears in
+        used_inds, first_corners, corner_used_inds = np.unique(flat_tri_inds, return_index=True, return_inverse=True)
+        # Adding 0.0 turns -0.0 into 0.0 so both are merged
+        used_verts = vertices[used_inds] + np.float32(0.0)
+
+        # Group vertices at the same position, sorting them by their bits is a lot faster than np.unique(axis=0)
+        used_verts_bits = used_verts.view(np.uint32)
+        sort_order = np.lexsort((used_verts_bits[:, 2], used_verts_bits[:, 1], used_verts_bits[:, 0]))
+        sorted_bits = used_verts_bits[sort_order]
+        group_starts_mask = np.empty(len(sort_order), dtype=bool)
+        group_starts_mask[0] = True
+        np.any(sorted_bits[1:] != sorted_bits[:-1], axis=1, out=group_starts_mask[1:])
+        group_starts = np.flatnonzero(group_starts_mask)
+        used_groups = np.empty(len(sort_order), dtype=np.int64)
+        used_groups[sort_order] = np.cumsum(group_starts_mask) - 1
+
+        # Keep the vertices in the order they are first referenced by the triangles
+        group_first_corners = np.minimum.reduceat(first_corners[sort_order], group_starts)
+        group_order = np.argsort(group_first_corners, kind="stable")
+        group_ranks = np.empty_like(group_order)
+        group_ranks[group_order] = np.arange(len(group_order))
+
+        verts = used_verts[sort_order[group_starts[group_order]]]
+        faces = group_ranks[used_groups[corner_used_inds.ravel()]].astype(np.int32).reshape((-1, 3))
+    else:
+        verts = np.empty((0, 3), dtype=np.float32)
+        faces = np.empty((0, 3), dtype=np.int32)
+
+    colors = None
+    if vertex_colors is not None:
+        colors = vertex_colors[tri_inds.ravel()] / np.float32(255)
+
+    return verts, faces, colors
 
 
 def set_bound_child_properties(bound_xml: BoundChild, bound_obj: bpy.types.Object):
@@ -2,10 +2,13 @@ import bpy
 from mathutils import Vector, Quaternion
 import math
 import struct
+import numpy as np
+from numpy.typing import NDArray
 from ..cwxml import clipdictionary as ycdxml
 from ..sollumz_properties import SollumType
-from ..tools import jenkhash
+from ..tools import jenkhash, profiling
 from ..tools.blenderhelper import build_name_bone_map, build_bone_map
+from ..tools.fcurvesampler import sample_fcurve
 from ..tools.animationhelper import (
     Track,
     TrackFormat,
@@ -18,6 +21,8 @@ from ..tools.animationhelper import (
     get_action_duration_frames,
     get_action_duration_secs,
     get_action_export_frame_count,
+    rotate_quaternions,
+    make_quaternions_compatible,
 )
 from .properties import ClipAttribute, ClipTag, calculate_final_uv_transform_matrix
 
@@ -42,19 +47,25 @@ def parse_uv_transform_data_path(data_path: str) -> tuple[int, str]:
     return index, prop
 
 
-TrackFramesData = list[Vector] | list[Quaternion] | list[float]
+# Frames data of a track: array of shape (frames, 3) for Vector3 tracks, (frames, 4) for Quaternion tracks in (w, x, y,
+# z) order and (frames,) for Float tracks
+TrackFramesData = NDArray[np.float32]
 SequenceItems = dict[int, dict[Track, TrackFramesData]]
 
 
+def get_action_export_frames(action: bpy.types.Action, export_frame_count: int) -> NDArray[np.float64]:
+    """Gets the action frame of each exported frame, evenly distributed through the action frame range."""
+    frame_start, frame_end = action.frame_range
+    export_last_frame_index = max(export_frame_count - 1, 1)
+    return frame_start + (np.arange(export_frame_count) / export_last_frame_index) * (frame_end - frame_start)
+
+
 def sequence_items_from_action(
         action: bpy.types.Action,
         target_id: bpy.types.ID
 ) -> SequenceItems:
-    action_frame_range = action.frame_range
     export_frame_count = get_action_export_frame_count(action)
-    def _export_frame_to_action_frame(frame_index: int) -> float:
-        export_last_frame_index = export_frame_count - 1
-        return action_frame_range[0] + (frame_index / export_last_frame_index) * (action_frame_range[1] - action_frame_range[0])
+    export_frames = get_action_export_frames(action, export_frame_count)
 
     target = get_target_from_id(target_id)
     target_is_armature = isinstance(target_id, bpy.types.Armature)
@@ -101,19 +112,18 @@ def sequence_items_from_action(
                     default_vec = (0.0, 1.0, 0.0)
                 else:
                     default_vec = (0.0, 0.0, 0.0)
-                bone_sequences[track] = [Vector(default_vec) for _ in range(export_frame_count)]
+                bone_sequences[track] = np.tile(np.array(default_vec, dtype=np.float32), (export_frame_count, 1))
             elif track_format == TrackFormat.Quaternion:
-                bone_sequences[track] = [Quaternion((1.0, 0.0, 0.0, 0.0)) for _ in range(export_frame_count)]
+                bone_sequences[track] = np.tile(np.array((1.0, 0.0, 0.0, 0.0), dtype=np.float32),
+                                                (export_frame_count, 1))
             elif track_format == TrackFormat.Float:
-                bone_sequences[track] = [0.0] * export_frame_count
+                bone_sequences[track] = np.zeros(export_frame_count, dtype=np.float32)
 
-        track_sequence = bone_sequences[track]
-        for frame_id in range(export_frame_count):
-            value = fcurve.evaluate(_export_frame_to_action_frame(frame_id))
-            if track_format == TrackFormat.Float:
-                track_sequence[frame_id] = value
-            else:
-                track_sequence[frame_id][comp_index] = value
+        values = sample_fcurve(fcurve, export_frames)
+        if track_format == TrackFormat.Float:
+            bone_sequences[track] = values
+        else:
+            bone_sequences[track][:, comp_index] = values
 
     if target_is_armature:
         # transform bones from pose space to local space
@@ -121,25 +131,25 @@ def sequence_items_from_action(
             transform_mat = calculate_bone_space_transform_matrix(bone_map.get(bone_id, None), None)
 
             if Track.BonePosition in bone_sequences:
+                mat = np.array(transform_mat, dtype=np.float64)
                 vecs = bone_sequences[Track.BonePosition]
-                for i in range(export_frame_count):
-                    vecs[i] = transform_mat @ vecs[i]
+                bone_sequences[Track.BonePosition] = (vecs @ mat[:3, :3].T + mat[:3, 3]).astype(np.float32)
 
             if Track.BoneRotation in bone_sequences:
+                rotation = np.array(transform_mat.to_quaternion(), dtype=np.float64)
                 quats = bone_sequences[Track.BoneRotation]
-                for i in range(export_frame_count):
-                    quats[i].rotate(transform_mat)
+                bone_sequences[Track.BoneRotation] = rotate_quaternions(quats, rotation).astype(np.float32)
 
     if target_is_camera:
         # see animationhelper.transform_camera_rotation_quaternion
-        angle_delta = math.radians(-90.0)
-        x_axis = Vector((1.0, 0.0, 0.0))
+        # Rotating around the camera local X axis, same as `q.rotate(Quaternion(q @ x_axis, angle_delta))`
+        rotation = np.array(Quaternion((1.0, 0.0, 0.0), math.radians(-90.0)), dtype=np.float64)
         for bone_id, bone_sequences in sequence_items.items():
             if Track.CameraRotation in bone_sequences:
                 quats = bone_sequences[Track.CameraRotation]
-                for i in range(export_frame_count):
-                    x_axis_local = quats[i] @ x_axis
-                    quats[i].rotate(Quaternion(x_axis_local, angle_delta))
+                bone_sequences[Track.CameraRotation] = rotate_quaternions(
+                    quats, rotation, rotation_first=False
+                ).astype(np.float32)
 
     if target_id is not None and len(uv_transforms_fcurves) > 0:
         # copy the UV transforms defined by the user to apply f-curves on them without modifying the original ones
@@ -156,31 +166,33 @@ def sequence_items_from_action(
 
             bone_sequences = sequence_items[bone_id]
 
+            fcurves_values = []
+            for fcurve in fcurves:
+                transform_index, prop_name = parse_uv_transform_data_path(fcurve.data_path)
+                fcurves_values.append((
+                    uv_transforms[transform_index], prop_name, fcurve.array_index,
+                    sample_fcurve(fcurve, export_frames).tolist()
+                ))
+
             # compute uv0/uv1 from uv_transform
-            bone_sequences[Track.UV0] = [Vector((0.0, 0.0, 0.0)) for _ in range(export_frame_count)]
-            bone_sequences[Track.UV1] = [Vector((0.0, 0.0, 0.0)) for _ in range(export_frame_count)]
-            uv0_sequence = bone_sequences[Track.UV0]
-            uv1_sequence = bone_sequences[Track.UV1]
+            uv0_sequence = np.zeros((export_frame_count, 3), dtype=np.float32)
+            uv1_sequence = np.zeros((export_frame_count, 3), dtype=np.float32)
             for frame_id in range(export_frame_count):
                 # apply f-curves to UV transforms
-                for fcurve in fcurves:
-                    value = fcurve.evaluate(_export_frame_to_action_frame(frame_id))
-                    transform_index, prop_name = parse_uv_transform_data_path(fcurve.data_path)
-
-                    prop = getattr(uv_transforms[transform_index], prop_name)
+                for uv_transform, prop_name, comp_index, values in fcurves_values:
+                    value = values[frame_id]
+                    prop = getattr(uv_transform, prop_name)
                     if isinstance(prop, float):
-                        setattr(uv_transforms[transform_index], prop_name, value)
+                        setattr(uv_transform, prop_name, value)
                     else:  # Vector
-                        comp_index = fcurve.array_index
                         prop[comp_index] = value
 
                 mat = calculate_final_uv_transform_matrix(uv_transforms)
-                uv0_sequence[frame_id][0] = mat[0][0]
-                uv0_sequence[frame_id][1] = mat[0][1]
-                uv0_sequence[frame_id][2] = mat[0][2]
-                uv1_sequence[frame_id][0] = mat[1][0]
-                uv1_sequence[frame_id][1] = mat[1][1]
-                uv1_sequence[frame_id][2] = mat[1][2]
+                uv0_sequence[frame_id] = mat[0]
+                uv1_sequence[frame_id] = mat[1]
+
+            bone_sequences[Track.UV0] = uv0_sequence
+            bone_sequences[Track.UV1] = uv1_sequence
 
         uv_transforms.clear()
 
@@ -213,9 +225,7 @@ def sequence_items_from_action(
             if quats is None:
                 continue
 
-            for i in range(1, export_frame_count):
-                if quats[i - 1].dot(quats[i]) < 0:
-                    quats[i] *= -1
+            bone_sequences[track] = make_quaternions_compatible(quats)
     # WARNING: ANY OPERATION WITH ROTATION WILL CAUSE SIGN CHANGE. PROCEED ANYTHING BEFORE FIX.
 
     return sequence_items
@@ -269,14 +279,9 @@ def sequence_data_from_frames_data(
     track_format = TrackFormatMap[track]
 
     if track_format == TrackFormat.Vector3:
-        values_x = []
-        values_y = []
-        values_z = []
-
-        for vector in frames_data:
-            values_x.append(vector.x)
-            values_y.append(vector.y)
-            values_z.append(vector.z)
+        values_x = frames_data[:, 0].tolist()
+        values_y = frames_data[:, 1].tolist()
+        values_z = frames_data[:, 2].tolist()
 
         uniq_x = list(set(values_x))
         len_uniq_x = len(uniq_x)
@@ -289,7 +294,7 @@ def sequence_data_from_frames_data(
 
         if len_uniq_x == 1 and len_uniq_y == 1 and len_uniq_z == 1:
             channel = ycdxml.ChannelsList.StaticVector3()
-            channel.value = frames_data[0]
+            channel.value = Vector(frames_data[0])
 
             sequence_data.channels.append(channel)
         else:
@@ -297,16 +302,10 @@ def sequence_data_from_frames_data(
             sequence_data.channels.append(build_values_channel(values_y, uniq_y))
             sequence_data.channels.append(build_values_channel(values_z, uniq_z))
     elif track_format == TrackFormat.Quaternion:
-        values_x = []
-        values_y = []
-        values_z = []
-        values_w = []
-
-        for quat in frames_data:
-            values_x.append(quat.x)
-            values_y.append(quat.y)
-            values_z.append(quat.z)
-            values_w.append(quat.w)
+        values_w = frames_data[:, 0].tolist()
+        values_x = frames_data[:, 1].tolist()
+        values_y = frames_data[:, 2].tolist()
+        values_z = frames_data[:, 3].tolist()
 
         uniq_x = list(set(values_x))
         len_uniq_x = len(uniq_x)
@@ -322,7 +321,7 @@ def sequence_data_from_frames_data(
 
         if len_uniq_x == 1 and len_uniq_y == 1 and len_uniq_z == 1 and len_uniq_w == 1:
             channel = ycdxml.ChannelsList.StaticQuaternion()
-            channel.value = frames_data[0]
+            channel.value = Quaternion(frames_data[0])
 
             sequence_data.channels.append(channel)
         else:
@@ -331,13 +330,14 @@ def sequence_data_from_frames_data(
             sequence_data.channels.append(build_values_channel(values_z, uniq_z))
             sequence_data.channels.append(build_values_channel(values_w, uniq_w))
     elif track_format == TrackFormat.Float:
-        values = frames_data
+        values = frames_data.tolist()
         uniq = list(set(values))
         sequence_data.channels.append(build_values_channel(values, uniq))
 
     return sequence_data
 
 
+@profiling.profiled()
 def animation_from_object(animation_obj: bpy.types.Object) -> ycdxml.Animation:
     animation = ycdxml.Animation()
 
@@ -348,6 +348,7 @@ def animation_from_object(animation_obj: bpy.types.Object) -> ycdxml.Animation:
     animation.hash = animation_properties.hash
     animation.frame_count = export_frame_count
     animation.sequence_frame_limit = export_frame_count + 30
+    profiling.count("frames", export_frame_count)
     animation.duration = get_action_duration_secs(action)
     animation.unknown10 = AnimationFlag.Default
 
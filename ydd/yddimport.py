@@ -3,7 +3,7 @@ import os
 from typing import Optional
 from ..cwxml.drawable import YDD, DrawableDictionary, Skeleton
 from ..cwxml.fragment import YFT, Fragment
-from ..ydr.ydrimport import create_drawable_obj, create_drawable_skel, apply_rotation_limits
+from ..ydr.ydrimport import create_drawable_obj, create_drawable_skel, apply_rotation_limits, use_shared_meshes
 from ..sollumz_properties import SollumType
 from ..sollumz_preferences import get_import_settings
 from ..tools.blenderhelper import create_empty_object, create_blender_object
@@ -17,13 +17,14 @@ def import_ydd(filepath: str):
 
     ydd_xml = YDD.from_xml_file(filepath)
 
-    if import_settings.import_ext_skeleton:
-        skel_yft = load_external_skeleton(filepath)
+    with use_shared_meshes(import_settings.share_identical_meshes):
+        if import_settings.import_ext_skeleton:
+            skel_yft = load_external_skeleton(filepath)
 
-        if skel_yft is not None and skel_yft.drawable.skeleton is not None:
-            return create_ydd_obj_ext_skel(ydd_xml, filepath, skel_yft)
+            if skel_yft is not None and skel_yft.drawable.skeleton is not None:
+                return create_ydd_obj_ext_skel(ydd_xml, filepath, skel_yft)
 
-    return create_ydd_obj(ydd_xml, filepath)
+        return create_ydd_obj(ydd_xml, filepath)
 
 
 def load_external_skeleton(ydd_filepath: str) -> Optional[Fragment]:
@@ -0,0 +1,50 @@
+"""Joins the vertex and index buffers of several geometries into a single geometry."""
+import numpy as np
+from numpy.typing import NDArray
+
+from ..cwxml.drawable import VertexBuffer
+
+
+def get_vert_offsets(vert_counts: list[int]) -> NDArray[np.int64]:
+    """Gets the index of the first vertex of each vertex buffer in the joined buffer, plus the total vertex count
+    at the end.
+    """
+    offsets = np.zeros(len(vert_counts) + 1, dtype=np.int64)
+    np.cumsum(vert_counts, out=offsets[1:])
+    return offsets
+
+
+def get_joined_vert_arr_dtype(vert_arrs: list[NDArray]) -> np.dtype:
+    """Create a new structured dtype containing all vertex attrs present in all vert_arrs. The attrs are in the same
+    order as ``VertexBuffer.VERT_ATTR_DTYPES``, independently of the order of the arrays.
+    """
+    attr_names = set()
+    for vert_arr in vert_arrs:
+        attr_names.update(vert_arr.dtype.names)
+
+    return np.dtype([attr_dtype for attr_name, attr_dtype in VertexBuffer.VERT_ATTR_DTYPES.items() if attr_name in attr_names])
+
+
+def join_vert_arrs(vert_arrs: list[NDArray]) -> NDArray:
+    """Join vertex buffer structured arrays. Works with arrays that have different layouts, attrs missing from an
+    array are zero-filled.
+    """
+    offsets = get_vert_offsets([len(vert_arr) for vert_arr in vert_arrs])
+    joined_arr = np.zeros(offsets[-1], dtype=get_joined_vert_arr_dtype(vert_arrs))
+
+    for vert_arr, start, end in zip(vert_arrs, offsets[:-1], offsets[1:]):
+        # View of the attrs of this array in its own order, copies all the attrs in one assignment
+        joined_arr[list(vert_arr.dtype.names)][start:end] = vert_arr
+
+    return joined_arr
+
+
+def join_ind_arrs(ind_arrs: list[NDArray[np.uint32]], vert_counts: list[int]) -> NDArray[np.uint32]:
+    """Join vertex index arrays by simply concatenating and offsetting indices based on vertex counts"""
+    if not ind_arrs:
+        return np.empty(0, dtype=np.uint32)
+
+    offsets = get_vert_offsets(vert_counts)[:-1].astype(np.uint32)
+    joined_arr = np.concatenate(ind_arrs).astype(np.uint32, copy=False)
+    joined_arr += np.repeat(offsets, [len(ind_arr) for ind_arr in ind_arrs])
+    return joined_arr
@@ -0,0 +1,121 @@
+"""Splits geometry vertex and index buffers into chunks that can be indexed with 16-bit indices."""
+import numpy as np
+from numpy.typing import NDArray
+
+from ..tools.spatialsplit import partition_aabbs
+
+# Index 0xFFFF is avoided, some tools treat it as a primitive restart
+MAX_CHUNK_VERTICES = 0xFFFF
+# Number of triangles checked at once while filling a chunk
+_CHUNK_WINDOW_TRIANGLES = 0x8000
+
+
+def get_triangle_chunks(
+    faces: NDArray[np.uint32],
+    num_verts: int,
+    max_verts: int = MAX_CHUNK_VERTICES,
+) -> list[NDArray[np.int64]]:
+    """Splits the triangles ``faces`` (array of shape (n, 3)) in order into consecutive chunks that use at most
+    ``max_verts`` vertices each. ``num_verts`` is the size of the vertex buffer ``faces`` refer to.
+
+    Returns the indices of the triangles in each chunk.
+    """
+    num_faces = len(faces)
+    # Vertices already used by the current chunk
+    in_chunk = np.zeros(num_verts, dtype=bool)
+    chunks = []
+    chunk_start = 0
+    chunk_num_verts = 0
+    window_start = 0
+    while window_start < num_faces:
+        window_end = min(window_start + _CHUNK_WINDOW_TRIANGLES, num_faces)
+        window = faces[window_start:window_end].reshape(-1)
+
+        # A vertex is new to the chunk at its first occurrence in the window, if no previous window already used it
+        _, first_occurrences = np.unique(window, return_index=True)
+        is_new = np.zeros(len(window), dtype=bool)
+        is_new[first_occurrences] = True
+        is_new &= ~in_chunk[window]
+        chunk_num_verts_per_face = chunk_num_verts + np.cumsum(is_new.reshape(-1, 3).sum(axis=1))
+
+        num_fitting_faces = int(np.searchsorted(chunk_num_verts_per_face, max_verts, side="right"))
+        fitting = window[:num_fitting_faces * 3]
+        in_chunk[fitting] = True
+        if num_fitting_faces == window_end - window_start:
+            chunk_num_verts = int(chunk_num_verts_per_face[-1])
+            window_start = window_end
+            continue
+
+        # Chunk is full, the next one starts with the first triangle that didn't fit
+        window_start += num_fitting_faces
+        chunks.append(np.arange(chunk_start, window_start))
+        in_chunk[faces[chunk_start:window_start].reshape(-1)] = False
+        chunk_start = window_start
+        chunk_num_verts = 0
+
+    if chunk_start < num_faces:
+        chunks.append(np.arange(chunk_start, num_faces))
+
+    return chunks
+
+
+def get_triangle_chunks_spatial(
+    faces: NDArray[np.uint32],
+    positions: NDArray[np.float32],
+    max_verts: int = MAX_CHUNK_VERTICES,
+) -> list[NDArray[np.int64]]:
+    """Splits the triangles ``faces`` (array of shape (n, 3)) into spatially coherent chunks that use at most
+    ``max_verts`` vertices each. Nearby triangles usually share vertices, so fewer vertices are duplicated between
+    chunks than when splitting in order. The triangles of each chunk keep their original order.
+
+    Returns the indices of the triangles in each chunk.
+    """
+    face_positions = positions[faces]
+
+    def _count_verts(inds: NDArray[np.int64]) -> int:
+        return len(np.unique(faces[inds]))
+
+    parts = partition_aabbs(
+        face_positions.min(axis=1),
+        face_positions.max(axis=1),
+        count_verts=_count_verts,
+        max_verts=max_verts,
+    )
+    return [np.sort(part) for part in parts]
+
+
+def split_vert_buffers(
+    vert_buffer: NDArray,
+    ind_buffer: NDArray[np.uint32],
+    max_verts: int = MAX_CHUNK_VERTICES,
+    spatial: bool = True,
+) -> tuple[tuple[NDArray], tuple[NDArray[np.uint32]]]:
+    """Splits vertex and index buffers on chunks of whole triangles that use at most ``max_verts`` vertices, so they
+    fit in 16-bit indices. If ``spatial`` is true, the triangles are grouped by position, otherwise they are split in
+    order. Buffers that already fit are returned as is.
+
+    Returns tuple of split vertex buffers and tuple of index buffers.
+    """
+    if len(vert_buffer) <= max_verts:
+        return (vert_buffer,), (ind_buffer,)
+
+    faces = ind_buffer.reshape((-1, 3))
+    if spatial:
+        chunks = get_triangle_chunks_spatial(faces, vert_buffer["Position"], max_verts)
+    else:
+        chunks = get_triangle_chunks(faces, len(vert_buffer), max_verts)
+
+    split_vert_arrs = []
+    split_ind_arrs = []
+    for chunk in chunks:
+        chunk_inds = faces[chunk].reshape(-1)
+        # Vertices in order of first use in the chunk
+        unique_inds, first_occurrences, inverse = np.unique(chunk_inds, return_index=True, return_inverse=True)
+        order = np.argsort(first_occurrences, kind="stable")
+        new_inds = np.empty(len(order), dtype=np.uint32)
+        new_inds[order] = np.arange(len(order), dtype=np.uint32)
+
+        split_vert_arrs.append(vert_buffer[unique_inds[order]])
+        split_ind_arrs.append(new_inds[inverse.reshape(-1)])
+
+    return tuple(split_vert_arrs), tuple(split_ind_arrs)
@@ -303,7 +303,8 @@ def convert_light_instance_to_light_xml(li: LightInstance) -> Light:
     light.cone_outer_angle = li.cone_outer_angle
     light.extent = _text_list_to_vec(li.extents)
     light.shadow_blur = li.shadow_blur
-    light.projected_texture_hash = f"hash_{li.projected_texture_key:08X}" if li.projected_texture_key != 0 else ""
+    from ..tools.jenkhash import hash_to_name
+    light.projected_texture_hash = hash_to_name(li.projected_texture_key) if li.projected_texture_key != 0 else ""
     return light
 
 
@@ -8,6 +8,7 @@ from ..tools.meshhelper import (
     flip_uvs,
 )
 from mathutils import Vector
+from ..tools import profiling
 from .. import logger
 
 
@@ -41,7 +42,9 @@ class MeshBuilder:
         self._has_uvs = any("TexCoord" in name for name in vertex_arr.dtype.names)
         self._has_colors = any("Colour" in name for name in vertex_arr.dtype.names)
 
+    @profiling.profiled()
     def build(self):
+        profiling.count("vertices", len(self.vertex_arr))
         mesh = bpy.data.meshes.new(self.name)
         vert_pos = self.vertex_arr["Position"]
         faces = self.ind_arr.reshape((int(self.ind_arr.size / 3), 3))
@@ -98,7 +101,8 @@ class MeshBuilder:
 
         for attr_name in uv_attrs:
             uvmap_idx = int(attr_name[8:])
-            uvs = self.vertex_arr[attr_name]
+            # Copy, the vertex array may be used to build the mesh again (e.g. LODs created on demand)
+            uvs = self.vertex_arr[attr_name].copy()
             flip_uvs(uvs)
 
             create_uv_attr(mesh, uvmap_idx, initial_values=uvs[self.ind_arr])
@@ -124,7 +128,8 @@ class MeshBuilder:
             if bones and bone_index < len(bones):
                 bone_name = bones[bone_index].name
 
-            return obj.vertex_groups.new(name=bone_name)
+            # Other LODs of the object may have already created the group
+            return obj.vertex_groups.get(bone_name, None) or obj.vertex_groups.new(name=bone_name)
 
         for vert_ind, bone_inds in enumerate(indices):
             for i, bone_ind in enumerate(bone_inds):
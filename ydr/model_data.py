@@ -1,4 +1,5 @@
 """Reads DrawableModel mesh data into numpy arrays."""
+import hashlib
 from collections import defaultdict
 import numpy as np
 from numpy.typing import NDArray
@@ -15,6 +16,20 @@ class MeshData(NamedTuple):
     mat_inds: NDArray[np.uint]
 
 
+def get_mesh_data_hash(mesh_data: MeshData) -> bytes:
+    """Get a hash of the contents of the vertex, index and material arrays. Mesh data with the same hash builds the
+    same mesh.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for arr in mesh_data:
+        arr = np.ascontiguousarray(arr)
+        h.update(str(arr.dtype.descr).encode())
+        h.update(len(arr).to_bytes(8, "little"))
+        h.update(arr)
+
+    return h.digest()
+
+
 class ModelData(NamedTuple):
     mesh_data_lods: dict[LODLevel, MeshData]
     # Used for storing drawable model properties
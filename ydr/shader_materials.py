@@ -219,7 +219,10 @@ def create_tinted_shader_graph(obj: bpy.types.Object):
             input_color_attr_name = get_color_attr_name(0)
 
         tint_color_attr_name = f"TintColor ({palette_img.name})" if palette_img else "TintColor"
-        tint_color_attr = obj.data.attributes.new(name=tint_color_attr_name, type="BYTE_COLOR", domain="CORNER")
+        tint_color_attr = obj.data.attributes.get(tint_color_attr_name, None)
+        if tint_color_attr is None:
+            # Meshes shared between models may already have it
+            tint_color_attr = obj.data.attributes.new(name=tint_color_attr_name, type="BYTE_COLOR", domain="CORNER")
 
         rename_tint_attr_node(mat.node_tree, name=tint_color_attr.name)
 
@@ -11,6 +11,7 @@ from ..tools.meshhelper import (
     get_uv_map_name,
 )
 from ..cwxml.drawable import VertexBuffer
+from ..tools import profiling
 
 from .. import logger
 
@@ -87,6 +88,7 @@ class VertexBufferBuilder:
 
         self._vert_inds = vert_inds
 
+    @profiling.profiled()
     def build(self):
         if not self.mesh.loop_triangles:
             self.mesh.calc_loop_triangles()
@@ -1,7 +1,6 @@
 import os
 import shutil
 import math
-import bmesh
 import bpy
 import zlib
 import numpy as np
@@ -12,6 +11,8 @@ from mathutils import Quaternion, Vector, Matrix
 
 from ..lods import operates_on_lod_level
 from .model_data import get_faces_subset
+from .buffer_split import split_vert_buffers
+from .buffer_join import join_ind_arrs, join_vert_arrs
 
 from ..cwxml.drawable import (
     BoneLimit,
@@ -30,7 +31,8 @@ from ..cwxml.drawable import (
     TextureShaderParameter,
     VertexBuffer,
 )
-from ..tools import jenkhash
+from ..tools import jenkhash, profiling
+from ..tools.meshcache import evaluated_mesh
 from ..tools.meshhelper import (
     get_bound_center_from_bounds,
     get_sphere_radius,
@@ -41,7 +43,7 @@ from ..tools.meshhelper import (
 )
 from ..tools.utils import get_filename, get_max_vector_list, get_min_vector_list
 from ..shared.shader_nodes import SzShaderNodeParameter
-from ..tools.blenderhelper import get_child_of_constraint, get_pose_inverse, remove_number_suffix, get_evaluated_obj
+from ..tools.blenderhelper import get_child_of_constraint, get_pose_inverse, remove_number_suffix
 from ..sollumz_helper import get_export_transforms_to_apply, get_sollumz_materials
 from ..sollumz_properties import (
     SOLLUMZ_UI_NAMES,
@@ -72,6 +74,7 @@ def export_ydr(drawable_obj: bpy.types.Object, filepath: str) -> bool:
     return True
 
 
+@profiling.profiled()
 def create_drawable_xml(drawable_obj: bpy.types.Object, armature_obj: Optional[bpy.types.Object] = None, materials: Optional[list[bpy.types.Material]] = None, apply_transforms: bool = False):
     """Create a ``Drawable`` cwxml object. Optionally specify an external ``armature_obj`` if ``drawable_obj`` is not an armature."""
     drawable_xml = Drawable()
@@ -183,15 +186,9 @@ def create_model_xml(model_obj: bpy.types.Object, lod_level: LODLevel, materials
 
     set_model_xml_properties(model_obj, lod_level, bones, model_xml)
 
-    obj_eval = get_evaluated_obj(model_obj)
-    mesh_eval = obj_eval.to_mesh()
-    triangulate_mesh(mesh_eval)
-
-    if transforms_to_apply is not None:
-        mesh_eval.transform(transforms_to_apply)
-
-    geometries = create_geometries_xml(
-        mesh_eval, materials, bones, model_obj.vertex_groups)
+    with evaluated_mesh(model_obj, transforms_to_apply) as mesh_eval:
+        geometries = create_geometries_xml(
+            mesh_eval, materials, bones, model_obj.vertex_groups)
     model_xml.geometries = geometries
 
     model_xml.bone_index = get_model_bone_index(model_obj)
@@ -199,18 +196,6 @@ def create_model_xml(model_obj: bpy.types.Object, lod_level: LODLevel, materials
     return model_xml
 
 
-def triangulate_mesh(mesh: bpy.types.Mesh):
-    temp_mesh = bmesh.new()
-    temp_mesh.from_mesh(mesh)
-
-    bmesh.ops.triangulate(temp_mesh, faces=temp_mesh.faces)
-
-    temp_mesh.to_mesh(mesh)
-    temp_mesh.free()
-
-    return mesh
-
-
 def get_model_bone_index(model_obj: bpy.types.Object):
     constraint = get_child_of_constraint(model_obj)
 
@@ -237,6 +222,7 @@ def set_model_xml_properties(model_obj: bpy.types.Object, lod_level: LODLevel, b
         model_xml.matrix_count = len(bones)
 
 
+@profiling.profiled()
 def create_geometries_xml(mesh_eval: bpy.types.Mesh, materials: list[bpy.types.Material], bones: Optional[list[bpy.types.Bone]] = None, vertex_groups: Optional[list[bpy.types.VertexGroup]] = None) -> list[Geometry]:
     is_cable = is_cable_mesh(mesh_eval)
     if len(mesh_eval.loops) == 0 and not is_cable: # cable mesh don't have faces, so no loops either
@@ -312,6 +298,8 @@ def create_geometries_xml(mesh_eval: bpy.types.Mesh, materials: list[bpy.types.M
 
     geometries = sort_geoms_by_shader(geometries)
 
+    profiling.count("geometries", len(geometries))
+    profiling.count("vertices", sum(len(g.vertex_buffer.data) for g in geometries))
     return geometries
 
 
@@ -447,55 +435,6 @@ def get_valid_ind_arrs(geometry_xmls: list[Geometry]):
     return [geom.index_buffer.data for geom in geometry_xmls if geom.vertex_buffer.data is not None and geom.index_buffer.data is not None]
 
 
-def join_vert_arrs(vert_arrs: list[NDArray]):
-    """Join vertex buffer structured arrays. Works with arrays that have different layouts."""
-    num_verts = sum(len(vert_arr) for vert_arr in vert_arrs)
-    struct_dtype = get_joined_vert_arr_dtype(vert_arrs)
-    joined_arr = np.zeros(num_verts, dtype=struct_dtype)
-
-    for attr_name in joined_arr.dtype.names:
-        row_start = 0
-
-        for vert_arr in vert_arrs:
-            if attr_name not in vert_arr.dtype.names:
-                continue
-
-            attr = vert_arr[attr_name]
-            num_attr_verts = len(attr)
-            row_end = row_start + num_attr_verts
-
-            joined_arr[attr_name][row_start:row_end] = attr
-
-            row_start = row_end
-
-    return joined_arr
-
-
-def get_joined_vert_arr_dtype(vert_arrs: list[NDArray]):
-    """Create a new structured dtype containing all vertex attrs present in all vert_arrs"""
-    attr_names = []
-
-    for vert_arr in vert_arrs:
-        attr_names.extend(
-            name for name in vert_arr.dtype.names if name not in attr_names)
-
-    return [VertexBuffer.VERT_ATTR_DTYPES[name] for name in attr_names]
-
-
-def join_ind_arrs(ind_arrs: list[NDArray[np.uint32]], vert_counts: list[int]) -> NDArray[np.uint32]:
-    """Join vertex index arrays by simply concatenating and offsetting indices based on vertex counts"""
-    def get_vert_ind_offset(arr_ind: int) -> int:
-        if arr_ind == 0:
-            return 0
-
-        return sum(num_verts for num_verts in vert_counts[:arr_ind])
-
-    offset_ind_arrs = [
-        ind_arr + get_vert_ind_offset(i) for i, ind_arr in enumerate(ind_arrs)]
-
-    return np.concatenate(offset_ind_arrs)
-
-
 def split_drawable_by_vert_count(drawable_xml: Drawable):
     split_models_by_vert_count(drawable_xml.drawable_models_high)
     split_models_by_vert_count(drawable_xml.drawable_models_med)
@@ -534,47 +473,6 @@ def split_geom_by_vert_count(geom_xml: Geometry):
     return tuple(geoms)
 
 
-def split_vert_buffers(
-    vert_buffer: NDArray,
-    ind_buffer: NDArray[np.uint32]
-) -> tuple[tuple[NDArray], tuple[NDArray[np.uint32]]]:
-    """Splits vertex and index buffers on chunks that fit in 16-bit indices.
-    Returns tuple of split vertex buffers and tuple of index buffers"""
-    MAX_INDEX = 65535
-
-    total_index = 0
-    idx_count = len(ind_buffer)
-
-    split_vert_arrs = []
-    split_ind_arrs = []
-    while total_index < idx_count:
-        old_index_to_new_index = {}
-        chunk_vertices_indices = []
-        chunk_indices = []
-        chunk_index = 0
-        while total_index < idx_count and len(chunk_indices) < MAX_INDEX:
-            old_index = ind_buffer[total_index]
-            existing_index = old_index_to_new_index.get(old_index, None)
-            if existing_index is not None:
-                # we already have this index vertex addedm simply remap it to new index
-                chunk_indices.append(existing_index)
-            else:
-                # We got new index unseen before, we have to add both vertex and index
-                chunk_indices.append(chunk_index)
-                chunk_vertices_indices.append(old_index)
-                old_index_to_new_index[old_index] = chunk_index
-                chunk_index += 1
-
-            total_index += 1
-
-        chunk_vertices_arr = vert_buffer[chunk_vertices_indices]
-        chunk_indices_arr = np.array(chunk_indices, dtype=np.uint32)
-        split_vert_arrs.append(chunk_vertices_arr)
-        split_ind_arrs.append(chunk_indices_arr)
-
-    return (tuple(split_vert_arrs), tuple(split_ind_arrs))
-
-
 def create_shader_group_xml(materials: list[bpy.types.Material], drawable_xml: Drawable):
     shaders = get_shaders_from_blender(materials)
     texture_dictionary = texture_dictionary_from_materials(materials)
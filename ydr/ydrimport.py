@@ -1,30 +1,51 @@
 import os
 import traceback
 import bpy
-from typing import Optional
+import numpy as np
+from contextlib import contextmanager
+from typing import Iterator, Optional
 from mathutils import Matrix
 from pathlib import Path
 from ..tools.drawablehelper import get_model_xmls_by_lod
 from .shader_materials import create_shader, get_detail_extra_sampler, create_tinted_shader_graph
 from ..ybn.ybnimport import create_bound_composite, create_bound_object
-from ..sollumz_properties import TextureFormat, TextureUsage, SollumType, SOLLUMZ_UI_NAMES
+from ..sollumz_properties import TextureFormat, TextureUsage, SollumType, LODLevel, SOLLUMZ_UI_NAMES
 from ..sollumz_preferences import get_addon_preferences, get_import_settings
 from ..cwxml.drawable import YDR, BoneLimit, Joints, Shader, ShaderGroup, Drawable, Bone, Skeleton, RotationLimit, DrawableModel
 from ..cwxml.bound import Bound
 from ..tools.blenderhelper import add_child_of_bone_constraint, create_empty_object, create_blender_object, join_objects, add_armature_modifier, parent_objs
 from ..tools.utils import get_filename
+from ..tools import profiling
 from ..shared.shader_nodes import SzShaderNodeParameter
-from .model_data import ModelData, get_model_data, get_model_data_split_by_group
+from .model_data import MeshData, ModelData, get_model_data, get_model_data_split_by_group, get_mesh_data_hash
 from .mesh_builder import MeshBuilder
 from .cable_mesh_builder import CableMeshBuilder
 from .cable import CABLE_SHADER_NAME
-from ..lods import LODLevels
+from ..lods import LODLevels, LODLevelProps
 from .lights import create_light_objs
 from .properties import DrawableModelProperties
 from .render_bucket import RenderBucket
 from .. import logger
 
 
+# Meshes built during the current import, by their shared mesh key. Only set inside ``use_shared_meshes``.
+_shared_meshes: Optional[dict[tuple, bpy.types.Mesh]] = None
+
+
+@contextmanager
+def use_shared_meshes(enabled: bool = True) -> Iterator[None]:
+    """Models created inside this context with identical mesh data, materials and model properties use the same mesh
+    instead of each creating a copy.
+    """
+    global _shared_meshes
+    prev_shared_meshes = _shared_meshes
+    _shared_meshes = {} if enabled else None
+    try:
+        yield
+    finally:
+        _shared_meshes = prev_shared_meshes
+
+
 def import_ydr(filepath: str):
     import_settings = get_import_settings()
 
@@ -34,9 +55,11 @@ def import_ydr(filepath: str):
     if import_settings.import_as_asset:
         return create_drawable_as_asset(ydr_xml, name, filepath)
 
-    return create_drawable_obj(ydr_xml, filepath, name)
+    with use_shared_meshes(import_settings.share_identical_meshes):
+        return create_drawable_obj(ydr_xml, filepath, name)
 
 
+@profiling.profiled()
 def create_drawable_obj(drawable_xml: Drawable, filepath: str, name: Optional[str] = None, split_by_group: bool = False, external_armature: Optional[bpy.types.Object] = None, external_bones: Optional[list[Bone]] = None, materials: Optional[list[bpy.types.Material]] = None):
     """Create a drawable object. ``split_by_group`` will split each Drawable Model by vertex group. ``external_armature`` allows for bones to be rigged to an armature object that is not the parent drawable."""
     name = name or drawable_xml.name
@@ -113,29 +136,42 @@ def create_rigged_model_obj(model_data: ModelData, materials: list[bpy.types.Mat
 def create_lod_meshes(model_data: ModelData, model_obj: bpy.types.Object, materials: list[bpy.types.Material], bones: Optional[list[bpy.types.Bone]] = None):
     lods: LODLevels = model_obj.sz_lods
     original_mesh = model_obj.data
+    is_cable = all(m.shader_properties.filename == CABLE_SHADER_NAME for m in materials)
+
+    # The highest LOD is always created, it is the one active after import. Lower LODs can be created on demand, unless
+    # they are skinned and the highest LOD is not, then the object wouldn't get an armature modifier to get the bones from
+    lazy_lods = get_import_settings().lazy_lod_meshes
+    lod_levels = [lod_level for lod_level in LODLevel if lod_level in model_data.mesh_data_lods]
+    highest_lod_is_skinned = (
+        bones is not None and len(lod_levels) > 0 and
+        "BlendWeights" in model_data.mesh_data_lods[lod_levels[0]].vert_arr.dtype.names
+    )
 
     for lod_level, mesh_data in model_data.mesh_data_lods.items():
         mesh_name = f"{model_obj.name}_{SOLLUMZ_UI_NAMES[lod_level].lower().replace(' ', '_')}"
+        model_xml = model_data.xml_lods[lod_level]
+        is_skinned = "BlendWeights" in mesh_data.vert_arr.dtype.names
+
+        mesh_key = None
+        lod_mesh = None
+        # Skinned meshes are not shared, their vertex weights refer to the vertex group indices of the object
+        if _shared_meshes is not None and not (is_skinned and bones is not None):
+            mesh_key = get_shared_mesh_key(mesh_data, materials, model_xml, is_cable)
+            lod_mesh = _shared_meshes.get(mesh_key, None)
+        is_new_mesh = lod_mesh is None
+
+        if (
+            is_new_mesh and lazy_lods and lod_level != lod_levels[0] and
+            (not (is_skinned and bones is not None) or highest_lod_is_skinned)
+        ):
+            set_lazy_lod_mesh(lods.get_lod(lod_level), mesh_name, mesh_data, materials, model_xml, is_cable)
+            continue
 
         try:
-            if all(m.shader_properties.filename == CABLE_SHADER_NAME for m in materials):
-                mesh_builder = CableMeshBuilder(
-                    mesh_name,
-                    mesh_data.vert_arr,
-                    mesh_data.ind_arr,
-                    mesh_data.mat_inds,
-                    materials
-                )
-            else:
-                mesh_builder = MeshBuilder(
-                    mesh_name,
-                    mesh_data.vert_arr,
-                    mesh_data.ind_arr,
-                    mesh_data.mat_inds,
-                    materials
-                )
+            mesh_builder = create_mesh_builder(mesh_name, mesh_data, materials, is_cable)
 
-            lod_mesh = mesh_builder.build()
+            if is_new_mesh:
+                lod_mesh = mesh_builder.build()
         except:
             logger.error(
                 f"Error occured during creation of mesh '{mesh_name}'! Is the mesh data valid?\n{traceback.format_exc()}")
@@ -144,9 +180,10 @@ def create_lod_meshes(model_data: ModelData, model_obj: bpy.types.Object, materi
         lods.get_lod(lod_level).mesh = lod_mesh
         lods.active_lod_level = lod_level
 
-        set_drawable_model_properties(lod_mesh.drawable_model_properties, model_data.xml_lods[lod_level])
-
-        is_skinned = "BlendWeights" in mesh_data.vert_arr.dtype.names
+        if is_new_mesh:
+            set_drawable_model_properties(lod_mesh.drawable_model_properties, model_xml)
+            if mesh_key is not None:
+                _shared_meshes[mesh_key] = lod_mesh
 
         if is_skinned and bones is not None:
             mesh_builder.create_vertex_groups(model_obj, bones)
@@ -158,6 +195,50 @@ def create_lod_meshes(model_data: ModelData, model_obj: bpy.types.Object, materi
         bpy.data.meshes.remove(original_mesh)
 
 
+def create_mesh_builder(mesh_name: str, mesh_data: MeshData, materials: list[bpy.types.Material], is_cable: bool) -> MeshBuilder | CableMeshBuilder:
+    builder_cls = CableMeshBuilder if is_cable else MeshBuilder
+    return builder_cls(mesh_name, mesh_data.vert_arr, mesh_data.ind_arr, mesh_data.mat_inds, materials)
+
+
+def set_lazy_lod_mesh(lod: LODLevelProps, mesh_name: str, mesh_data: MeshData, materials: list[bpy.types.Material], model_xml: DrawableModel, is_cable: bool):
+    """Set the mesh of ``lod`` to be created from ``mesh_data`` when the LOD is first used."""
+    # Only keep what is needed to build the mesh, not the model XML or references to Blender data that may be removed
+    # or invalidated by undo
+    material_names = [m.name for m in materials]
+    render_mask = model_xml.render_mask
+    is_skinned = "BlendWeights" in mesh_data.vert_arr.dtype.names
+
+    def _build(model_obj: bpy.types.Object) -> Optional[bpy.types.Mesh]:
+        lod_materials = [bpy.data.materials.get(name, None) for name in material_names]
+        try:
+            mesh_builder = create_mesh_builder(mesh_name, mesh_data, lod_materials, is_cable)
+            lod_mesh = mesh_builder.build()
+        except:
+            logger.error(
+                f"Error occured during creation of mesh '{mesh_name}'! Is the mesh data valid?\n{traceback.format_exc()}")
+            return None
+
+        lod_mesh.drawable_model_properties.render_mask = render_mask
+
+        armature_mod = next((m for m in model_obj.modifiers if m.type == "ARMATURE" and m.object is not None), None)
+        if is_skinned and armature_mod is not None:
+            # Vertex weights are set through the object vertex groups, so temporarily make it the object mesh
+            active_mesh = model_obj.data
+            model_obj.data = lod_mesh
+            mesh_builder.create_vertex_groups(model_obj, armature_mod.object.data.bones)
+            model_obj.data = active_mesh
+
+        return lod_mesh
+
+    lod.set_lazy_mesh(mesh_name, _build)
+
+
+def get_shared_mesh_key(mesh_data: MeshData, materials: list[bpy.types.Material], model_xml: DrawableModel, is_cable: bool) -> tuple:
+    """Get the key identifying the mesh built from ``mesh_data``. Mesh data with the same key builds identical meshes."""
+    used_materials = tuple(materials[i].as_pointer() for i in np.unique(mesh_data.mat_inds))
+    return get_mesh_data_hash(mesh_data), used_materials, model_xml.render_mask, is_cable
+
+
 def set_skinned_model_properties(drawable_obj: bpy.types.Object, drawable_xml: Drawable):
     """Set drawable model properties for the skinned ``DrawableModel`` (only ever 1 skinned model per ``Drawable``)."""
     for lod_level, models in get_model_xmls_by_lod(drawable_xml).items():
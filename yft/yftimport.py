@@ -13,7 +13,7 @@ from ..sollumz_properties import BOUND_TYPES, SollumType, MaterialType
 from ..sollumz_preferences import get_import_settings
 from ..cwxml.fragment import YFT, Fragment, PhysicsLOD, PhysicsGroup, PhysicsChild, Window, Archetype, GlassWindow
 from ..cwxml.drawable import Drawable, Bone
-from ..ydr.ydrimport import apply_translation_limits, create_armature_obj_from_skel, create_drawable_skel, apply_rotation_limits, create_joint_constraints, create_light_objs, create_drawable_obj, create_drawable_as_asset, shadergroup_to_materials, create_drawable_models
+from ..ydr.ydrimport import apply_translation_limits, create_armature_obj_from_skel, create_drawable_skel, apply_rotation_limits, create_joint_constraints, create_light_objs, create_drawable_obj, create_drawable_as_asset, shadergroup_to_materials, create_drawable_models, use_shared_meshes
 from ..ybn.ybnimport import create_bound_object
 from .. import logger
 from .properties import LODProperties, FragArchetypeProperties, GlassTypes, FragmentTemplateAsset
@@ -45,8 +45,9 @@ def import_yft(filepath: str):
     # Import the _hi.yft.xml if it exists
     hi_xml = YFT.from_xml_file(hi_filepath) if os.path.exists(hi_filepath) else None
 
-    return create_fragment_obj(yft_xml, non_hi_filepath, name,
-                               split_by_group=import_settings.split_by_group, hi_xml=hi_xml)
+    with use_shared_meshes(import_settings.share_identical_meshes):
+        return create_fragment_obj(yft_xml, non_hi_filepath, name,
+                                   split_by_group=import_settings.split_by_group, hi_xml=hi_xml)
 
 
 def is_hi_yft_filepath(yft_filepath: str):
@@ -0,0 +1,122 @@
+"""Vectorized calculation of the ymap extents of many entities at once."""
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Selects bb min (0) or bb max (1) for each component of the 8 corners of a box
+_BOX_CORNERS_MASK = np.array([
+    (0, 0, 0), (0, 0, 1), (0, 1, 0), (0, 1, 1),
+    (1, 0, 0), (1, 0, 1), (1, 1, 0), (1, 1, 1),
+], dtype=np.float64)
+
+
+class Extents(NamedTuple):
+    entities_min: NDArray[np.float64]
+    entities_max: NDArray[np.float64]
+    streaming_min: NDArray[np.float64]
+    streaming_max: NDArray[np.float64]
+
+    @staticmethod
+    def empty() -> "Extents":
+        inf = np.full(3, np.inf)
+        return Extents(inf, -inf, inf, -inf)
+
+    def union(self, other: "Extents") -> "Extents":
+        return Extents(
+            np.minimum(self.entities_min, other.entities_min),
+            np.maximum(self.entities_max, other.entities_max),
+            np.minimum(self.streaming_min, other.streaming_min),
+            np.maximum(self.streaming_max, other.streaming_max),
+        )
+
+
+def quaternions_to_matrices(quats: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Converts the quaternions (array of shape (n, 4) in WXYZ order) to rotation matrices (array of shape (n, 3, 3))."""
+    quats = quats / np.linalg.norm(quats, axis=1, keepdims=True)
+    w, x, y, z = quats.T
+    return np.stack((
+        np.stack((1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)), axis=1),
+        np.stack((2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)), axis=1),
+        np.stack((2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)), axis=1),
+    ), axis=1)
+
+
+def _get_rotated_corners(
+    positions: NDArray[np.float64],
+    orientations: NDArray[np.float64],
+    bb_mins: NDArray[np.float64],
+    bb_maxs: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    corners = bb_mins[:, None, :] + (bb_maxs - bb_mins)[:, None, :] * _BOX_CORNERS_MASK[None, :, :]
+    return np.einsum("nij,nkj->nki", orientations, corners) + positions[:, None, :]
+
+
+def get_entities_extents(
+    positions: NDArray[np.float64],
+    orientations: NDArray[np.float64],
+    bb_mins: NDArray[np.float64],
+    bb_maxs: NDArray[np.float64],
+    lod_dists: NDArray[np.float64],
+    include_local_bounds: bool = True,
+) -> Extents:
+    """Gets the entities and streaming extents of the entities with the given positions (n, 3), rotation matrices
+    (n, 3, 3), archetype bounding boxes (n, 3) and LOD distances (n,). Same as CodeWalker's ymap extents calculations.
+
+    With ``include_local_bounds``, the entities extents also include the archetype bounding boxes without the entity
+    transform, as the ymap extents always did. Otherwise, only the transformed bounding boxes are used, so the extents
+    of entities far from the origin don't stretch back to it.
+    """
+    if len(positions) == 0:
+        return Extents.empty()
+
+    corners = _get_rotated_corners(positions, orientations, bb_mins, bb_maxs)
+    lod_dists = lod_dists[:, None]
+    stream_corners = _get_rotated_corners(positions, orientations, bb_mins - lod_dists, bb_maxs + lod_dists)
+
+    entities_min = corners.min(axis=(0, 1))
+    entities_max = corners.max(axis=(0, 1))
+    if include_local_bounds:
+        # The bounding boxes without the entity transform, this matches the previous per-entity code
+        entities_min = np.minimum(bb_mins.min(axis=0), entities_min)
+        entities_max = np.maximum(bb_maxs.max(axis=0), entities_max)
+    return Extents(entities_min, entities_max, stream_corners.min(axis=(0, 1)), stream_corners.max(axis=(0, 1)))
+
+
+class EntityBounds(NamedTuple):
+    """Bounds of the entities that contribute to the ymap extents."""
+    # Index of each entity in the ymap entities
+    indices: NDArray[np.int64]
+    positions: NDArray[np.float64]
+    orientations: NDArray[np.float64]
+    bb_mins: NDArray[np.float64]
+    bb_maxs: NDArray[np.float64]
+    lod_dists: NDArray[np.float64]
+
+    @staticmethod
+    def empty() -> "EntityBounds":
+        return EntityBounds(
+            np.empty(0, dtype=np.int64), np.empty((0, 3)), np.empty((0, 3, 3)), np.empty((0, 3)), np.empty((0, 3)),
+            np.empty(0)
+        )
+
+    @staticmethod
+    def concatenate(bounds: list["EntityBounds"]) -> "EntityBounds":
+        """Joins the bounds of several lists of entities. Their indices must be relative to the joined list already (see
+        ``offset_indices``).
+        """
+        if not bounds:
+            return EntityBounds.empty()
+
+        return EntityBounds(*(np.concatenate(arrs) for arrs in zip(*bounds)))
+
+    def offset_indices(self, offset: int) -> "EntityBounds":
+        return self._replace(indices=self.indices + offset)
+
+    def subset(self, mask: NDArray[np.bool_]) -> "EntityBounds":
+        return EntityBounds(*(arr[mask] for arr in self))
+
+    def get_extents(self, include_local_bounds: bool = True) -> Extents:
+        return get_entities_extents(
+            self.positions, self.orientations, self.bb_mins, self.bb_maxs, self.lod_dists, include_local_bounds
+        )
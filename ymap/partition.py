@@ -0,0 +1,63 @@
+"""Spatial partitioning of ymap entities into a grid of cells, for splitting them into child ymaps."""
+import numpy as np
+from numpy.typing import NDArray
+
+
+def partition_entities(
+    positions: NDArray[np.float64],
+    cell_size: float,
+    max_entities: int = 0,
+    min_cell_size: float = 1.0,
+) -> list[NDArray[np.int64]]:
+    """Splits the entities with the given positions (array of shape (n, 3)) into a grid of square cells of
+    ``cell_size`` on the XY plane. Cells with more than ``max_entities`` are split further as a quadtree, down to
+    cells of ``min_cell_size``. A limit of 0 means no limit.
+
+    Returns the indices of the entities in each non-empty cell, ordered by cell along Y and then X.
+    """
+    if len(positions) == 0:
+        return []
+
+    positions_xy = positions[:, :2]
+    cell_coords = np.floor(positions_xy / cell_size).astype(np.int64)
+    cells, cell_inds = np.unique(cell_coords, axis=0, return_inverse=True)
+    cell_inds = cell_inds.reshape(-1)
+    order = np.argsort(cell_inds, kind="stable")
+    cell_starts = np.searchsorted(cell_inds[order], np.arange(len(cells) + 1))
+
+    parts = []
+    # np.unique sorts by X and then Y, process by Y and then X
+    for cell_idx in np.lexsort((cells[:, 0], cells[:, 1])):
+        inds = order[cell_starts[cell_idx]:cell_starts[cell_idx + 1]]
+        cell_min = cells[cell_idx].astype(np.float64) * cell_size
+        _split_cell(positions_xy, inds, cell_min, cell_size, max_entities, min_cell_size, parts)
+
+    return parts
+
+
+def _split_cell(
+    positions_xy: NDArray[np.float64],
+    inds: NDArray[np.int64],
+    cell_min: NDArray[np.float64],
+    cell_size: float,
+    max_entities: int,
+    min_cell_size: float,
+    parts: list[NDArray[np.int64]],
+):
+    if max_entities <= 0 or len(inds) <= max_entities or cell_size * 0.5 < min_cell_size:
+        parts.append(inds)
+        return
+
+    half_size = cell_size * 0.5
+    center = cell_min + half_size
+    cell_positions = positions_xy[inds]
+    right = cell_positions[:, 0] >= center[0]
+    top = cell_positions[:, 1] >= center[1]
+    for is_top in (False, True):
+        for is_right in (False, True):
+            quadrant_inds = inds[(right == is_right) & (top == is_top)]
+            if len(quadrant_inds) == 0:
+                continue
+
+            quadrant_min = cell_min + np.array((half_size if is_right else 0.0, half_size if is_top else 0.0))
+            _split_cell(positions_xy, quadrant_inds, quadrant_min, half_size, max_entities, min_cell_size, parts)
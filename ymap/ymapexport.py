@@ -1,17 +1,29 @@
 import bpy
+import os
 import re
 import math
 
-from mathutils import Vector
+import numpy as np
+from mathutils import Quaternion, Vector
 from struct import pack
 from ..cwxml.ymap import *
 from binascii import hexlify
 from ..tools.blenderhelper import remove_number_suffix
 from ..tools.meshhelper import get_bound_center_from_bounds, get_extents
+from ..tools.meshcache import evaluated_mesh
 from ..sollumz_properties import SOLLUMZ_UI_NAMES, SollumType
 from ..sollumz_preferences import get_export_settings
 from .. import logger
-from ..tools.ymaphelper import generate_ymap_extents
+from ..tools.ymaphelper import (
+    EntityObjsData,
+    gather_entity_objs_data,
+    generate_ymap_extents,
+    get_entity_archetype_name,
+    get_entity_objs_bounds,
+    get_ytyp_archetypes_by_name,
+)
+from .extents import EntityBounds, Extents
+from .partition import partition_entities
 
 
 def box_from_obj(obj):
@@ -38,18 +50,9 @@ def box_from_obj(obj):
     return box
 
 
-def triangulate_obj(obj):
-    """Convert mesh from n-polygons to triangles"""
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode="EDIT")
-    bpy.ops.mesh.select_all(action="SELECT")
-    bpy.ops.mesh.quads_convert_to_tris()
-    bpy.ops.object.mode_set(mode="OBJECT")
-
-
-def get_verts_from_obj(obj):
+def get_verts_from_obj(obj, mesh):
     """
-    For each vertex get its coordinates in global space (this way we don't need to apply transfroms)
+    For each vertex of ``mesh`` (the triangulated mesh of ``obj``) get its coordinates in global space (this way we don't need to apply transfroms)
     then get their bytes hex representation and append. After that for each face get its indices,
     get their bytes hex representation and append.
 
@@ -57,23 +60,22 @@ def get_verts_from_obj(obj):
     :rtype str:
     """
     verts = ''
-    for v in obj.data.vertices:
+    for v in mesh.vertices:
         for c in obj.matrix_world @ v.co:
             verts += str(hexlify(pack('f', c)))[2:-1].upper()
-    for p in obj.data.polygons:
+    for p in mesh.polygons:
         for i in p.vertices:
             verts += str(hexlify(pack('B', i)))[2:-1].upper()
     return verts
 
 
 def model_from_obj(obj):
-    triangulate_obj(obj)
-
     model = OccludeModel()
     model.bmin, model.bmax = get_extents(obj)
-    model.verts = get_verts_from_obj(obj)
-    model.num_verts_in_bytes = len(obj.data.vertices) * 12
-    face_count = len(obj.data.polygons)
+    with evaluated_mesh(obj) as mesh:
+        model.verts = get_verts_from_obj(obj, mesh)
+        model.num_verts_in_bytes = len(mesh.vertices) * 12
+        face_count = len(mesh.polygons)
     model.num_tris = face_count + 32768
     model.data_size = model.num_verts_in_bytes + (face_count * 3)
     model.flags = obj.ymap_properties.flags
@@ -82,32 +84,44 @@ def model_from_obj(obj):
 
 
 def entity_from_obj(obj):
-    # Removing " (not found)" suffix, created when importing ymaps while entity was not found in the view layer
-    obj.name = re.sub(" \(not found\)", "", obj.name.lower())
-
-    entity = Entity()
-    entity.archetype_name = remove_number_suffix(obj.name)
-    entity.flags = int(obj.entity_properties.flags)
-    entity.guid = int(obj.entity_properties.guid)
-    entity.position = obj.location
-    entity.rotation = obj.rotation_euler.to_quaternion()
-    if entity.type != "CMloInstanceDef":
-        entity.rotation.invert()
-    entity.scale_xy = obj.scale.x
-    entity.scale_z = obj.scale.z
-    entity.parent_index = int(obj.entity_properties.parent_index)
-    entity.lod_dist = obj.entity_properties.lod_dist
-    entity.child_lod_dist = obj.entity_properties.child_lod_dist
-    entity.lod_level = obj.entity_properties.lod_level.upper().replace("SOLLUMZ_", "")
-    entity.num_children = int(obj.entity_properties.num_children)
-    entity.priority_level = obj.entity_properties.priority_level.upper().replace("SOLLUMZ_", "")
-    entity.ambient_occlusion_multiplier = int(
-        obj.entity_properties.ambient_occlusion_multiplier)
-    entity.artificial_ambient_occlusion = int(
-        obj.entity_properties.artificial_ambient_occlusion)
-    entity.tint_value = int(obj.entity_properties.tint_value)
-
-    return entity
+    return entities_from_objs(gather_entity_objs_data((obj,)))[0]
+
+
+def entities_from_objs(data: EntityObjsData) -> list[Entity]:
+    """Create the entities of the objects which transforms were gathered in ``data``."""
+    # Entities in YMAPs need rotation inverted
+    rotations = data.rotations * np.array((1.0, -1.0, -1.0, -1.0))
+    rotations /= np.einsum("ij,ij->i", data.rotations, data.rotations)[:, None]
+
+    entities = []
+    for obj, position, rotation, scale in zip(data.objs, data.positions.tolist(), rotations.tolist(), data.scales.tolist()):
+        # Removing " (not found)" suffix, created when importing ymaps while entity was not found in the view layer
+        name = re.sub(" \(not found\)", "", obj.name.lower())
+        if obj.name != name:
+            obj.name = name
+
+        props = obj.entity_properties
+        entity = Entity()
+        # Collection instances get the name from the instanced archetype
+        entity.archetype_name = get_entity_archetype_name(obj).lower()
+        entity.flags = int(props.flags)
+        entity.guid = int(props.guid)
+        entity.position = Vector(position)
+        entity.rotation = Quaternion(rotation)
+        entity.scale_xy = scale[0]
+        entity.scale_z = scale[2]
+        entity.parent_index = int(props.parent_index)
+        entity.lod_dist = props.lod_dist
+        entity.child_lod_dist = props.child_lod_dist
+        entity.lod_level = props.lod_level.upper().replace("SOLLUMZ_", "")
+        entity.num_children = int(props.num_children)
+        entity.priority_level = props.priority_level.upper().replace("SOLLUMZ_", "")
+        entity.ambient_occlusion_multiplier = int(props.ambient_occlusion_multiplier)
+        entity.artificial_ambient_occlusion = int(props.artificial_ambient_occlusion)
+        entity.tint_value = int(props.tint_value)
+        entities.append(entity)
+
+    return entities
 
 def cargen_from_obj(obj):
     cargen = CarGenerator()
@@ -136,15 +150,26 @@ def calculate_cargen_orient(obj):
 
 
 def ymap_from_object(obj):
+    return create_ymap_xml(obj)[0]
+
+
+def create_ymap_xml(obj) -> tuple[CMapData, EntityBounds]:
+    """Create the ymap of ``obj``. Also returns the bounds of its entities, used to calculate the extents."""
     ymap = CMapData()
 
     export_settings = get_export_settings()
+    entities_bounds = []
+    entity_extents_data = {}
+    ytyp_archetypes = get_ytyp_archetypes_by_name()
 
     for child in obj.children:
         # Entities
         if export_settings.ymap_exclude_entities == False and child.sollum_type == SollumType.YMAP_ENTITY_GROUP:
-            for entity_obj in child.children:
-                ymap.entities.append(entity_from_obj(entity_obj))
+            # Transforms read once for both the entities and the extents
+            entity_objs_data = gather_entity_objs_data(child.children)
+            group_bounds = get_entity_objs_bounds(entity_objs_data, entity_extents_data, ytyp_archetypes)
+            entities_bounds.append(group_bounds.offset_indices(len(ymap.entities)))
+            ymap.entities.extend(entities_from_objs(entity_objs_data))
 
         # Box occluders
         if export_settings.ymap_box_occluders == False and child.sollum_type == SollumType.YMAP_BOX_OCCLUDER_GROUP:
@@ -207,7 +232,8 @@ def ymap_from_object(obj):
     ymap.flags = obj.ymap_properties.flags
     ymap.content_flags = obj.ymap_properties.content_flags
 
-    generate_ymap_extents(obj)
+    entities_bounds = EntityBounds.concatenate(entities_bounds)
+    generate_ymap_extents(obj, entities_bounds.get_extents() if export_settings.ymap_exclude_entities == False else None)
     ymap.entities_extents_min = obj.ymap_properties.entities_extents_min
     ymap.entities_extents_max = obj.ymap_properties.entities_extents_max
     ymap.streaming_extents_min = obj.ymap_properties.streaming_extents_min
@@ -220,10 +246,121 @@ def ymap_from_object(obj):
     ymap.block.owner = obj.ymap_properties.block.owner
     ymap.block.time = obj.ymap_properties.block.time
 
-    return ymap
+    return ymap, entities_bounds
+
+
+# Content flags of the entities moved to the child ymaps: HD, LOD, SLOD2, interior, SLOD, physics and critical
+PARTITION_CHILD_CONTENT_FLAGS = 1 | 2 | 4 | 8 | 16 | 64 | 512
+
+
+def partition_ymap_entities(
+    ymap: CMapData,
+    entities_bounds: EntityBounds,
+    cell_size: float,
+    max_entities: int = 0,
+) -> tuple[list[CMapData], Extents]:
+    """Moves the entities of ``ymap`` without LOD children to child ymaps, one per cell of a spatial grid (see
+    ``partition_entities``). Each child ymap gets ``ymap`` as parent and the extents of its own entities, so they
+    stream in separately.
+
+    Entities that are LOD parents stay in ``ymap``, the ``parent_index`` of all entities is updated to their new index
+    in ``ymap``. Returns the child ymaps and the extents of the entities that stay in ``ymap``. The extents of ``ymap``
+    are not modified, they also depend on its other contents. These extents only include the transformed archetype
+    bounding boxes, so the child ymaps of cells far from the origin don't stream in from everywhere.
+    """
+    entities = list(ymap.entities)
+    num_entities = len(entities)
+    is_movable = np.array([entity.num_children == 0 for entity in entities], dtype=bool)
+    if num_entities == 0 or not is_movable.any():
+        return [], entities_bounds.get_extents(include_local_bounds=False)
+
+    positions = np.array([entity.position for entity in entities], dtype=np.float64).reshape((-1, 3))
+    movable_inds = np.flatnonzero(is_movable)
+    cells = partition_entities(positions[movable_inds], cell_size, max_entities)
+    if len(cells) <= 1 and is_movable.all():
+        # Nothing would be gained from a single child ymap with everything
+        return [], entities_bounds.get_extents(include_local_bounds=False)
+
+    # Entities kept in the parent ymap, and their new indices
+    kept_inds = np.flatnonzero(~is_movable)
+    new_parent_index = np.full(num_entities, -1, dtype=np.int64)
+    new_parent_index[kept_inds] = np.arange(len(kept_inds))
+
+    def _remap_parent_index(entity: Entity):
+        if 0 <= entity.parent_index < num_entities:
+            entity.parent_index = int(new_parent_index[entity.parent_index])
+
+    # Position of each entity in ``entities_bounds``, -1 if it has no bounds
+    bounds_pos = np.full(num_entities, -1, dtype=np.int64)
+    bounds_pos[entities_bounds.indices] = np.arange(len(entities_bounds.indices))
+
+    def _get_extents(inds: np.ndarray) -> Extents:
+        inds_bounds_pos = bounds_pos[inds]
+        inds_bounds = entities_bounds.subset(inds_bounds_pos[inds_bounds_pos != -1])
+        extents = inds_bounds.get_extents(include_local_bounds=False)
+        if len(inds) > 0 and not np.isfinite(extents.entities_min).all():
+            # No entities with bounds, use their positions
+            inds_min = positions[inds].min(axis=0)
+            inds_max = positions[inds].max(axis=0)
+            extents = Extents(inds_min, inds_max, inds_min, inds_max)
+        return extents
+
+    child_ymaps = []
+    for cell_idx, cell in enumerate(cells):
+        cell_inds = movable_inds[cell]
+
+        child_ymap = CMapData()
+        child_ymap.name = f"{ymap.name}_{cell_idx:03d}"
+        child_ymap.parent = ymap.name
+        child_ymap.content_flags = ymap.content_flags & PARTITION_CHILD_CONTENT_FLAGS
+        for i in cell_inds:
+            entity = entities[i]
+            _remap_parent_index(entity)
+            child_ymap.entities.append(entity)
+
+        cell_extents = _get_extents(cell_inds)
+        child_ymap.entities_extents_min = Vector(cell_extents.entities_min)
+        child_ymap.entities_extents_max = Vector(cell_extents.entities_max)
+        child_ymap.streaming_extents_min = Vector(cell_extents.streaming_min)
+        child_ymap.streaming_extents_max = Vector(cell_extents.streaming_max)
+        child_ymap.block.version = ymap.block.version
+        child_ymap.block.exported_by = ymap.block.exported_by
+        child_ymap.block.owner = ymap.block.owner
+        child_ymap.block.time = ymap.block.time
+        child_ymaps.append(child_ymap)
+
+    ymap.entities = []
+    for i in kept_inds:
+        entity = entities[i]
+        _remap_parent_index(entity)
+        ymap.entities.append(entity)
+
+    return child_ymaps, _get_extents(kept_inds)
 
 
 def export_ymap(obj: bpy.types.Object, filepath: str) -> bool:
-    ymap = ymap_from_object(obj)
+    ymap, entities_bounds = create_ymap_xml(obj)
+
+    export_settings = get_export_settings()
+    if export_settings.ymap_partition_entities:
+        child_ymaps, kept_entities_extents = partition_ymap_entities(
+            ymap,
+            entities_bounds,
+            export_settings.ymap_partition_cell_size,
+            export_settings.ymap_partition_max_entities
+        )
+        directory = os.path.dirname(filepath)
+        for child_ymap in child_ymaps:
+            child_ymap.write_xml(os.path.join(directory, child_ymap.name.lower() + YMAP.file_extension))
+
+        if child_ymaps:
+            # Shrink the parent extents to the entities it kept, plus its occluders and car generators
+            generate_ymap_extents(obj, kept_entities_extents)
+            ymap.entities_extents_min = obj.ymap_properties.entities_extents_min
+            ymap.entities_extents_max = obj.ymap_properties.entities_extents_max
+            ymap.streaming_extents_min = obj.ymap_properties.streaming_extents_min
+            ymap.streaming_extents_max = obj.ymap_properties.streaming_extents_max
+            logger.info(f"Split the entities of '{ymap.name}' into {len(child_ymaps)} child ymaps.")
+
     ymap.write_xml(filepath)
     return True
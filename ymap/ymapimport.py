@@ -4,7 +4,7 @@ import math
 import bpy
 from mathutils import Vector, Euler
 from ..sollumz_helper import duplicate_object_with_children, set_object_collection
-from ..tools.ymaphelper import add_occluder_material, get_cargen_mesh
+from ..tools.ymaphelper import add_occluder_material, get_cargen_mesh, get_archetype_collection, ArchetypeObjectIndex
 from ..sollumz_properties import SollumType
 from ..sollumz_preferences import get_import_settings
 from ..cwxml.ymap import CMapData, OccludeModel, YMAP
@@ -64,14 +64,15 @@ def entity_to_obj(ymap_obj: bpy.types.Object, ymap: CMapData):
     bpy.context.collection.objects.link(group_obj)
     bpy.context.view_layer.objects.active = group_obj
 
-    found = False
     if ymap.entities:
-        for obj in bpy.context.collection.all_objects:
-            for entity in ymap.entities:
-                if entity.archetype_name == obj.name and obj.name in bpy.context.view_layer.objects:
-                    found = True
-                    apply_entity_properties(obj, entity)
-        if found:
+        object_index = ArchetypeObjectIndex.from_view_layer(bpy.context.collection, bpy.context.view_layer)
+        found_archetypes = set()
+        for entity in ymap.entities:
+            obj = object_index.get(entity.archetype_name)
+            if obj is not None:
+                found_archetypes.add(entity.archetype_name)
+                apply_entity_properties(obj, entity)
+        if found_archetypes:
             logger.info(f"Succesfully imported: {ymap.name}.ymap")
             return True
         else:
@@ -83,6 +84,20 @@ def entity_to_obj(ymap_obj: bpy.types.Object, ymap: CMapData):
         return False
 
 
+def create_entity_collection_instance(archetype_obj: bpy.types.Object, archetype_collections: dict[str, bpy.types.Collection]) -> bpy.types.Object:
+    """Create an empty that instances the collection with the hierarchy of ``archetype_obj``."""
+    collection = archetype_collections.get(archetype_obj.name, None)
+    if collection is None:
+        collection = archetype_collections[archetype_obj.name] = get_archetype_collection(archetype_obj)
+
+    obj = bpy.data.objects.new(archetype_obj.name, None)
+    obj.instance_type = "COLLECTION"
+    obj.instance_collection = collection
+    obj.sollum_type = archetype_obj.sollum_type
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
 def instanced_entity_to_obj(ymap_obj: bpy.types.Object, ymap: CMapData):
     group_obj = bpy.data.objects.new("Entities", None)
     group_obj.sollum_type = SollumType.YMAP_ENTITY_GROUP
@@ -93,34 +108,41 @@ def instanced_entity_to_obj(ymap_obj: bpy.types.Object, ymap: CMapData):
     bpy.context.collection.objects.link(group_obj)
     bpy.context.view_layer.objects.active = group_obj
 
+    import_settings = get_import_settings()
+
     if ymap.entities:
         entities_amount = len(ymap.entities)
         count = 0
+        archetype_collections = {}
+        object_index = ArchetypeObjectIndex.from_blend_data()
+        missing_archetypes = set()
 
         for entity in ymap.entities:
-            obj = bpy.data.objects.get(entity.archetype_name, None)
+            obj = object_index.get(entity.archetype_name)
             if obj is None:
                 # No object with the given archetype name found
+                missing_archetypes.add(entity.archetype_name)
                 continue
 
             # TODO: requiring ymap entities to be drawable or fragment in blender seems like an unnecessary limitation
             # Need to special case assets because their type when imported by sollumz is drawable model
             if obj.sollum_type == SollumType.DRAWABLE or obj.sollum_type == SollumType.FRAGMENT or obj.asset_data is not None:
-                new_obj = duplicate_object_with_children(obj)
+                if import_settings.ymap_instance_collections:
+                    new_obj = create_entity_collection_instance(obj, archetype_collections)
+                else:
+                    new_obj = duplicate_object_with_children(obj)
                 apply_entity_properties(new_obj, entity)
                 new_obj.parent = group_obj
                 count += 1
-                entity.found = True
             else:
+                missing_archetypes.add(entity.archetype_name)
                 logger.error(
                     f"Cannot use your '{obj.name}' object because it is not a 'Drawable' type!")
 
         # Creating empty entity if no object was found for reference, and notify user
-        import_settings = get_import_settings()
-
         if not import_settings.ymap_skip_missing_entities:
             for entity in ymap.entities:
-                if entity.found is None:
+                if entity.archetype_name in missing_archetypes:
                     empty_obj = bpy.data.objects.new(
                         entity.archetype_name + " (not found)", None)
                     empty_obj.parent = group_obj
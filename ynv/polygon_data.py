@@ -0,0 +1,61 @@
+"""Builds the mesh data of navmesh polygons, welding the vertices shared between polygons."""
+import numpy as np
+from numpy.typing import NDArray
+
+# Vertices closer than this are merged. Binary navmeshes quantize positions to roughly 2mm, so shared vertices always
+# end up within this distance.
+WELD_DISTANCE = 0.001
+
+
+def weld_vertices(
+    positions: NDArray[np.float64],
+    weld_distance: float = WELD_DISTANCE,
+) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """Merges the ``positions`` (array of shape (n, 3)) that quantize to the same point on a grid of ``weld_distance``.
+
+    Returns the unique positions, in order of first occurrence, and the index of each input position in them.
+    """
+    if len(positions) == 0:
+        return np.empty((0, 3)), np.empty(0, dtype=np.int64)
+
+    keys = np.round(positions / weld_distance).astype(np.int64)
+    _, first_occurrences, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first_occurrences, kind="stable")
+    new_inds = np.empty(len(order), dtype=np.int64)
+    new_inds[order] = np.arange(len(order))
+    return positions[first_occurrences[order]], new_inds[inverse.reshape(-1)]
+
+
+def get_polygons_mesh_data(
+    polygons_vertices: list[NDArray[np.float64]],
+    weld_distance: float = WELD_DISTANCE,
+) -> tuple[NDArray[np.float64], NDArray[np.int32], NDArray[np.int32], NDArray[np.bool_]]:
+    """Gets the mesh data of the polygons with the given vertex positions (one array of shape (n, 3) per polygon).
+    Consecutive vertices of a polygon that are welded together are removed, and polygons left with less than 3
+    vertices are skipped.
+
+    Returns the vertex positions, the vertex index of each loop, the first loop of each polygon and a mask of the
+    polygons that were kept.
+    """
+    num_polys = len(polygons_vertices)
+    if num_polys == 0:
+        return np.empty((0, 3)), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32), np.empty(0, dtype=bool)
+
+    counts = np.fromiter((len(verts) for verts in polygons_vertices), dtype=np.int64, count=num_polys)
+    positions, loop_vert_inds = weld_vertices(np.concatenate(polygons_vertices).reshape((-1, 3)), weld_distance)
+
+    # Remove loops with the same vertex as the next loop of the polygon, wrapping around at the last loop
+    loop_starts = np.cumsum(counts) - counts
+    loop_polys = np.repeat(np.arange(num_polys), counts)
+    next_loops = np.arange(1, len(loop_vert_inds) + 1)
+    has_loops = counts > 0
+    next_loops[(loop_starts + counts - 1)[has_loops]] = loop_starts[has_loops]
+    keep_loops = loop_vert_inds != loop_vert_inds[next_loops]
+
+    counts = np.bincount(loop_polys[keep_loops], minlength=num_polys)
+    valid_polys = counts >= 3
+    keep_loops &= valid_polys[loop_polys]
+    counts = counts[valid_polys]
+
+    loop_starts = np.cumsum(counts) - counts
+    return positions, loop_vert_inds[keep_loops].astype(np.int32), loop_starts.astype(np.int32), valid_polys
@@ -3,7 +3,9 @@ from ..cwxml.navmesh import YNV
 from ..sollumz_properties import SOLLUMZ_UI_NAMES, SollumType
 import os
 import bpy
+import numpy as np
 from ..tools.blenderhelper import find_bsdf_and_material_output
+from .polygon_data import get_polygons_mesh_data
 
 
 def points_to_obj(points):
@@ -107,43 +109,35 @@ def get_material(flags, material_cache):
 
 def polygons_to_obj(polygons):
     material_cache = {}
-    mats = []
-    vertices = {}
-    verts = []
-    indices = []
-    face = []
-    for poly in polygons:
-        mats.append(get_material(poly.flags, material_cache))
-        maxtcount = len(poly.vertices)
-        for vert in poly.vertices:
-            vertex = id(vert)
-            if vertex in vertices:
-                idx = vertices[vertex]
-            else:
-                idx = len(vertices)
-                vertices[vertex] = idx
-                verts.append(vert)
-            face.append(idx)
-            if len(face) == maxtcount:
-                indices.append(face)
-                face = []
+    # Materials in order of first use, one per unique polygon flags
+    material_index_by_flags: dict[str, int] = {}
+    poly_material_inds = np.fromiter(
+        (material_index_by_flags.setdefault(poly.flags, len(material_index_by_flags)) for poly in polygons),
+        dtype=np.int32,
+        count=len(polygons)
+    )
+
+    verts, loop_vert_inds, loop_starts, valid_polys = get_polygons_mesh_data([poly.vertices for poly in polygons])
 
     mesh = bpy.data.meshes.new(SOLLUMZ_UI_NAMES[SollumType.NAVMESH_POLY_MESH])
-    mesh.from_pydata(verts, [], indices)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(len(loop_vert_inds))
+    mesh.loops.foreach_set("vertex_index", loop_vert_inds)
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    mesh.polygons.foreach_set("material_index", poly_material_inds[valid_polys])
+    mesh.update(calc_edges=True)
+
+    for flags in material_index_by_flags:
+        mesh.materials.append(get_material(flags, material_cache))
+
+    mesh.validate()
+
     obj = bpy.data.objects.new(
         SOLLUMZ_UI_NAMES[SollumType.NAVMESH_POLY_MESH], mesh)
     obj.sollum_type = SollumType.NAVMESH_POLY_MESH
 
-    # Ensure materials are unique in the mesh
-    used_materials = []
-    for mat in mats:
-        if mat not in used_materials:
-            mesh.materials.append(mat)
-            used_materials.append(mat)
-
-    for idx, poly in enumerate(mesh.polygons):
-        poly.material_index = used_materials.index(mats[idx])
-
     return obj
 
 
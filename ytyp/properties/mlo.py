@@ -4,6 +4,7 @@ if TYPE_CHECKING:
     from .ytyp import ArchetypeProperties
 
 import bpy
+from bpy.app.handlers import persistent
 from ...sollumz_properties import EntityProperties
 from ...tools.utils import get_list_item
 from ..utils import get_selected_ytyp, get_selected_archetype
@@ -11,6 +12,54 @@ from .flags import EntityFlags, RoomFlags, PortalFlags
 from .extensions import ExtensionsContainer, ExtensionType
 
 
+# Index of each item by ID in the collections of rooms, portals, etc. keyed by (owner pointer, collection name). The
+# getters below run from UI draw and property callbacks, so these avoid searching the whole collection each time.
+_index_by_id_caches: dict[tuple[int, str], dict[int, int]] = {}
+
+
+def get_item_index_by_id(owner: bpy.types.bpy_struct, collection_name: str, item_id: int) -> int:
+    """Gets the index of the item with ID ``item_id`` in the collection ``collection_name`` of ``owner``, or -1 if not
+    found.
+
+    The index is cached and checked against the collection on each lookup, so the cache is rebuilt when items are
+    added, removed or moved.
+    """
+    if item_id < 0:
+        return -1
+
+    collection = getattr(owner, collection_name)
+    key = (owner.as_pointer(), collection_name)
+    index_by_id = _index_by_id_caches.get(key, None)
+    if index_by_id is not None:
+        index = index_by_id.get(item_id, -1)
+        if index != -1 and index < len(collection) and collection[index].id == item_id:
+            return index
+
+    # Not cached, outdated or the ID doesn't exist
+    index_by_id = {}
+    for index, item in enumerate(collection):
+        index_by_id.setdefault(item.id, index)
+    _index_by_id_caches[key] = index_by_id
+    return index_by_id.get(item_id, -1)
+
+
+def get_item_index_by_id_str(owner: bpy.types.bpy_struct, collection_name: str, item_id: str) -> int:
+    """Same as ``get_item_index_by_id`` with the ID as a string, as stored by the ``EnumProperty`` of rooms, portals,
+    etc. Empty string is treated as no ID.
+    """
+    return get_item_index_by_id(owner, collection_name, int(item_id)) if item_id else -1
+
+
+def clear_index_by_id_caches():
+    _index_by_id_caches.clear()
+
+
+@persistent
+def on_load_post(*args):
+    # Pointers are no longer valid
+    clear_index_by_id_caches()
+
+
 def get_portal_items_for_archetype(archetype: Optional["ArchetypeProperties"]):
     items = [("-1", "None", "", -1)]
 
@@ -68,9 +117,9 @@ class MloArchetypeChild:
 
         if self.mlo_archetype_id == -1:
             selected_ytyp.update_mlo_archetype_ids()
-        for archetype in selected_ytyp.archetypes:
-            if archetype.id == self.mlo_archetype_id:
-                return archetype
+
+        index = get_item_index_by_id(selected_ytyp, "archetypes", self.mlo_archetype_id)
+        return selected_ytyp.archetypes[index] if index != -1 else None
 
     def get_room_items(self, context: Optional[bpy.types.Context]):
         archetype = self.get_mlo_archetype()
@@ -108,35 +157,19 @@ class RoomProperties(bpy.types.PropertyGroup, MloArchetypeChild):
 class PortalProperties(bpy.types.PropertyGroup, MloArchetypeChild):
     def get_room_from_index(self):
         archetype = self.get_mlo_archetype()
-        room_from_id = self.room_from_id
 
         if archetype is None:
             return 0
 
-        for index, room in enumerate(archetype.rooms):
-            if not room_from_id:
-                continue
-
-            if room.id == int(room_from_id):
-                return index
-
-        return 0
+        return max(get_item_index_by_id_str(archetype, "rooms", self.room_from_id), 0)
 
     def get_room_to_index(self):
         archetype = self.get_mlo_archetype()
-        room_to_id = self.room_to_id
 
         if archetype is None:
             return 0
 
-        for index, room in enumerate(archetype.rooms):
-            if not room_to_id:
-                continue
-
-            if room.id == int(room_to_id):
-                return index
-
-        return 0
+        return max(get_item_index_by_id_str(archetype, "rooms", self.room_to_id), 0)
 
     def get_room_name(self, room_index: int):
         archetype = self.get_mlo_archetype()
@@ -152,11 +185,10 @@ class PortalProperties(bpy.types.PropertyGroup, MloArchetypeChild):
     def get_portal_index(self):
         archetype = self.get_mlo_archetype()
 
-        for index, portal in enumerate(archetype.portals):
-            if portal.id == self.id:
-                return index
+        if archetype is None:
+            return 0
 
-        return 0
+        return max(get_item_index_by_id(archetype, "portals", self.id), 0)
 
     def update_room_names(self, context):
         self.room_from_name = self.get_room_name(self.room_from_index)
@@ -237,12 +269,7 @@ class MloEntityProperties(bpy.types.PropertyGroup, EntityProperties, MloArchetyp
         if selected_archetype is None:
             return -1
 
-        if attached_portal_id:
-            for index, portal in enumerate(selected_archetype.portals):
-                if portal.id == int(attached_portal_id):
-                    return index
-
-        return -1
+        return get_item_index_by_id_str(selected_archetype, "portals", attached_portal_id)
 
     def get_portal_name(self):
         selected_archetype = self.get_mlo_archetype()
@@ -263,12 +290,7 @@ class MloEntityProperties(bpy.types.PropertyGroup, EntityProperties, MloArchetyp
         if selected_archetype is None:
             return -1
 
-        if attached_room_id:
-            for index, room in enumerate(selected_archetype.rooms):
-                if room.id == int(attached_room_id):
-                    return index
-
-        return -1
+        return get_item_index_by_id_str(selected_archetype, "rooms", attached_room_id)
 
     def get_entityset_name(self):
         selected_archetype = self.get_mlo_archetype()
@@ -282,12 +304,10 @@ class MloEntityProperties(bpy.types.PropertyGroup, EntityProperties, MloArchetyp
         selected_archetype = self.get_mlo_archetype()
         attached_entity_set_id = self.attached_entity_set_id
 
-        if attached_entity_set_id and selected_archetype is not None:
-            for index, room in enumerate(selected_archetype.entity_sets):
-                if room.id == int(attached_entity_set_id):
-                    return index
+        if selected_archetype is None:
+            return -1
 
-        return -1
+        return get_item_index_by_id_str(selected_archetype, "entity_sets", attached_entity_set_id)
 
     def get_room_name(self):
         selected_archetype = self.get_mlo_archetype()
@@ -353,6 +373,8 @@ class EntitySetProperties(bpy.types.PropertyGroup, MloArchetypeChild):
 
 
 def register():
+    bpy.app.handlers.load_post.append(on_load_post)
+
     bpy.types.Scene.sollumz_add_entity_portal = bpy.props.EnumProperty(
         name="Portal", items=get_portal_items_for_selected_archetype, default=-1)
     bpy.types.Scene.sollumz_add_entity_room = bpy.props.EnumProperty(
@@ -385,6 +407,9 @@ def register():
 
 
 def unregister():
+    bpy.app.handlers.load_post.remove(on_load_post)
+    clear_index_by_id_caches()
+
     del bpy.types.Scene.sollumz_add_entity_portal
     del bpy.types.Scene.sollumz_add_entity_room
     del bpy.types.Scene.sollumz_add_entity_entityset
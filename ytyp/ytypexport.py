@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import Iterable
 import bpy
 from mathutils import Euler, Vector, Quaternion, Matrix
@@ -11,29 +12,27 @@ from .properties.extensions import ExtensionProperties, ExtensionType
 from ..ydr.light_flashiness import Flashiness
 
 
-def set_room_attached_objects(room_xml: ytypxml.Room, room_index: int, entities: Iterable[MloEntityProperties]):
-    """Set attached objects of room from the mlo archetype entities collection provided."""
+def get_attached_objects(entities: Iterable[MloEntityProperties]) -> tuple[dict[int, list[int]], dict[int, list[int]]]:
+    """Get the indices of the entities attached to each room and to each portal, by room index and portal index."""
+    room_attached_objects = defaultdict(list)
+    portal_attached_objects = defaultdict(list)
     for i, entity in enumerate(entities):
-        if entity.room_index == room_index:
-            room_xml.attached_objects.append(i)
+        room_attached_objects[entity.room_index].append(i)
+        portal_attached_objects[entity.portal_index].append(i)
 
-
-def set_portal_attached_objects(portal_xml: ytypxml.Portal, portal_index: int, entities: Iterable[MloEntityProperties]):
-    """Set attached objects of portal from the mlo archetype entities collection provided."""
-    for i, entity in enumerate(entities):
-        if entity.portal_index == portal_index:
-            portal_xml.attached_objects.append(i)
+    return room_attached_objects, portal_attached_objects
 
 
-def get_portal_count(room: RoomProperties, portals: Iterable[PortalProperties]) -> int:
-    """Get number of portals in room."""
+def get_portal_counts(portals: Iterable[PortalProperties]) -> dict[str, int]:
+    """Get number of portals in each room, by room ID."""
 
-    count = 0
+    counts = defaultdict(int)
     for portal in portals:
-        if portal.room_from_id == str(room.id) or portal.room_to_id == str(room.id):
-            count += 1
+        counts[portal.room_from_id] += 1
+        if portal.room_to_id != portal.room_from_id:
+            counts[portal.room_to_id] += 1
 
-    return count
+    return counts
 
 
 def set_entity_xml_transforms_from_object(entity_obj: bpy.types.Object, entity_xml: ymapxml.Entity):
@@ -118,7 +117,7 @@ def create_entity_xml(entity: MloEntityProperties) -> ymapxml.Entity:
     return entity_xml
 
 
-def create_room_xml(room: RoomProperties, room_index: int, archetype: ArchetypeProperties) -> ytypxml.Room:
+def create_room_xml(room: RoomProperties, attached_objects: list[int], portal_count: int) -> ytypxml.Room:
     """Create xml room from a room data-block."""
 
     room_xml = ytypxml.Room()
@@ -131,16 +130,13 @@ def create_room_xml(room: RoomProperties, room_index: int, archetype: ArchetypeP
     room_xml.flags = room.flags.total
     room_xml.floor_id = room.floor_id
     room_xml.exterior_visibility_depth = room.exterior_visibility_depth
-    room_xml.portal_count = get_portal_count(
-        room, archetype.portals)
-
-    set_room_attached_objects(room_xml, room_index,
-                              archetype.non_entity_set_entities)
+    room_xml.portal_count = portal_count
+    room_xml.attached_objects.extend(attached_objects)
 
     return room_xml
 
 
-def create_portal_xml(portal: PortalProperties, portal_index: int, archetype: ArchetypeProperties) -> ytypxml.Portal:
+def create_portal_xml(portal: PortalProperties, attached_objects: list[int]) -> ytypxml.Portal:
     """Create xml portal from a portal data-block."""
 
     portal_xml = ytypxml.Portal()
@@ -155,8 +151,7 @@ def create_portal_xml(portal: PortalProperties, portal_index: int, archetype: Ar
     portal_xml.audio_occlusion = int(
         portal.audio_occlusion)
 
-    set_portal_attached_objects(
-        portal_xml, portal_index, archetype.non_entity_set_entities)
+    portal_xml.attached_objects.extend(attached_objects)
 
     return portal_xml
 
@@ -293,18 +288,21 @@ def get_xml_asset_type(asset_type: AssetType) -> str:
 
 def create_mlo_archetype_children_xml(archetype: ArchetypeProperties, archetype_xml: ytypxml.MloArchetype):
     """Create all mlo children from an archetype data-block for the provided archetype xml."""
-    for entity in archetype.entities:
-        if entity.attached_entity_set_id != "-1":
-            continue
+    entities = archetype.non_entity_set_entities
+    for entity in entities:
         archetype_xml.entities.append(create_entity_xml(entity))
 
+    # Gathered in a single pass instead of searching all entities/portals for each room and portal
+    room_attached_objects, portal_attached_objects = get_attached_objects(entities)
+    portal_counts = get_portal_counts(archetype.portals)
+
     for room_index, room in enumerate(archetype.rooms):
         archetype_xml.rooms.append(
-            create_room_xml(room, room_index, archetype))
+            create_room_xml(room, room_attached_objects.get(room_index, []), portal_counts.get(str(room.id), 0)))
 
     for portal_index, portal in enumerate(archetype.portals):
         archetype_xml.portals.append(
-            create_portal_xml(portal, portal_index, archetype))
+            create_portal_xml(portal, portal_attached_objects.get(portal_index, [])))
 
     for tcm in archetype.timecycle_modifiers:
         archetype_xml.timecycle_modifiers.append(create_tcm_xml(tcm))
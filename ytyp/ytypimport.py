@@ -5,6 +5,8 @@ from ..cwxml import ytyp as ytypxml, ymap as ymapxml
 from ..sollumz_properties import ArchetypeType, AssetType, EntityLodLevel, EntityPriorityLevel
 from ..sollumz_preferences import get_import_settings
 from ..sollumz_helper import duplicate_object_with_children
+from ..tools import jenkhash
+from ..tools.ymaphelper import get_archetype_object_index, use_archetype_object_index
 from .properties.ytyp import CMapTypesProperties, ArchetypeProperties, SpecialAttribute, TimecycleModifierProperties, RoomProperties, PortalProperties, MloEntityProperties, EntitySetProperties
 from .properties.extensions import ExtensionProperties, ExtensionType, ExtensionsContainer
 from ..ydr.light_flashiness import Flashiness
@@ -116,12 +118,13 @@ def find_and_link_entity_object(entity_xml: ymapxml.Entity, entity: MloEntityPro
     should_instance = get_import_settings().ytyp_mlo_instance_entities
 
     # Lookup in the whole .blend (i.e. current scene, other scenes, asset browser)
-    obj = bpy.data.objects.get(entity_xml.archetype_name, None)
+    object_index = get_archetype_object_index()
+    obj = object_index.get(entity_xml.archetype_name)
     if obj is None:
         # No object with the given archetype name found
         return
 
-    if obj.name not in bpy.context.scene.objects:
+    if not object_index.is_in_scene(obj):
         # Since it isn't in the current scene, we have to duplicate the object always
         should_instance = True
     elif should_instance:
@@ -206,7 +209,7 @@ def set_extension_props(extension_xml: ymapxml.Extension, extension: ExtensionPr
                 prop_value_int = int(prop_value)
             except ValueError:
                 prop_value_int = 0
-            prop_value = f"hash_{prop_value_int:08X}" if prop_value_int != 0 else ""
+            prop_value = jenkhash.hash_to_name(prop_value_int) if prop_value_int != 0 else ""
 
         elif prop_name == "flashiness":
             # `flashiness` is now an enum property, we need the enum as string
@@ -395,5 +398,6 @@ def ytyp_to_obj(ytyp_xml: ytypxml.CMapTypes):
 
     bpy.context.scene.ytyp_index = len(bpy.context.scene.ytyps) - 1
 
-    for arch_xml in ytyp_xml.archetypes:
-        create_archetype(arch_xml, ytyp)
+    with use_archetype_object_index():
+        for arch_xml in ytyp_xml.archetypes:
+            create_archetype(arch_xml, ytyp)